@@ -0,0 +1,74 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+# Benchmark for batched configuration writes
+#
+# Configures channels, timebase and trigger of a scope with and without
+# driver.batch() over a loopback interface that adds a fixed latency to every
+# message.  Run from the top level of the source tree:
+#
+#     python bench/bench_batch.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ivi
+from loopback import LoopbackInstrument
+
+def configure(scope):
+    for ch in scope.channels[0:4]:
+        ch.enabled = True
+        ch.coupling = 'dc'
+        ch.offset = 0.0
+        ch.input_impedance = 1e6
+    scope.timebase.position = 0.0
+    scope.trigger.type = 'edge'
+    scope.trigger.coupling = 'dc'
+    scope.trigger.edge.slope = 'positive'
+
+def run(latency=0.001, number=5):
+    instr = LoopbackInstrument(latency=latency)
+    scope = ivi.agilent.agilentDSO7104A(instr)
+
+    for name, batch in (('unbatched', False), ('batched', True)):
+        writes = instr.write_count
+        t = time.time()
+        for k in range(number):
+            scope.driver_operation.invalidate_all_attributes()
+            if batch:
+                with scope.batch():
+                    configure(scope)
+            else:
+                configure(scope)
+        t = (time.time() - t) / number
+        print("%-20s %8.3f ms %6d messages" % (name, t * 1e3, (instr.write_count - writes) // number))
+
+if __name__ == '__main__':
+    run()
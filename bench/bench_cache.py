@@ -0,0 +1,68 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+# Micro-benchmark for cached property reads
+#
+# Run from the top level of the source tree:
+#
+#     python bench/bench_cache.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ivi
+from loopback import LoopbackInstrument
+
+def run(number=20000):
+    instr = LoopbackInstrument()
+    scope = ivi.agilent.agilentDSO7104A(instr)
+
+    # first access fills the cache
+    scope.timebase.scale
+    scope.channels[0].offset
+    reads = instr.read_count
+
+    tests = [
+        ('timebase.scale', lambda: scope.timebase.scale),
+        ('channels[0].offset', lambda: scope.channels[0].offset),
+        ('_get_cache_valid(tag=...)', lambda: scope._get_cache_valid('timebase_scale')),
+        ('_get_cache_valid(tag=..., index=...)', lambda: scope._get_cache_valid('channel_offset', 0)),
+    ]
+
+    for name, f in tests:
+        t = min(timeit.repeat(f, number=number, repeat=3)) / number
+        print("%-40s %8.3f us" % (name, t * 1e6))
+
+    if instr.read_count != reads:
+        print("warning: cached reads went to the instrument")
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,69 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+# Benchmark for property access with and without compiled dispatch
+#
+# Run from the top level of the source tree:
+#
+#     python bench/bench_properties.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ivi
+from loopback import LoopbackInstrument
+
+def measure(scope, number):
+    tests = [
+        ('channels[0].range', lambda: scope.channels[0].range),
+        ('timebase.scale', lambda: scope.timebase.scale),
+        ('driver_operation.simulate', lambda: scope.driver_operation.simulate),
+        ('_driver_operation_simulate', lambda: scope._driver_operation_simulate),
+    ]
+
+    results = []
+    for name, f in tests:
+        f()
+        results.append((name, min(timeit.repeat(f, number=number, repeat=3)) / number))
+    return results
+
+def run(number=20000):
+    scope = ivi.agilent.agilentDSO7104A(LoopbackInstrument())
+    before = measure(scope, number)
+    ivi.compile_properties(scope)
+    after = measure(scope, number)
+
+    print("%-30s %10s %10s" % ('', 'dynamic', 'compiled'))
+    for (name, t1), (name, t2) in zip(before, after):
+        print("%-30s %7.3f us %7.3f us" % (name, t1 * 1e6, t2 * 1e6))
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,116 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+# Benchmark for PyVISA reads
+#
+# Reads IEEE blocks the way Driver._read_ieee_block does, through
+# PyVisaInstrument wrapped around a mocked VISA resource that returns a
+# prebuilt message, and compares with the previous io.BytesIO based read_raw.
+# Run from the top level of the source tree:
+#
+#     python bench/bench_pyvisa.py [size in bytes]
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+try:
+    from ivi.interface import pyvisa
+except ImportError:
+    pyvisa = None
+
+class MockResource(object):
+    "Stand-in for a PyVISA message based resource"
+    def __init__(self, message):
+        self.message = message
+        self.chunk_size = 20 * 1024
+
+    def write_raw(self, data):
+        pass
+
+    def read_raw(self):
+        return self.message
+
+    def assert_trigger(self):
+        pass
+
+class BytesIOInstrument(object):
+    "Previous PyVisaInstrument read path"
+    def __init__(self, resource):
+        self.instrument = resource
+        self.buffer = io.BytesIO()
+
+    def read_raw(self, num=-1):
+        data = self.buffer.read(num)
+        if len(data) == 0:
+            self.buffer = io.BytesIO(self.instrument.read_raw())
+            data = self.buffer.read(num)
+        return data
+
+def read_block(read):
+    ch = read(1)
+    while ch != b'#':
+        ch = read(1)
+    l = int(read(1))
+    num = int(read(l))
+    data = read(num)
+    # termination character
+    read()
+    return data
+
+def run(size=4 * 1024 * 1024, number=50):
+    if pyvisa is None:
+        print("PyVISA wrapper not available")
+        return
+
+    payload = b'\x55' * size
+    message = ('#8%08d' % size).encode('utf-8') + payload + b'\n'
+
+    print("block %d bytes" % size)
+
+    instr = BytesIOInstrument(MockResource(message))
+    t = time.time()
+    for k in range(number):
+        read_block(instr.read_raw)
+    t = (time.time() - t) / number
+    print("%-20s %8.3f ms %10.1f MB/s" % ('BytesIO', t * 1e3, size / t / 1e6))
+
+    instr = pyvisa.PyVisaInstrument(MockResource(message))
+    for name, read in (('read_raw', instr.read_raw), ('read_view', instr.read_view)):
+        t = time.time()
+        for k in range(number):
+            read_block(read)
+        t = (time.time() - t) / number
+        print("%-20s %8.3f ms %10.1f MB/s" % (name, t * 1e3, size / t / 1e6))
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run()
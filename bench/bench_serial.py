@@ -0,0 +1,120 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+# Benchmark for serial reads
+#
+# Reads a comma separated trace and an IEEE block from a stand-in instrument
+# on the master side of a pseudo terminal, through SerialInstrument on the
+# slave side.  Compares with the old byte at a time read loop.  Needs pySerial
+# and a POSIX system.  Run from the top level of the source tree:
+#
+#     python bench/bench_serial.py
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ivi.interface import pyserial
+
+def serve(fd, trace, block):
+    "Answer TRACE? and BLOCK? queries on pty master fd"
+    data = b''
+    while True:
+        try:
+            c = os.read(fd, 1024)
+        except OSError:
+            return
+        if not c:
+            return
+        data += c
+        while b'\n' in data:
+            line, data = data.split(b'\n', 1)
+            if line == b'TRACE?':
+                os.write(fd, trace)
+            elif line == b'BLOCK?':
+                os.write(fd, block)
+
+def read_raw_bytewise(instr, num=-1):
+    "Previous SerialInstrument.read_raw"
+    data = b''
+    term_char = str(instr.term_char).encode('utf-8')[0:1]
+    while True:
+        c = instr.serial.read(1)
+        data += c
+        num -= 1
+        if c == term_char:
+            break
+        if num == 0:
+            break
+    return data
+
+def run(points=2000, number=20):
+    master, slave = os.openpty()
+    # raw mode, so the pty passes binary data and newlines unchanged
+    import tty
+    tty.setraw(master)
+    tty.setraw(slave)
+
+    trace = (','.join('%.6e' % (k * 1e-3) for k in range(points)) + '\n').encode('utf-8')
+    # no newlines in the payload, the bytewise loop stops at the first one
+    payload = bytes(bytearray(k % 256 if k % 256 != 10 else 0 for k in range(points * 2)))
+    block = ('#8%08d' % len(payload)).encode('utf-8') + payload + b'\n'
+
+    t = threading.Thread(target=serve, args=(master, trace, block))
+    t.daemon = True
+    t.start()
+
+    instr = pyserial.SerialInstrument('ASRL::%s,115200::INSTR' % os.ttyname(slave), timeout=5)
+
+    print("trace %d bytes, block %d bytes" % (len(trace), len(payload)))
+
+    for name, read in (('bytewise', lambda num=-1: read_raw_bytewise(instr, num)),
+            ('buffered', instr.read_raw)):
+        t = time.time()
+        for k in range(number):
+            instr.write_raw(b'TRACE?')
+            assert read() == trace
+        t1 = (time.time() - t) / number
+
+        t = time.time()
+        for k in range(number):
+            instr.write_raw(b'BLOCK?')
+            assert read(2) == b'#8'
+            n = int(read(8))
+            assert read(n) == payload
+            # discard termination character
+            read(1)
+        t2 = (time.time() - t) / number
+        print("%-20s trace %8.3f ms   block %8.3f ms" % (name, t1 * 1e3, t2 * 1e3))
+
+    instr.serial.close()
+    os.close(master)
+
+if __name__ == '__main__':
+    run()
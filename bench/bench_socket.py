@@ -0,0 +1,89 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+# Benchmark for the raw socket interface
+#
+# Measures query round trips and IEEE block throughput through
+# SocketInstrument against a stand-in instrument on a local socket.  Given
+# the address of a real instrument, also compares VXI-11 with a raw socket
+# connection to it.  Run from the top level of the source tree:
+#
+#     python bench/bench_socket.py [instrument address]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ivi
+from ivi.interface import socket as ivisocket
+from loopback import LoopbackServer
+
+def measure(name, driver, block_query, number=200, block_number=20):
+    t = time.time()
+    for k in range(number):
+        driver._ask('*IDN?')
+    t1 = (time.time() - t) / number
+
+    size = 0
+    t = time.time()
+    for k in range(block_number):
+        size = len(driver._ask_for_ieee_block(block_query))
+        driver._read_raw() # termination character
+    t2 = (time.time() - t) / block_number
+    print("%-24s query %8.1f us   block %8.3f ms %10.1f MB/s" %
+            (name, t1 * 1e6, t2 * 1e3, size / t2 / 1e6))
+
+def run(host=None, size=8 * 1024 * 1024):
+    payload = b'\x55' * size
+    block = ('#9%09d' % size).encode('utf-8') + payload + b'\n'
+    server = LoopbackServer({':waveform:data?': block})
+
+    print("block %d bytes" % size)
+
+    for name, kw in (('socket', {}), ('socket rcvbuf=4MB', {'rcvbuf': 4 * 1024 * 1024})):
+        driver = ivi.Driver(ivisocket.SocketInstrument(server.resource, **kw))
+        measure(name, driver, ':waveform:data?')
+        driver.close()
+
+    server.close()
+
+    if host is not None:
+        # compare with VXI-11 on a real instrument
+        for name, resource in (('vxi11', 'TCPIP0::%s::INSTR' % host),
+                ('socket', 'TCPIP0::%s::5025::SOCKET' % host)):
+            driver = ivi.Driver(resource)
+            driver._write(':waveform:format byte')
+            measure(name + ' ' + host, driver, ':waveform:data?')
+            driver.close()
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        run()
@@ -0,0 +1,76 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+# Benchmark for driver construction
+#
+# Instantiates every driver in simulation mode and reports the construction
+# time of each one.  Run from the top level of the source tree:
+#
+#     python bench/bench_startup.py [model pattern]
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+t = time.time()
+import ivi
+import_time = time.time() - t
+
+def construct(cls, number):
+    # initialize prints a notice when simulating
+    with contextlib.redirect_stdout(io.StringIO()):
+        t = time.time()
+        for k in range(number):
+            cls(simulate=True)
+        return (time.time() - t) / number
+
+def run(model=None, number=5):
+    print("%-40s %8.3f ms" % ('import ivi', import_time * 1e3))
+
+    total = 0
+    count = 0
+    for info in ivi.registry.get_drivers(model=model):
+        t = time.time()
+        cls = info.load()
+        t_import = time.time() - t
+        try:
+            t = construct(cls, number)
+        except Exception as e:
+            print("%-40s failed: %r" % (info.name, e))
+            continue
+        print("%-40s %8.3f ms (import %.3f ms)" % (info.name, t * 1e3, t_import * 1e3))
+        total += t
+        count += 1
+
+    if count:
+        print("%d drivers, mean construction time %.3f ms" % (count, total / count * 1e3))
+
+if __name__ == '__main__':
+    run(*sys.argv[1:2])
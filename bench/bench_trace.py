@@ -0,0 +1,69 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+
+# Benchmark for scaling, indexing and iterating a 1 Mpoint trace
+#
+# Run from the top level of the source tree:
+#
+#     python bench/bench_trace.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+import ivi
+
+def run(points=1024*1024):
+    raw = np.random.randint(0, 65536, points).astype('<u2').tobytes()
+
+    trace = ivi.TraceYT()
+    trace.y_raw = np.frombuffer(raw, '<u2')
+    trace.y_increment = 1e-4
+    trace.y_reference = 32768
+    trace.y_hole = 0
+    trace.x_increment = 1e-9
+
+    tests = [
+        ('y (first access)', lambda: trace.y),
+        ('y (cached)', lambda: trace.y),
+        ('x (first access)', lambda: trace.x),
+        ('trace[1000:2000]', lambda: trace[1000:2000]),
+        ('list(trace)', lambda: list(trace)),
+    ]
+
+    for name, f in tests:
+        start = time.time()
+        f()
+        print("%-40s %10.3f ms" % (name, (time.time() - start) * 1e3))
+
+if __name__ == '__main__':
+    run()
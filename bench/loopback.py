@@ -0,0 +1,106 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+import socket
+import threading
+import time
+
+class LoopbackInstrument(object):
+    "Stand-in instrument interface that answers every query with a fixed response"
+    def __init__(self, response=b'1.0\n', latency=0):
+        self.response = response
+        self.latency = latency
+        self.write_count = 0
+        self.read_count = 0
+
+    def write_raw(self, data):
+        "Write binary data to instrument"
+        self.write_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def read_raw(self, num=-1):
+        "Read binary data from instrument"
+        self.read_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.response
+
+    def close(self):
+        pass
+
+
+class LoopbackServer(object):
+    """Stand-in instrument answering SCPI queries on a local TCP socket
+
+    Queries are answered from responses, keyed by the query text, or with
+    '1.0'.  Responses are sent as given, so binary blocks must include their
+    own termination.
+    """
+    def __init__(self, responses=None, host='127.0.0.1', port=0):
+        self.responses = dict(responses or {})
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(1)
+        self.host, self.port = self.server.getsockname()
+        self.thread = threading.Thread(target=self._serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    @property
+    def resource(self):
+        return 'TCPIP::%s::%d::SOCKET' % (self.host, self.port)
+
+    def _serve(self):
+        while True:
+            try:
+                conn, addr = self.server.accept()
+            except socket.error:
+                return
+            t = threading.Thread(target=self._handle, args=(conn,))
+            t.daemon = True
+            t.start()
+
+    def _handle(self, conn):
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        data = b''
+        try:
+            while True:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    return
+                data += chunk
+                while b'\n' in data:
+                    line, data = data.split(b'\n', 1)
+                    line = line.decode('utf-8').strip()
+                    if line.endswith('?'):
+                        conn.sendall(self.responses.get(line, b'1.0\n'))
+        finally:
+            conn.close()
+
+    def close(self):
+        self.server.close()
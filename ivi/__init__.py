@@ -26,6 +26,22 @@ THE SOFTWARE.
 
 """
 
+# IVI drivers
+_vendors = [
+        "agilent",
+        "dicon",
+        "chroma",
+        "colby",
+        "ics",
+        "jdsu",
+        "keithley",
+        "lecroy",
+        "philips",
+        "rigol",
+        "prema",
+        "tektronix",
+        "testequity"]
+
 __all__ = [
         # Base IVI class
         "ivi",
@@ -43,21 +59,13 @@ __all__ = [
         "extra",
         # Generic IVI drivers
         "scpi",
-        # IVI drivers
-        "agilent",
-        "dicon",
-        "chroma",
-        "colby",
-        "ics",
-        "jdsu",
-        "keithley",
-        "lecroy",
-        "philips",
-        "rigol",
-        "prema",
-        "tektronix",
-        "testequity"]
+        # Driver index
+        "registry",
+        # Concurrent operations on several drivers
+        "executor"] + _vendors
 
 from .ivi import *
-from . import *
+from . import registry
 
+# class and driver packages are imported on first access
+registry.lazy_modules(__name__, __all__)
@@ -24,255 +24,256 @@ THE SOFTWARE.
 
 """
 
-# Oscilloscopes
-# InfiniiVision 2000A
-from .agilentDSOX2002A import agilentDSOX2002A
-from .agilentDSOX2004A import agilentDSOX2004A
-from .agilentDSOX2012A import agilentDSOX2012A
-from .agilentDSOX2014A import agilentDSOX2014A
-from .agilentDSOX2022A import agilentDSOX2022A
-from .agilentDSOX2024A import agilentDSOX2024A
-from .agilentMSOX2002A import agilentMSOX2002A
-from .agilentMSOX2004A import agilentMSOX2004A
-from .agilentMSOX2012A import agilentMSOX2012A
-from .agilentMSOX2014A import agilentMSOX2014A
-from .agilentMSOX2022A import agilentMSOX2022A
-from .agilentMSOX2024A import agilentMSOX2024A
-# InfiniiVision 3000A
-from .agilentDSOX3012A import agilentDSOX3012A
-from .agilentDSOX3014A import agilentDSOX3014A
-from .agilentDSOX3024A import agilentDSOX3024A
-from .agilentDSOX3032A import agilentDSOX3032A
-from .agilentDSOX3034A import agilentDSOX3034A
-from .agilentDSOX3052A import agilentDSOX3052A
-from .agilentDSOX3054A import agilentDSOX3054A
-from .agilentDSOX3102A import agilentDSOX3102A
-from .agilentDSOX3104A import agilentDSOX3104A
-from .agilentMSOX3012A import agilentMSOX3012A
-from .agilentMSOX3014A import agilentMSOX3014A
-from .agilentMSOX3024A import agilentMSOX3024A
-from .agilentMSOX3032A import agilentMSOX3032A
-from .agilentMSOX3034A import agilentMSOX3034A
-from .agilentMSOX3052A import agilentMSOX3052A
-from .agilentMSOX3054A import agilentMSOX3054A
-from .agilentMSOX3102A import agilentMSOX3102A
-from .agilentMSOX3104A import agilentMSOX3104A
-# InfiniiVision 4000A
-from .agilentDSOX4022A import agilentDSOX4022A
-from .agilentDSOX4024A import agilentDSOX4024A
-from .agilentDSOX4032A import agilentDSOX4032A
-from .agilentDSOX4034A import agilentDSOX4034A
-from .agilentDSOX4052A import agilentDSOX4052A
-from .agilentDSOX4054A import agilentDSOX4054A
-from .agilentDSOX4104A import agilentDSOX4104A
-from .agilentDSOX4154A import agilentDSOX4154A
-from .agilentMSOX4022A import agilentMSOX4022A
-from .agilentMSOX4024A import agilentMSOX4024A
-from .agilentMSOX4032A import agilentMSOX4032A
-from .agilentMSOX4034A import agilentMSOX4034A
-from .agilentMSOX4052A import agilentMSOX4052A
-from .agilentMSOX4054A import agilentMSOX4054A
-from .agilentMSOX4104A import agilentMSOX4104A
-from .agilentMSOX4154A import agilentMSOX4154A
-# InfiniiVision 6000A
-from .agilentDSO6012A import agilentDSO6012A
-from .agilentDSO6014A import agilentDSO6014A
-from .agilentDSO6032A import agilentDSO6032A
-from .agilentDSO6034A import agilentDSO6034A
-from .agilentDSO6052A import agilentDSO6052A
-from .agilentDSO6054A import agilentDSO6054A
-from .agilentDSO6102A import agilentDSO6102A
-from .agilentDSO6104A import agilentDSO6104A
-from .agilentMSO6012A import agilentMSO6012A
-from .agilentMSO6014A import agilentMSO6014A
-from .agilentMSO6032A import agilentMSO6032A
-from .agilentMSO6034A import agilentMSO6034A
-from .agilentMSO6052A import agilentMSO6052A
-from .agilentMSO6054A import agilentMSO6054A
-from .agilentMSO6102A import agilentMSO6102A
-from .agilentMSO6104A import agilentMSO6104A
-# InfiniiVision 7000A
-from .agilentDSO7012A import agilentDSO7012A
-from .agilentDSO7014A import agilentDSO7014A
-from .agilentDSO7032A import agilentDSO7032A
-from .agilentDSO7034A import agilentDSO7034A
-from .agilentDSO7052A import agilentDSO7052A
-from .agilentDSO7054A import agilentDSO7054A
-from .agilentDSO7104A import agilentDSO7104A
-from .agilentMSO7012A import agilentMSO7012A
-from .agilentMSO7014A import agilentMSO7014A
-from .agilentMSO7032A import agilentMSO7032A
-from .agilentMSO7034A import agilentMSO7034A
-from .agilentMSO7052A import agilentMSO7052A
-from .agilentMSO7054A import agilentMSO7054A
-from .agilentMSO7104A import agilentMSO7104A
-# InfiniiVision 7000B
-from .agilentDSO7012B import agilentDSO7012B
-from .agilentDSO7014B import agilentDSO7014B
-from .agilentDSO7032B import agilentDSO7032B
-from .agilentDSO7034B import agilentDSO7034B
-from .agilentDSO7052B import agilentDSO7052B
-from .agilentDSO7054B import agilentDSO7054B
-from .agilentDSO7104B import agilentDSO7104B
-from .agilentMSO7012B import agilentMSO7012B
-from .agilentMSO7014B import agilentMSO7014B
-from .agilentMSO7032B import agilentMSO7032B
-from .agilentMSO7034B import agilentMSO7034B
-from .agilentMSO7052B import agilentMSO7052B
-from .agilentMSO7054B import agilentMSO7054B
-from .agilentMSO7104B import agilentMSO7104B
-# Infiniium 90000A
-from .agilentDSO90254A import agilentDSO90254A
-from .agilentDSO90404A import agilentDSO90404A
-from .agilentDSO90604A import agilentDSO90604A
-from .agilentDSO90804A import agilentDSO90804A
-from .agilentDSO91204A import agilentDSO91204A
-from .agilentDSO91304A import agilentDSO91304A
-from .agilentDSA90254A import agilentDSA90254A
-from .agilentDSA90404A import agilentDSA90404A
-from .agilentDSA90604A import agilentDSA90604A
-from .agilentDSA90804A import agilentDSA90804A
-from .agilentDSA91204A import agilentDSA91204A
-from .agilentDSA91304A import agilentDSA91304A
-# Infiniium 90000X
-from .agilentDSOX91304A import agilentDSOX91304A
-from .agilentDSOX91604A import agilentDSOX91604A
-from .agilentDSOX92004A import agilentDSOX92004A
-from .agilentDSOX92504A import agilentDSOX92504A
-from .agilentDSOX92804A import agilentDSOX92804A
-from .agilentDSOX93204A import agilentDSOX93204A
-from .agilentDSAX91304A import agilentDSAX91304A
-from .agilentDSAX91604A import agilentDSAX91604A
-from .agilentDSAX92004A import agilentDSAX92004A
-from .agilentDSAX92504A import agilentDSAX92504A
-from .agilentDSAX92804A import agilentDSAX92804A
-from .agilentDSAX93204A import agilentDSAX93204A
-from .agilentMSOX91304A import agilentMSOX91304A
-from .agilentMSOX91604A import agilentMSOX91604A
-from .agilentMSOX92004A import agilentMSOX92004A
-from .agilentMSOX92504A import agilentMSOX92504A
-from .agilentMSOX92804A import agilentMSOX92804A
-from .agilentMSOX93204A import agilentMSOX93204A
+from .. import registry
 
-# Spectrum Analyzers
-# 859xA series
-from .agilent8590A import agilent8590A
-from .agilent8590B import agilent8590B
-from .agilent8591A import agilent8591A
-from .agilent8592A import agilent8592A
-from .agilent8592B import agilent8592B
-from .agilent8593A import agilent8593A
-from .agilent8594A import agilent8594A
-from .agilent8595A import agilent8595A
-# 859xE series
-from .agilent8590E import agilent8590E
-from .agilent8590L import agilent8590L
-from .agilent8591C import agilent8591C
-from .agilent8591E import agilent8591E
-from .agilent8591EM import agilent8591EM
-from .agilent8592L import agilent8592L
-from .agilent8593E import agilent8593E
-from .agilent8593EM import agilent8593EM
-from .agilent8594E import agilent8594E
-from .agilent8594EM import agilent8594EM
-from .agilent8594L import agilent8594L
-from .agilent8594Q import agilent8594Q
-from .agilent8595E import agilent8595E
-from .agilent8595EM import agilent8595EM
-from .agilent8596E import agilent8596E
-from .agilent8596EM import agilent8596EM
+registry.lazy_package(__name__, [
+        # Oscilloscopes
+        # InfiniiVision 2000A
+        ('agilentDSOX2002A', ('scope', 'fgen')),
+        ('agilentDSOX2004A', ('scope', 'fgen')),
+        ('agilentDSOX2012A', ('scope', 'fgen')),
+        ('agilentDSOX2014A', ('scope', 'fgen')),
+        ('agilentDSOX2022A', ('scope', 'fgen')),
+        ('agilentDSOX2024A', ('scope', 'fgen')),
+        ('agilentMSOX2002A', ('scope', 'fgen')),
+        ('agilentMSOX2004A', ('scope', 'fgen')),
+        ('agilentMSOX2012A', ('scope', 'fgen')),
+        ('agilentMSOX2014A', ('scope', 'fgen')),
+        ('agilentMSOX2022A', ('scope', 'fgen')),
+        ('agilentMSOX2024A', ('scope', 'fgen')),
+        # InfiniiVision 3000A
+        ('agilentDSOX3012A', ('scope', 'fgen')),
+        ('agilentDSOX3014A', ('scope', 'fgen')),
+        ('agilentDSOX3024A', ('scope', 'fgen')),
+        ('agilentDSOX3032A', ('scope', 'fgen')),
+        ('agilentDSOX3034A', ('scope', 'fgen')),
+        ('agilentDSOX3052A', ('scope', 'fgen')),
+        ('agilentDSOX3054A', ('scope', 'fgen')),
+        ('agilentDSOX3102A', ('scope', 'fgen')),
+        ('agilentDSOX3104A', ('scope', 'fgen')),
+        ('agilentMSOX3012A', ('scope', 'fgen')),
+        ('agilentMSOX3014A', ('scope', 'fgen')),
+        ('agilentMSOX3024A', ('scope', 'fgen')),
+        ('agilentMSOX3032A', ('scope', 'fgen')),
+        ('agilentMSOX3034A', ('scope', 'fgen')),
+        ('agilentMSOX3052A', ('scope', 'fgen')),
+        ('agilentMSOX3054A', ('scope', 'fgen')),
+        ('agilentMSOX3102A', ('scope', 'fgen')),
+        ('agilentMSOX3104A', ('scope', 'fgen')),
+        # InfiniiVision 4000A
+        ('agilentDSOX4022A', ('scope', 'fgen')),
+        ('agilentDSOX4024A', ('scope', 'fgen')),
+        ('agilentDSOX4032A', ('scope', 'fgen')),
+        ('agilentDSOX4034A', ('scope', 'fgen')),
+        ('agilentDSOX4052A', ('scope', 'fgen')),
+        ('agilentDSOX4054A', ('scope', 'fgen')),
+        ('agilentDSOX4104A', ('scope', 'fgen')),
+        ('agilentDSOX4154A', ('scope', 'fgen')),
+        ('agilentMSOX4022A', ('scope', 'fgen')),
+        ('agilentMSOX4024A', ('scope', 'fgen')),
+        ('agilentMSOX4032A', ('scope', 'fgen')),
+        ('agilentMSOX4034A', ('scope', 'fgen')),
+        ('agilentMSOX4052A', ('scope', 'fgen')),
+        ('agilentMSOX4054A', ('scope', 'fgen')),
+        ('agilentMSOX4104A', ('scope', 'fgen')),
+        ('agilentMSOX4154A', ('scope', 'fgen')),
+        # InfiniiVision 6000A
+        ('agilentDSO6012A', ('scope',)),
+        ('agilentDSO6014A', ('scope',)),
+        ('agilentDSO6032A', ('scope',)),
+        ('agilentDSO6034A', ('scope',)),
+        ('agilentDSO6052A', ('scope',)),
+        ('agilentDSO6054A', ('scope',)),
+        ('agilentDSO6102A', ('scope',)),
+        ('agilentDSO6104A', ('scope',)),
+        ('agilentMSO6012A', ('scope',)),
+        ('agilentMSO6014A', ('scope',)),
+        ('agilentMSO6032A', ('scope',)),
+        ('agilentMSO6034A', ('scope',)),
+        ('agilentMSO6052A', ('scope',)),
+        ('agilentMSO6054A', ('scope',)),
+        ('agilentMSO6102A', ('scope',)),
+        ('agilentMSO6104A', ('scope',)),
+        # InfiniiVision 7000A
+        ('agilentDSO7012A', ('scope',)),
+        ('agilentDSO7014A', ('scope',)),
+        ('agilentDSO7032A', ('scope',)),
+        ('agilentDSO7034A', ('scope',)),
+        ('agilentDSO7052A', ('scope',)),
+        ('agilentDSO7054A', ('scope',)),
+        ('agilentDSO7104A', ('scope',)),
+        ('agilentMSO7012A', ('scope',)),
+        ('agilentMSO7014A', ('scope',)),
+        ('agilentMSO7032A', ('scope',)),
+        ('agilentMSO7034A', ('scope',)),
+        ('agilentMSO7052A', ('scope',)),
+        ('agilentMSO7054A', ('scope',)),
+        ('agilentMSO7104A', ('scope',)),
+        # InfiniiVision 7000B
+        ('agilentDSO7012B', ('scope',)),
+        ('agilentDSO7014B', ('scope',)),
+        ('agilentDSO7032B', ('scope',)),
+        ('agilentDSO7034B', ('scope',)),
+        ('agilentDSO7052B', ('scope',)),
+        ('agilentDSO7054B', ('scope',)),
+        ('agilentDSO7104B', ('scope',)),
+        ('agilentMSO7012B', ('scope',)),
+        ('agilentMSO7014B', ('scope',)),
+        ('agilentMSO7032B', ('scope',)),
+        ('agilentMSO7034B', ('scope',)),
+        ('agilentMSO7052B', ('scope',)),
+        ('agilentMSO7054B', ('scope',)),
+        ('agilentMSO7104B', ('scope',)),
+        # Infiniium 90000A
+        ('agilentDSO90254A', ('scope',)),
+        ('agilentDSO90404A', ('scope',)),
+        ('agilentDSO90604A', ('scope',)),
+        ('agilentDSO90804A', ('scope',)),
+        ('agilentDSO91204A', ('scope',)),
+        ('agilentDSO91304A', ('scope',)),
+        ('agilentDSA90254A', ('scope',)),
+        ('agilentDSA90404A', ('scope',)),
+        ('agilentDSA90604A', ('scope',)),
+        ('agilentDSA90804A', ('scope',)),
+        ('agilentDSA91204A', ('scope',)),
+        ('agilentDSA91304A', ('scope',)),
+        # Infiniium 90000X
+        ('agilentDSOX91304A', ('scope',)),
+        ('agilentDSOX91604A', ('scope',)),
+        ('agilentDSOX92004A', ('scope',)),
+        ('agilentDSOX92504A', ('scope',)),
+        ('agilentDSOX92804A', ('scope',)),
+        ('agilentDSOX93204A', ('scope',)),
+        ('agilentDSAX91304A', ('scope',)),
+        ('agilentDSAX91604A', ('scope',)),
+        ('agilentDSAX92004A', ('scope',)),
+        ('agilentDSAX92504A', ('scope',)),
+        ('agilentDSAX92804A', ('scope',)),
+        ('agilentDSAX93204A', ('scope',)),
+        ('agilentMSOX91304A', ('scope',)),
+        ('agilentMSOX91604A', ('scope',)),
+        ('agilentMSOX92004A', ('scope',)),
+        ('agilentMSOX92504A', ('scope',)),
+        ('agilentMSOX92804A', ('scope',)),
+        ('agilentMSOX93204A', ('scope',)),
 
-# Digital Multimeters
-from .agilent34401A import agilent34401A
-from .agilent34410A import agilent34410A
-from .agilent34411A import agilent34411A
-from .agilent34461A import agilent34461A
-from .agilent3456A import agilent3456A
-from .agilent3458A import agilent3458A
+        # Spectrum Analyzers
+        # 859xA series
+        ('agilent8590A', ('specan',)),
+        ('agilent8590B', ('specan',)),
+        ('agilent8591A', ('specan',)),
+        ('agilent8592A', ('specan',)),
+        ('agilent8592B', ('specan',)),
+        ('agilent8593A', ('specan',)),
+        ('agilent8594A', ('specan',)),
+        ('agilent8595A', ('specan',)),
+        # 859xE series
+        ('agilent8590E', ('specan',)),
+        ('agilent8590L', ('specan',)),
+        ('agilent8591C', ('specan',)),
+        ('agilent8591E', ('specan',)),
+        ('agilent8591EM', ('specan',)),
+        ('agilent8592L', ('specan',)),
+        ('agilent8593E', ('specan',)),
+        ('agilent8593EM', ('specan',)),
+        ('agilent8594E', ('specan',)),
+        ('agilent8594EM', ('specan',)),
+        ('agilent8594L', ('specan',)),
+        ('agilent8594Q', ('specan',)),
+        ('agilent8595E', ('specan',)),
+        ('agilent8595EM', ('specan',)),
+        ('agilent8596E', ('specan',)),
+        ('agilent8596EM', ('specan',)),
 
-# DC Power Supplies
-# 603xA
-from .agilent6030A import agilent6030A
-from .agilent6031A import agilent6031A
-from .agilent6032A import agilent6032A
-from .agilent6033A import agilent6033A
-from .agilent6035A import agilent6035A
-from .agilent6038A import agilent6038A
-# E3600A
-from .agilentE3631A import agilentE3631A
-from .agilentE3632A import agilentE3632A
-from .agilentE3633A import agilentE3633A
-from .agilentE3634A import agilentE3634A
-from .agilentE3640A import agilentE3640A
-from .agilentE3641A import agilentE3641A
-from .agilentE3642A import agilentE3642A
-from .agilentE3643A import agilentE3643A
-from .agilentE3644A import agilentE3644A
-from .agilentE3645A import agilentE3645A
-from .agilentE3646A import agilentE3646A
-from .agilentE3647A import agilentE3647A
-from .agilentE3648A import agilentE3648A
-from .agilentE3649A import agilentE3649A
+        # Digital Multimeters
+        ('agilent34401A', ('dmm',)),
+        ('agilent34410A', ('dmm',)),
+        ('agilent34411A', ('dmm',)),
+        ('agilent34461A', ('dmm',)),
+        ('agilent3456A', ('dmm',)),
+        ('agilent3458A', ('dmm',)),
 
-# Source measure units
-from .agilentU2722A import agilentU2722A
-from .agilentU2723A import agilentU2723A
+        # DC Power Supplies
+        # 603xA
+        ('agilent6030A', ('dcpwr',)),
+        ('agilent6031A', ('dcpwr',)),
+        ('agilent6032A', ('dcpwr',)),
+        ('agilent6033A', ('dcpwr',)),
+        ('agilent6035A', ('dcpwr',)),
+        ('agilent6038A', ('dcpwr',)),
+        # E3600A
+        ('agilentE3631A', ('dcpwr',)),
+        ('agilentE3632A', ('dcpwr',)),
+        ('agilentE3633A', ('dcpwr',)),
+        ('agilentE3634A', ('dcpwr',)),
+        ('agilentE3640A', ('dcpwr',)),
+        ('agilentE3641A', ('dcpwr',)),
+        ('agilentE3642A', ('dcpwr',)),
+        ('agilentE3643A', ('dcpwr',)),
+        ('agilentE3644A', ('dcpwr',)),
+        ('agilentE3645A', ('dcpwr',)),
+        ('agilentE3646A', ('dcpwr',)),
+        ('agilentE3647A', ('dcpwr',)),
+        ('agilentE3648A', ('dcpwr',)),
+        ('agilentE3649A', ('dcpwr',)),
 
-# RF Power Meters
-from .agilent436A import agilent436A
-from .agilent437B import agilent437B
-# U2000 series
-from .agilentU2000A import agilentU2000A
-from .agilentU2000B import agilentU2000B
-from .agilentU2000H import agilentU2000H
-from .agilentU2001A import agilentU2001A
-from .agilentU2001B import agilentU2001B
-from .agilentU2001H import agilentU2001H
-from .agilentU2002A import agilentU2002A
-from .agilentU2002H import agilentU2002H
-from .agilentU2004A import agilentU2004A
+        # Source measure units
+        ('agilentU2722A', ('dcpwr',)),
+        ('agilentU2723A', ('dcpwr',)),
 
-# RF Signal Generators
-# 8642A/B
-from .agilent8642A import agilent8642A
-from .agilent8642B import agilent8642B
-# E4400B ESG
-from .agilentE4400B import agilentE4400B
-from .agilentE4420B import agilentE4420B
-from .agilentE4421B import agilentE4421B
-from .agilentE4422B import agilentE4422B
-from .agilentE4423B import agilentE4423B
-from .agilentE4424B import agilentE4424B
-from .agilentE4425B import agilentE4425B
-from .agilentE4426B import agilentE4426B
-from .agilentE4430B import agilentE4430B
-from .agilentE4431B import agilentE4431B
-from .agilentE4432B import agilentE4432B
-from .agilentE4433B import agilentE4433B
-from .agilentE4434B import agilentE4434B
-from .agilentE4435B import agilentE4435B
-from .agilentE4436B import agilentE4436B
-from .agilentE4437B import agilentE4437B
+        # RF Power Meters
+        ('agilent436A', ('pwrmeter',)),
+        ('agilent437B', ('pwrmeter',)),
+        # U2000 series
+        ('agilentU2000A', ('pwrmeter',)),
+        ('agilentU2000B', ('pwrmeter',)),
+        ('agilentU2000H', ('pwrmeter',)),
+        ('agilentU2001A', ('pwrmeter',)),
+        ('agilentU2001B', ('pwrmeter',)),
+        ('agilentU2001H', ('pwrmeter',)),
+        ('agilentU2002A', ('pwrmeter',)),
+        ('agilentU2002H', ('pwrmeter',)),
+        ('agilentU2004A', ('pwrmeter',)),
 
-# RF Sweep Generators
-from .agilent8340A import agilent8340A
-from .agilent8340B import agilent8340B
-from .agilent8341A import agilent8341A
-from .agilent8341B import agilent8341B
+        # RF Signal Generators
+        # 8642A/B
+        ('agilent8642A', ('rfsiggen',)),
+        ('agilent8642B', ('rfsiggen',)),
+        # E4400B ESG
+        ('agilentE4400B', ('rfsiggen',)),
+        ('agilentE4420B', ('rfsiggen',)),
+        ('agilentE4421B', ('rfsiggen',)),
+        ('agilentE4422B', ('rfsiggen',)),
+        ('agilentE4423B', ('rfsiggen',)),
+        ('agilentE4424B', ('rfsiggen',)),
+        ('agilentE4425B', ('rfsiggen',)),
+        ('agilentE4426B', ('rfsiggen',)),
+        ('agilentE4430B', ('rfsiggen',)),
+        ('agilentE4431B', ('rfsiggen',)),
+        ('agilentE4432B', ('rfsiggen',)),
+        ('agilentE4433B', ('rfsiggen',)),
+        ('agilentE4434B', ('rfsiggen',)),
+        ('agilentE4435B', ('rfsiggen',)),
+        ('agilentE4436B', ('rfsiggen',)),
+        ('agilentE4437B', ('rfsiggen',)),
 
-# Tracking sources
-from .agilent85644A import agilent85644A
-from .agilent85645A import agilent85645A
+        # RF Sweep Generators
+        ('agilent8340A', ('rfsiggen',)),
+        ('agilent8340B', ('rfsiggen',)),
+        ('agilent8341A', ('rfsiggen',)),
+        ('agilent8341B', ('rfsiggen',)),
 
-# Optical spectrum analyzers
-from .agilent86140B import agilent86140B
-from .agilent86141B import agilent86141B
-from .agilent86142B import agilent86142B
-from .agilent86144B import agilent86144B
-from .agilent86145B import agilent86145B
-from .agilent86146B import agilent86146B
-
-# Optical attenuators
-from .agilent8156A import agilent8156A
+        # Tracking sources
+        ('agilent85644A', ()),
+        ('agilent85645A', ()),
 
+        # Optical spectrum analyzers
+        ('agilent86140B', ()),
+        ('agilent86141B', ()),
+        ('agilent86142B', ()),
+        ('agilent86144B', ()),
+        ('agilent86145B', ()),
+        ('agilent86146B', ()),
 
+        # Optical attenuators
+        ('agilent8156A', ())])
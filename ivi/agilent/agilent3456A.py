@@ -33,6 +33,9 @@ from collections import OrderedDict
 from .. import ivi
 from .. import dmm
 
+# a single reading, e.g. +1.234567E+0
+ResultPattern = r'[+-][0-9.]{8}E[+-]\d'
+
 TriggerSourceMapping = {
         'immediate': '1',
         'bus': '4',
@@ -119,6 +122,7 @@ class agilent3456A(ivi.Driver, dmm.Base, dmm.MultiPoint, dmm.SoftwareTrigger):
         self.__dict__.setdefault('_instrument_id', '3456A')
 
         super(agilent3456A, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         self._identity_description = "HP 3456A DMM"
         self._identity_identifier = "3456A"
         self._identity_revision = ""
@@ -182,8 +186,7 @@ class agilent3456A(ivi.Driver, dmm.Base, dmm.MultiPoint, dmm.SoftwareTrigger):
         pass
 
     def _parse_measurement_result(self, raw_result):
-        matches = re.fullmatch(r'([+-][0-9.]{8}E[+-]\d)',
-                raw_result)
+        matches = re.fullmatch('({0})'.format(ResultPattern), raw_result)
         if not matches:
             raise ivi.UnexpectedResponseException(
                 'Unexpected response: {0}'.format(raw_result))
@@ -339,15 +342,16 @@ class agilent3456A(ivi.Driver, dmm.Base, dmm.MultiPoint, dmm.SoftwareTrigger):
         if num_of_measurements == 0 \
                 or num_of_measurements > self._READINGS_MEMORY_SIZE:
             num_of_measurements = self._READINGS_MEMORY_SIZE
-        readings = []
         # The instrument has no seek instruction, so always read through the
         # entire memory, even if we do not want to save all of them.
         self._write('-{0:d}STR'.format(num_of_measurements))
         self._write('RER')
-        raw_results = self._read().split(',')
-        for raw_result in raw_results:
-            readings.append(self._parse_measurement_result(raw_result))
-        return readings
+        raw_results = self._read()
+        # validate every reading in one pass before converting them all at once
+        if not re.fullmatch('{0}(,{0})*'.format(ResultPattern), raw_results):
+            raise ivi.UnexpectedResponseException(
+                'Unexpected response: {0}'.format(raw_results))
+        return ivi.parse_ascii_values(raw_results).tolist()
 
     def _measurement_read_multi_point(self, max_time, num_of_measurements = 0):
         if self._driver_operation_simulate:
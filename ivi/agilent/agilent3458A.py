@@ -81,6 +81,7 @@ class agilent3458A(ivi.Driver, dmm.Base, dmm.SoftwareTrigger):
         self.__dict__.setdefault('_instrument_id', '3458A')
 
         super(agilent3458A, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         self._identity_description = "HP 3458A DMM"
         self._identity_identifier = "3458A"
         self._identity_revision = ""
@@ -36,6 +36,7 @@ class agilent436A(ivi.Driver, pwrmeter.Base, pwrmeter.ZeroCorrection, pwrmeter.M
         self.__dict__.setdefault('_instrument_id', '436A')
         
         super(agilent436A, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         
         self._identity_description = "Agilent 436A RF power meter driver"
         self._identity_identifier = ""
@@ -120,9 +121,6 @@ class agilent436A(ivi.Driver, pwrmeter.Base, pwrmeter.ZeroCorrection, pwrmeter.M
         #    error_message = error_message.strip(' "')
         return (error_code, error_message)
     
-    def _utility_lock_object(self):
-        pass
-    
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             #self._write("*RST")
@@ -142,9 +140,6 @@ class agilent436A(ivi.Driver, pwrmeter.Base, pwrmeter.ZeroCorrection, pwrmeter.M
         #return (code, message)
         raise ivi.OperationNotSupportedException()
     
-    def _utility_unlock_object(self):
-        pass
-    
     
     def _init_channels(self):
         try:
@@ -41,6 +41,7 @@ class agilent437B(ivi.Driver, pwrmeter.Base, pwrmeter.ManualRange,
         self.__dict__.setdefault('_instrument_id', '437B')
         
         super(agilent437B, self).__init__(*args, **kwargs)
+        self._batch_supported = False
 
         self._channel_count = 1
         
@@ -123,9 +124,6 @@ class agilent437B(ivi.Driver, pwrmeter.Base, pwrmeter.ManualRange,
         #    error_message = error_message.strip(' "')
         return (error_code, error_message)
     
-    def _utility_lock_object(self):
-        pass
-    
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("*RST")
@@ -145,9 +143,6 @@ class agilent437B(ivi.Driver, pwrmeter.Base, pwrmeter.ManualRange,
         return (code, message)
         raise ivi.OperationNotSupportedException()
     
-    def _utility_unlock_object(self):
-        pass
-    
     
     def _init_channels(self):
         try:
@@ -39,6 +39,7 @@ class agilent603xA(ivi.Driver, dcpwr.Base, dcpwr.Measurement):
         self.__dict__.setdefault('_instrument_id', '')
         
         super(agilent603xA, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         
         self._output_count = 1
         
@@ -130,9 +131,6 @@ class agilent603xA(ivi.Driver, dcpwr.Base, dcpwr.Measurement):
             error_message = error_message.strip(' "')
         return (error_code, error_message)
     
-    def _utility_lock_object(self):
-        pass
-    
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("CLR")
@@ -150,9 +148,6 @@ class agilent603xA(ivi.Driver, dcpwr.Base, dcpwr.Measurement):
                 message = "Self test failed"
         return (code, message)
     
-    def _utility_unlock_object(self):
-        pass
-    
     
     
     def _init_outputs(self):
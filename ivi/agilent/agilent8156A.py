@@ -33,6 +33,7 @@ class agilent8156A(ivi.Driver):
         self.__dict__.setdefault('_instrument_id', '')
 
         super(agilent8156A, self).__init__(*args, **kwargs)
+        self._batch_supported = False
 
         self._identity_description = "Agilent 8156A optical attenuator driver"
         self._identity_identifier = ""
@@ -147,9 +148,6 @@ class agilent8156A(ivi.Driver):
             error_message = error_message.strip(' "')
         return (error_code, error_message)
 
-    def _utility_lock_object(self):
-        pass
-
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("*RST")
@@ -168,9 +166,6 @@ class agilent8156A(ivi.Driver):
                 message = "Self test failed"
         return (code, message)
 
-    def _utility_unlock_object(self):
-        pass
-
 
 
     def _get_attenuation(self):
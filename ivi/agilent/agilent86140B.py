@@ -425,9 +425,6 @@ class agilent86140B(ivi.Driver, extra.common.Screenshot, scpi.common.Memory):
             error_message = error_message.strip(' "')
         return (error_code, error_message)
     
-    def _utility_lock_object(self):
-        pass
-    
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("*RST")
@@ -446,9 +443,6 @@ class agilent86140B(ivi.Driver, extra.common.Screenshot, scpi.common.Memory):
                 message = "Self test failed"
         return (code, message)
     
-    def _utility_unlock_object(self):
-        pass
-    
     
     def _init_traces(self):
         try:
@@ -735,17 +729,10 @@ class agilent86140B(ivi.Driver, extra.common.Screenshot, scpi.common.Memory):
         name = self._trace_name[index]
         
         if self._driver_operation_simulate:
-            return list()
-        
-        self._write('format:data ascii')
-        l = self._ask('trace:data:y? %s' % name)
-        
-        data = list()
-        
-        for p in l.split(','):
-            data.append(float(p))
+            return ivi.parse_binary_values(b'', 'f4')
         
-        return data
+        self._write('format:data real,32')
+        return self._ask_for_binary_values('trace:data:y? %s' % name, 'f4')
     
     def _acquisition_initiate(self):
         if not self._driver_operation_simulate:
@@ -160,6 +160,7 @@ class agilent8642A(ivi.Driver, rfsiggen.Base, rfsiggen.ModulateAM,
         self.__dict__.setdefault('_instrument_id', 'HP8642A')
         
         super(agilent8642A, self).__init__(*args, **kwargs)
+        self._batch_supported = False
     
         self._identity_description = "Agilent 8642 IVI RF signal generator driver"
         self._identity_identifier = ""
@@ -236,9 +237,6 @@ class agilent8642A(ivi.Driver, rfsiggen.Base, rfsiggen.ModulateAM,
                 error_message = Messages[error_code]
         return (error_code, error_message)
     
-    def _utility_lock_object(self):
-        pass
-    
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("IP")
@@ -252,9 +250,6 @@ class agilent8642A(ivi.Driver, rfsiggen.Base, rfsiggen.ModulateAM,
         message = "Self test passed"
         return (code, message)
     
-    def _utility_unlock_object(self):
-        pass
-    
     
     
     def _get_rf_frequency(self):
@@ -39,6 +39,7 @@ class agilentBase8340(rfsiggen.Base, rfsiggen.ModulateAM, rfsiggen.ModulateFM,
         self.__dict__.setdefault('_instrument_id', '')
 
         super(agilentBase8340, self).__init__(*args, **kwargs)
+        self._batch_supported = False
 
         self._identity_description = "Agilent 8340 IVI RF sweep generator driver"
         self._identity_identifier = ""
@@ -124,9 +125,6 @@ class agilentBase8340(rfsiggen.Base, rfsiggen.ModulateAM, rfsiggen.ModulateFM,
         #        error_message = Messages[error_code]
         return (error_code, error_message)
 
-    def _utility_lock_object(self):
-        pass
-
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("IP")
@@ -140,9 +138,6 @@ class agilentBase8340(rfsiggen.Base, rfsiggen.ModulateAM, rfsiggen.ModulateFM,
         message = "Self test passed"
         return (code, message)
 
-    def _utility_unlock_object(self):
-        pass
-
 
     def _memory_save(self, index):
         index = int(index)
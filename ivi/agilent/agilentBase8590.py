@@ -24,10 +24,8 @@ THE SOFTWARE.
 
 """
 
-import array
 import io
 import struct
-import sys
 import time
 
 import numpy as np
@@ -61,6 +59,7 @@ class agilentBase8590(ivi.Driver, specan.Base,
         self.__dict__.setdefault('_instrument_id', '')
         
         super(agilentBase8590, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         
         self._trace_count = 3
 
@@ -225,9 +224,6 @@ class agilentBase8590(ivi.Driver, specan.Base,
             error_message = error_message.strip(' "')
         return (error_code, error_message)
     
-    def _utility_lock_object(self):
-        pass
-    
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("IP")
@@ -249,9 +245,6 @@ class agilentBase8590(ivi.Driver, specan.Base,
                 message = "Self test failed"
         return (code, message)
     
-    def _utility_unlock_object(self):
-        pass
-
 
 
     def _init_traces(self):
@@ -832,10 +825,7 @@ class agilentBase8590(ivi.Driver, specan.Base,
             trace.y_origin = 0
             trace.y_reference = 0
 
-        trace.y_raw = array.array('h', buf)
-
-        if sys.byteorder == 'little':
-            trace.y_raw.byteswap()
+        trace.y_raw = np.frombuffer(buf, '>i2')
 
         return trace
 
@@ -24,8 +24,6 @@ THE SOFTWARE.
 
 """
 
-import array
-import sys
 import time
 
 from .. import ivi
@@ -202,6 +200,10 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
         
         self._acquisition_segmented_count = 2
         self._acquisition_segmented_index = 1
+        self._waveform_settings = dict()
+        self._waveform_preamble = dict()
+        self._waveform_transfer = [('byteorder', 'lsbfirst'), ('unsigned', '1'), ('format', 'word')]
+        self._waveform_dtype = '<u2'
         self._timebase_mode = 'main'
         self._timebase_reference = 'center'
         self._timebase_position = 0.0
@@ -463,6 +465,22 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
                         or an empty string to clear the advisory line.  
                         """))
         
+        self._set_cache_dependencies('timebase_position', 'timebase_window_position')
+        self._set_cache_dependencies('timebase_range', 'timebase_window_scale', 'timebase_window_range')
+        self._set_cache_dependencies('timebase_scale', 'timebase_window_scale', 'timebase_window_range')
+        self._set_cache_dependencies('channel_probe_attenuation', 'channel_offset', 'channel_scale',
+                        'channel_range', 'channel_trigger_level', 'trigger_level')
+        self._set_cache_dependencies('channel_range', 'channel_offset')
+        self._set_cache_dependencies('channel_scale', 'channel_offset')
+        self._set_cache_dependencies('channel_trigger_level', 'trigger_level')
+        self._set_cache_dependencies('trigger_level', 'channel_trigger_level')
+        self._set_cache_dependencies('measurement_initiate', 'trigger_continuous')
+        self._set_cache_dependencies('measurement_auto_setup', '*')
+        # the waveform preamble follows the timebase, acquisition and channel setup
+        for name in dir(type(self)):
+            if name.startswith(('_set_timebase_', '_set_acquisition_', '_set_channel_')):
+                self._add_cache_dependencies(name, 'waveform_preamble')
+        
         self._init_channels()
     
     def _initialize(self, resource = None, id_query = False, reset = False, **keywargs):
@@ -492,12 +510,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
     def _utility_disable(self):
         pass
     
-    def _utility_lock_object(self):
-        pass
-    
-    def _utility_unlock_object(self):
-        pass
-    
     def _init_channels(self):
         try:
             super(agilentBaseScope, self)._init_channels()
@@ -558,7 +570,7 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
         
         self._write_ieee_block(data, ':system:setup ')
         
-        self.driver_operation.invalidate_all_attributes()
+        self._invalidate_cache_dependents()
     
     def _system_display_string(self, string = None):
         if string is None:
@@ -624,6 +636,34 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
             return float(self._ask(":waveform:segmented:ttag?"))
         return 0.0
 
+    def _get_batch_queries(self):
+        def mapping(m):
+            return lambda value: [k for k,v in m.items() if v==value.lower()][0]
+        def boolean(value):
+            return bool(int(value))
+        queries = super(agilentBaseScope, self)._get_batch_queries()
+        for i in range(self._analog_channel_count):
+            name = self._channel_name[i]
+            queries.extend([
+                (":%s:display?" % name, boolean, 'channel_enabled', i),
+                (":%s:offset?" % name, float, 'channel_offset', i),
+                (":%s:range?" % name, float, 'channel_range', i),
+                (":%s:scale?" % name, float, 'channel_scale', i),
+                (":%s:coupling?" % name, lambda value: value.lower(), 'channel_coupling', i),
+                (":%s:probe?" % name, float, 'channel_probe_attenuation', i),
+                (":%s:invert?" % name, boolean, 'channel_invert', i),
+                (":%s:bwlimit?" % name, boolean, 'channel_bw_limit', i)])
+        queries.extend([
+            (":timebase:mode?", mapping(TimebaseModeMapping), 'timebase_mode'),
+            (":timebase:reference?", mapping(TimebaseReferenceMapping), 'timebase_reference'),
+            (":timebase:position?", float, 'timebase_position'),
+            (":timebase:range?", float, 'timebase_range'),
+            (":timebase:scale?", float, 'timebase_scale'),
+            (":trigger:level?", float, 'trigger_level'),
+            (":trigger:edge:slope?", mapping(SlopeMapping), 'trigger_edge_slope'),
+            (":trigger:source?", lambda value: value.lower(), 'trigger_source')])
+        return queries
+    
     def _get_timebase_mode(self):
         if not self._driver_operation_simulate and not self._get_cache_valid():
             value = self._ask(":timebase:mode?").lower()
@@ -666,7 +706,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
             self._write(":timebase:position %e" % value)
         self._timebase_position = value
         self._set_cache_valid()
-        self._set_cache_valid(False, 'timebase_window_position')
         
     def _get_timebase_range(self):
         if not self._driver_operation_simulate and not self._get_cache_valid():
@@ -684,8 +723,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
         self._timebase_scale = value / self._horizontal_divisions
         self._set_cache_valid()
         self._set_cache_valid(True, 'timebase_scale')
-        self._set_cache_valid(False, 'timebase_window_scale')
-        self._set_cache_valid(False, 'timebase_window_range')
         
     def _get_timebase_scale(self):
         if not self._driver_operation_simulate and not self._get_cache_valid():
@@ -703,8 +740,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
         self._timebase_range = value * self._horizontal_divisions
         self._set_cache_valid()
         self._set_cache_valid(True, 'timebase_range')
-        self._set_cache_valid(False, 'timebase_window_scale')
-        self._set_cache_valid(False, 'timebase_window_range')
         
     def _get_timebase_window_position(self):
         if not self._driver_operation_simulate and not self._get_cache_valid():
@@ -905,11 +940,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
             self._write(":%s:probe %e" % (self._channel_name[index], value))
         self._channel_probe_attenuation[index] = value
         self._set_cache_valid(index=index)
-        self._set_cache_valid(False, 'channel_offset', index)
-        self._set_cache_valid(False, 'channel_scale', index)
-        self._set_cache_valid(False, 'channel_range', index)
-        self._set_cache_valid(False, 'channel_trigger_level', index)
-        self._set_cache_valid(False, 'trigger_level')
     
     def _get_channel_probe_skew(self, index):
         index = ivi.get_index(self._analog_channel_name, index)
@@ -1012,7 +1042,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
         self._channel_scale[index] = value / self._vertical_divisions
         self._set_cache_valid(index=index)
         self._set_cache_valid(True, "channel_scale", index)
-        self._set_cache_valid(False, "channel_offset", index)
     
     def _get_channel_scale(self, index):
         index = ivi.get_index(self._channel_name, index)
@@ -1032,7 +1061,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
         self._channel_range[index] = value * self._vertical_divisions
         self._set_cache_valid(index=index)
         self._set_cache_valid(True, "channel_range", index)
-        self._set_cache_valid(False, "channel_offset", index)
     
     def _get_channel_trigger_level(self, index):
         index = ivi.get_index(self._channel_name, index)
@@ -1048,7 +1076,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
             self._write(":trigger:level %e, %s" % (value, self._channel_name[index]))
         self._channel_trigger_level[index] = value
         self._set_cache_valid(index=index)
-        self._set_cache_valid(False, "trigger_level")
 
     def _get_measurement_status(self):
         return self._measurement_status
@@ -1099,7 +1126,6 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
             self._write(":trigger:level %e" % value)
         self._trigger_level = value
         self._set_cache_valid()
-        for i in range(self._analog_channel_count): self._set_cache_valid(False, 'channel_trigger_level', i)
     
     def _get_trigger_edge_slope(self):
         if not self._driver_operation_simulate and not self._get_cache_valid():
@@ -1333,25 +1359,26 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
     def _set_trigger_ac_line_slope(self, value):
         self._set_trigger_edge_slope(value)
     
-    def _measurement_fetch_waveform(self, index):
-        index = ivi.get_index(self._channel_name, index)
-
-        if self._driver_operation_simulate:
-            return ivi.TraceYT()
-
-        self._write(":waveform:source %s" % self._channel_name[index])
-        if sys.byteorder == 'little':
-            self._write(":waveform:byteorder lsbfirst")
-        else:
-            self._write(":waveform:byteorder msbfirst")
-        self._write(":waveform:unsigned 1")
-        self._write(":waveform:format word")
-
+    def _write_waveform_setting(self, name, value):
+        "Send a :waveform transfer setting unless the instrument already has it"
+        tag = 'waveform_' + name
+        if self._get_cache_valid(tag) and self._waveform_settings.get(name) == value:
+            return
+        self._write(":waveform:%s %s" % (name, value))
+        self._waveform_settings[name] = value
+        self._set_cache_valid(True, tag)
+    
+    def _get_waveform_preamble(self, index):
+        "Preamble of the current waveform source, which must be channel index"
+        if not self._get_cache_valid(index=index):
+            self._waveform_preamble[index] = self._ask(":waveform:preamble?").split(',')
+            self._set_cache_valid(index=index)
+        return self._waveform_preamble[index]
+    
+    def _waveform_trace(self, pre):
+        "Create a trace scaled by preamble pre, returns the trace and the number of points"
         trace = ivi.TraceYT()
 
-        # Read preamble
-        pre = self._ask(":waveform:preamble?").split(',')
-
         acq_format = int(pre[0])
         acq_type = int(pre[1])
         points = int(pre[2])
@@ -1368,16 +1395,86 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
             raise scope.InvalidAcquisitionTypeException()
 
         if acq_format != 1:
-            raise UnexpectedResponseException()
+            raise ivi.UnexpectedResponseException()
 
-        # Read waveform data
-        raw_data = self._ask_for_ieee_block(":waveform:data?")
+        return trace, points
+
+    def _read_waveform_data(self):
+        "Read the response to :waveform:data?"
+        raw_data = self._read_ieee_block()
         self._read_raw() # flush buffer
+        return raw_data
+
+    def _waveform_data_trace(self, index, trace, points, raw_data):
+        "Store the samples of raw_data in trace, re-reading the preamble if its record length is stale"
+        y_raw = ivi.sample_view(raw_data, self._waveform_dtype)
+        if len(y_raw) != points:
+            # the record length changed without a driver setter, e.g. on the
+            # front panel, so the cached preamble no longer describes the data
+            self._set_cache_valid(False, 'waveform_preamble', index)
+            trace, points = self._waveform_trace(self._get_waveform_preamble(index))
+        trace.y_raw = y_raw[:points]
+        return trace
+
+    def _measurement_fetch_waveform(self, index):
+        index = ivi.get_index(self._channel_name, index)
+
+        if self._driver_operation_simulate:
+            return ivi.TraceYT()
+
+        with self.batch():
+            self._write_waveform_setting('source', self._channel_name[index])
+            for name, value in self._waveform_transfer:
+                self._write_waveform_setting(name, value)
+
+        # Read preamble
+        trace, points = self._waveform_trace(self._get_waveform_preamble(index))
+
+        # Read waveform data
+        self._write(":waveform:data?")
+        raw_data = self._read_waveform_data()
 
         # Store in trace object
-        trace.y_raw = array.array('H', raw_data[0:points*2])
+        return self._waveform_data_trace(index, trace, points, raw_data)
 
-        return trace
+    def _measurement_fetch_waveform_list(self, indices):
+        if self._driver_operation_simulate:
+            return [ivi.TraceYT() for index in indices]
+
+        with self.batch():
+            for name, value in self._waveform_transfer:
+                self._write_waveform_setting(name, value)
+
+        # Read the missing preambles with one compound query
+        missing = [index for index in indices if not self._get_cache_valid('waveform_preamble', index)]
+        if missing:
+            queries = []
+            for index in missing:
+                queries.append(":waveform:source %s" % self._channel_name[index])
+                queries.append(":waveform:preamble?")
+            for index, pre in zip(missing, self._ask_many(queries)):
+                self._waveform_preamble[index] = pre.split(',')
+                self._set_cache_valid(True, 'waveform_preamble', index)
+            self._waveform_settings['source'] = self._channel_name[missing[-1]]
+            self._set_cache_valid(True, 'waveform_source')
+
+        traces = list()
+        for index in indices:
+            trace, points = self._waveform_trace(self._waveform_preamble[index])
+
+            # Select the source in the same message as the data query
+            name = self._channel_name[index]
+            if self._get_cache_valid('waveform_source') and self._waveform_settings.get('source') == name:
+                self._write(":waveform:data?")
+            else:
+                self._write(":waveform:source %s;:waveform:data?" % name)
+                self._waveform_settings['source'] = name
+                self._set_cache_valid(True, 'waveform_source')
+            raw_data = self._read_waveform_data()
+
+            traces.append(self._waveform_data_trace(index, trace, points, raw_data))
+
+        return traces
     
     def _measurement_read_waveform(self, index, maximum_time):
         return self._measurement_fetch_waveform(index)
@@ -1386,7 +1483,7 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
         if not self._driver_operation_simulate:
             self._write(":acquire:complete 100")
             self._write(":digitize")
-            self._set_cache_valid(False, 'trigger_continuous')
+            self._invalidate_cache_dependents()
     
     def _get_reference_levels(self):
         if not self._driver_operation_simulate and not self._get_cache_valid():
@@ -1396,9 +1493,9 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
                 self._reference_level_low = float(low)
                 self._reference_level_middle = float(middle)
                 self._set_cache_valid()
-                self._set_cache_valid('reference_level_high')
-                self._set_cache_valid('reference_level_low')
-                self._set_cache_valid('reference_level_middle')
+                self._set_cache_valid(True, 'reference_level_high')
+                self._set_cache_valid(True, 'reference_level_low')
+                self._set_cache_valid(True, 'reference_level_middle')
 
     def _get_reference_level_high(self):
         if not self._driver_operation_simulate and not self._get_cache_valid():
@@ -1558,6 +1655,7 @@ class agilentBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.comm
     def _measurement_auto_setup(self):
         if not self._driver_operation_simulate:
             self._write(":autoscale")
+            self._invalidate_cache_dependents()
     
     
     
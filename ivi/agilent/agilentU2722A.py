@@ -111,12 +111,6 @@ class agilentU2722A(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.common.
     def _utility_disable(self):
         pass
 
-    def _utility_lock_object(self):
-        pass
-
-    def _utility_unlock_object(self):
-        pass
-
     def _init_outputs(self):
         try:
             super(agilentU2722A, self)._init_outputs()
@@ -0,0 +1,54 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import unittest
+
+from ... import ivi
+from ...test.support import RecordingInterface
+from .. import agilent3456A
+
+class TestAgilent3456A(unittest.TestCase):
+
+    def setUp(self):
+        self.instr = RecordingInterface()
+        self.dmm = agilent3456A(self.instr)
+        del self.instr.writes[:]
+
+    def test_fetch_multi_point(self):
+        self.instr.respond(b'+1.234567E+0,-0.000012E-3\r\n')
+        self.assertEqual(self.dmm.measurement.fetch_multi_point(0, 2), [1.234567, -1.2e-08])
+        self.assertEqual(self.instr.writes, [b'-2STR', b'RER'])
+
+    def test_fetch_multi_point_invalid(self):
+        for response in [b'+1.234567E+0,+9.999999E+9 OVLD\r\n', b'+1.234567E+0,1.5\r\n',
+                b'+1.234567E+0,\r\n']:
+            self.instr.respond(response)
+            self.assertRaises(ivi.UnexpectedResponseException,
+                self.dmm.measurement.fetch_multi_point, 0, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import numpy as np
+import unittest
+
+from ...test.support import RecordingInterface
+from .. import agilentDSO7104A, agilentMSO7104A, agilentDSO90254A
+
+PREAMBLE = b'1,0,4,1,1e-3,0,0,0.5,0,0\n'
+BLOCK = b'#18' + np.arange(4, dtype='<u2').tobytes() + b'\n'
+SETUP = b':waveform:source channel1;:waveform:byteorder lsbfirst;:waveform:unsigned 1;:waveform:format word'
+
+class TestAgilentWaveformCache(unittest.TestCase):
+
+    def setUp(self):
+        self.instr = RecordingInterface()
+        self.driver = agilentDSO7104A(self.instr)
+        self.fetch(0, True)
+
+    def fetch(self, index, preamble):
+        del self.instr.writes[:]
+        self.instr.data = (PREAMBLE if preamble else b'') + BLOCK
+        trace = self.driver.channels[index].measurement.fetch_waveform()
+        self.assertEqual(trace.y[1:].tolist(), [0.5, 1.0, 1.5])
+        self.assertEqual(self.instr.data, b'')
+        return self.instr.writes
+
+    def test_first_fetch(self):
+        self.assertEqual(self.fetch(1, True),
+            [b':waveform:source channel2', b':waveform:preamble?', b':waveform:data?'])
+
+    def test_second_fetch(self):
+        self.assertEqual(self.fetch(0, False), [b':waveform:data?'])
+
+    def test_short_block(self):
+        # the preamble is read again, the complete samples are kept
+        del self.instr.writes[:]
+        self.instr.data = b'#15' + BLOCK[3:8] + b'\n' + PREAMBLE
+        trace = self.driver.channels[0].measurement.fetch_waveform()
+        self.assertEqual(self.instr.writes, [b':waveform:data?', b':waveform:preamble?'])
+        self.assertEqual(trace.y_raw.tolist(), [0, 1])
+        self.assertEqual(self.instr.data, b'')
+
+    def test_record_length_changed(self):
+        # the cached preamble is for 4 points, the instrument now sends 6
+        block = b'#212' + np.arange(6, dtype='<u2').tobytes() + b'\n'
+        del self.instr.writes[:]
+        self.instr.data = block + PREAMBLE.replace(b'1,0,4,', b'1,0,6,')
+        trace = self.driver.channels[0].measurement.fetch_waveform()
+        self.assertEqual(self.instr.writes, [b':waveform:data?', b':waveform:preamble?'])
+        self.assertEqual(trace.y_raw.tolist(), list(range(6)))
+        self.assertEqual(len(trace.x), 6)
+        # the new preamble is cached
+        del self.instr.writes[:]
+        self.instr.data = block
+        self.driver.channels[0].measurement.fetch_waveform()
+        self.assertEqual(self.instr.writes, [b':waveform:data?'])
+
+    def test_channel_setter(self):
+        self.fetch(1, True)
+        self.driver.channels[1].scale = 1
+        writes = self.fetch(0, False)
+        self.assertEqual(writes, [b':waveform:source channel1', b':waveform:data?'])
+        writes = self.fetch(1, True)
+        self.assertEqual(writes, [b':waveform:source channel2', b':waveform:preamble?', b':waveform:data?'])
+
+    def test_timebase_setter(self):
+        self.fetch(1, True)
+        self.driver.timebase.scale = 1
+        writes = self.fetch(0, True)
+        self.assertEqual(writes[1:], [b':waveform:preamble?', b':waveform:data?'])
+        writes = self.fetch(1, True)
+        self.assertEqual(writes[1:], [b':waveform:preamble?', b':waveform:data?'])
+
+    def check_resent(self):
+        self.assertEqual(self.fetch(0, True), [SETUP, b':waveform:preamble?', b':waveform:data?'])
+
+    def test_reset(self):
+        self.driver.utility.reset()
+        self.check_resent()
+
+    def test_recall(self):
+        self.driver.memory.recall(1)
+        self.check_resent()
+
+    def test_auto_setup(self):
+        self.driver.measurement.auto_setup()
+        self.check_resent()
+
+class TestAgilentFetchWaveforms(unittest.TestCase):
+
+    def setUp(self):
+        self.instr = RecordingInterface()
+        self.driver = agilentDSO7104A(self.instr)
+        del self.instr.writes[:]
+
+    def test_channels(self):
+        pre3 = PREAMBLE.replace(b'0.5', b'2', 1)
+        self.instr.data = PREAMBLE.rstrip() + b';' + pre3 + BLOCK + BLOCK
+        traces = self.driver.measurement.fetch_waveforms(['channel1', 'channel3'])
+        self.assertEqual(self.instr.writes[1:], [
+            b':waveform:source channel1;:waveform:preamble?;:waveform:source channel3;:waveform:preamble?',
+            b':waveform:source channel1;:waveform:data?',
+            b':waveform:source channel3;:waveform:data?'])
+        self.assertEqual(self.instr.data, b'')
+        self.assertEqual(sorted(traces), ['channel1', 'channel3'])
+        self.assertEqual(traces['channel1'].y[1:].tolist(), [0.5, 1.0, 1.5])
+        self.assertEqual(traces['channel3'].y[1:].tolist(), [2.0, 4.0, 6.0])
+        self.assertTrue(traces['channel3'].x is traces['channel1'].x)
+
+    def test_share_x_by_scaling(self):
+        pre1 = PREAMBLE.replace(b'1e-3', b'2e-3', 1)
+        self.instr.data = pre1.rstrip() + b';' + PREAMBLE.rstrip() + b';' + PREAMBLE + BLOCK * 3
+        traces = self.driver.measurement.fetch_waveforms(['channel1', 'channel2', 'channel3'])
+        self.assertEqual(self.instr.data, b'')
+        self.assertFalse(traces['channel2'].x is traces['channel1'].x)
+        self.assertTrue(traces['channel3'].x is traces['channel2'].x)
+        self.assertEqual(traces['channel1'].x[1], 2e-3)
+        self.assertEqual(traces['channel2'].x[1], 1e-3)
+
+    def test_default_channels(self):
+        # only the enabled analog channels, the digital channels are skipped
+        self.driver = agilentMSO7104A(self.instr)
+        del self.instr.writes[:]
+        self.instr.data = b'0\n1\n0\n1\n' + PREAMBLE.rstrip() + b';' + PREAMBLE + BLOCK + BLOCK
+        traces = self.driver.measurement.fetch_waveforms()
+        self.assertEqual(self.instr.writes[:5], [b':channel1:display?', b':channel2:display?',
+            b':channel3:display?', b':channel4:display?', b':waveform:byteorder lsbfirst;:waveform:unsigned 1;:waveform:format word'])
+        self.assertEqual(sorted(traces), ['channel2', 'channel4'])
+        self.assertEqual(self.instr.data, b'')
+
+class TestInfiniiumFetchWaveform(unittest.TestCase):
+
+    def test_hole(self):
+        instr = RecordingInterface()
+        driver = agilentDSO90254A(instr)
+        del instr.writes[:]
+        instr.data = b'2,0,4,1,1e-3,0,0,0.5,0,0\n' + b'#18' + \
+            np.array([-2, 31232, 2, 4], dtype='<i2').tobytes()
+        trace = driver.channels[0].measurement.fetch_waveform()
+        self.assertEqual(instr.writes, [
+            b':waveform:source channel1;:waveform:byteorder lsbfirst;:waveform:format word;:waveform:streaming on',
+            b':waveform:preamble?', b':waveform:data?'])
+        self.assertEqual(instr.data, b'')
+        self.assertEqual(trace.y_raw.dtype, np.dtype('<i2'))
+        self.assertTrue(np.isnan(trace.y[1]))
+        self.assertEqual(trace.y[[0, 2, 3]].tolist(), [-1.0, 1.0, 2.0])
+        self.assertTrue(np.allclose(trace.x, [0, 1e-3, 2e-3, 3e-3]))
+
+class TestAgilentQueryBatch(unittest.TestCase):
+
+    def test_scale(self):
+        instr = RecordingInterface()
+        driver = agilentDSO7104A(instr)
+        channel = ['1', '0', '8', '1', 'DC', '1', '0', '0']
+        timebase = ['MAIN', 'CENT', '0', '1E-3', '1E-4', '0', 'POS', 'CHAN1']
+        instr.data = ';'.join(channel * 4 + timebase).encode() + b'\n'
+        driver.query_batch()
+        del instr.writes[:]
+        self.assertEqual(driver.channels[0].range, 8.0)
+        self.assertEqual(driver.channels[3].scale, 1.0)
+        self.assertEqual(driver.timebase.range, 1e-3)
+        self.assertEqual(driver.timebase.scale, 1e-4)
+        self.assertEqual(instr.writes, [])
+
+if __name__ == '__main__':
+    unittest.main()
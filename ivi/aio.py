@@ -0,0 +1,360 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+# asyncio facade for Python IVI drivers
+#
+# Driver logic stays synchronous and runs in an executor, one operation at a
+# time per driver, while all instrument I/O is done by an asyncio transport
+# on the event loop.  Requires Python 3.7 or newer.
+
+import asyncio
+import functools
+
+from . import ivi
+
+
+class AsyncInterface(object):
+    "Base class for asyncio instrument interfaces"
+
+    async def open(self):
+        "Open the connection to the instrument"
+        pass
+
+    async def write_raw(self, data):
+        "Write binary data to instrument"
+        raise NotImplementedError()
+
+    async def read_raw(self, num=-1):
+        "Read binary data from instrument"
+        raise NotImplementedError()
+
+    async def ask_raw(self, data, num=-1):
+        "Write then read binary data"
+        await self.write_raw(data)
+        return await self.read_raw(num)
+
+    async def close(self):
+        "Close the connection to the instrument"
+        pass
+
+
+class SocketInterface(AsyncInterface):
+    "Raw TCP socket interface, as used by SCPI instruments on port 5025"
+
+    def __init__(self, host, port=5025, term_char=b'\n', timeout=10, limit=16*1024*1024):
+        self.host = host
+        self.port = port
+        self.term_char = term_char
+        self.timeout = timeout
+        # longest response read up to the termination character
+        self.limit = limit
+        self._reader = None
+        self._writer = None
+
+    async def open(self):
+        "Open the connection to the instrument"
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, limit=self.limit), self.timeout)
+
+    async def write_raw(self, data):
+        "Write binary data to instrument"
+        if self._writer is None:
+            await self.open()
+        if not data.endswith(self.term_char):
+            data += self.term_char
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def read_raw(self, num=-1):
+        "Read binary data from instrument"
+        if self._reader is None:
+            await self.open()
+        try:
+            if num < 0:
+                return await asyncio.wait_for(self._reader.readuntil(self.term_char), self.timeout)
+            return await asyncio.wait_for(self._reader.readexactly(num), self.timeout)
+        except asyncio.TimeoutError:
+            raise ivi.IOTimeoutException()
+        except asyncio.IncompleteReadError:
+            raise ivi.IOException('Connection closed')
+        except asyncio.LimitOverrunError:
+            raise ivi.IOException('Response longer than %d bytes' % self.limit)
+
+    async def close(self):
+        "Close the connection to the instrument"
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+        self._reader = None
+        self._writer = None
+
+
+class SimulatedInstrument(AsyncInterface):
+    """Stand-in SCPI instrument for testing without hardware
+
+    Commands store their argument under the lower case header, queries
+    return the stored value, or the value in responses, or '0'.  Compound
+    messages separated by ';' are supported.  latency adds a delay in
+    seconds to every write and read.
+    """
+
+    def __init__(self, responses=None, latency=0):
+        self.settings = dict()
+        self.responses = dict(responses or {})
+        self.responses.setdefault('*idn?', 'Python IVI,Simulated instrument,0,0')
+        self.latency = latency
+        self.messages = []
+        self._output = []
+
+    def process(self, message):
+        "Process one message, returns the response or None"
+        message = message.decode('utf-8').strip()
+        self.messages.append(message)
+        responses = []
+        for cmd in message.split(';'):
+            l = cmd.strip().split(None, 1)
+            if not l:
+                continue
+            header = l[0].lower()
+            if not header.startswith(':') and not header.startswith('*'):
+                header = ':' + header
+            if header.endswith('?'):
+                key = header[:-1]
+                responses.append(str(self.responses.get(header, self.settings.get(key, '0'))))
+            elif len(l) > 1:
+                self.settings[header] = l[1].strip()
+        if responses:
+            return (';'.join(responses) + '\n').encode('utf-8')
+        return None
+
+    async def write_raw(self, data):
+        "Write binary data to instrument"
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response = self.process(data)
+        if response is not None:
+            self._output.append(response)
+
+    async def read_raw(self, num=-1):
+        "Read binary data from instrument"
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if not self._output:
+            raise ivi.IOTimeoutException()
+        data = self._output.pop(0)
+        if 0 <= num < len(data):
+            self._output.insert(0, data[num:])
+            data = data[:num]
+        return data
+
+    async def start_server(self, host='127.0.0.1', port=0):
+        "Serve the instrument on a TCP socket, returns the asyncio server"
+        async def handle(reader, writer):
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    response = self.process(line)
+                    if response is not None:
+                        writer.write(response)
+                        await writer.drain()
+            finally:
+                writer.close()
+        return await asyncio.start_server(handle, host, port)
+
+
+class _SyncInterface(object):
+    "Blocking view of an asyncio interface for driver code running in an executor"
+
+    def __init__(self, interface, loop):
+        self._async_interface = interface
+        self._loop = loop
+
+    def _run(self, coro):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            coro.close()
+            raise RuntimeError('Blocking driver I/O called from the event loop thread')
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def write_raw(self, data):
+        "Write binary data to instrument"
+        self._run(self._async_interface.write_raw(data))
+
+    def read_raw(self, num=-1):
+        "Read binary data from instrument"
+        return self._run(self._async_interface.read_raw(num))
+
+    def ask_raw(self, data, num=-1):
+        "Write then read binary data"
+        return self._run(self._async_interface.ask_raw(data, num))
+
+    def close(self):
+        "Close the connection to the instrument"
+        self._run(self._async_interface.close())
+
+
+class _Session(object):
+    "Driver shared by the nodes of an AsyncDriver"
+
+    def __init__(self, driver, loop, executor):
+        self.driver = driver
+        self.loop = loop
+        self.executor = executor
+        self.lock = asyncio.Lock()
+
+    async def run(self, func, *args, **kwargs):
+        # drivers are not reentrant, run one operation at a time
+        async with self.lock:
+            return await self.loop.run_in_executor(self.executor,
+                    functools.partial(func, *args, **kwargs))
+
+
+def _get_props(obj):
+    if isinstance(obj, ivi.IndexedPropertyProxy):
+        return obj._props
+    if isinstance(obj, ivi.PropertyCollection):
+        return object.__getattribute__(obj, '__dict__').get('_props', {})
+    return {}
+
+
+def _get_child(obj, name):
+    if isinstance(obj, ivi.IndexedPropertyProxy):
+        if type(obj._props.get(name)) is dict:
+            return getattr(obj, name)
+        return None
+    if isinstance(obj, ivi.PropertyCollection):
+        child = object.__getattribute__(obj, '__dict__').get(name)
+        if isinstance(child, (ivi.PropertyCollection, ivi.IndexedPropertyCollection)):
+            return child
+    return None
+
+
+class AsyncNode(object):
+    """Awaitable view of a driver property tree node
+
+    Properties are read with 'await node.name' and written with
+    'await node.set(name, value)', methods return coroutines and groups and
+    indexed collections return further nodes.
+    """
+
+    def __init__(self, session, obj):
+        object.__setattr__(self, '_session', session)
+        object.__setattr__(self, '_obj', obj)
+
+    def __getattr__(self, name):
+        obj = self._obj
+        child = _get_child(obj, name)
+        if child is not None:
+            return AsyncNode(self._session, child)
+        entry = _get_props(obj).get(name)
+        if entry is None:
+            raise AttributeError(name)
+        if type(entry) is tuple:
+            return self._session.run(getattr, obj, name)
+        f = getattr(obj, name)
+        async def method(*args, **kwargs):
+            return await self._session.run(f, *args, **kwargs)
+        return method
+
+    def __setattr__(self, name, value):
+        raise AttributeError("use 'await node.set(name, value)' to set properties")
+
+    async def set(self, name, value):
+        "Set a property"
+        if type(_get_props(self._obj).get(name)) is not tuple:
+            raise AttributeError(name)
+        return await self._session.run(setattr, self._obj, name, value)
+
+    def __getitem__(self, key):
+        items = self._obj[key]
+        if type(key) is slice:
+            return [AsyncNode(self._session, item) for item in items]
+        return AsyncNode(self._session, items)
+
+    def __len__(self):
+        return len(self._obj)
+
+    def __iter__(self):
+        return (AsyncNode(self._session, item) for item in self._obj)
+
+    def __dir__(self):
+        return sorted(_get_props(self._obj))
+
+
+class AsyncDriver(AsyncNode):
+    "Awaitable view of an IVI driver, see ivi.aio.open"
+
+    @property
+    def driver(self):
+        "The synchronous driver, for use from the executor only"
+        return self._session.driver
+
+    async def call(self, func, *args, **kwargs):
+        "Run func(driver, *args, **kwargs) in the executor"
+        return await self._session.run(func, self._session.driver, *args, **kwargs)
+
+    async def write(self, data):
+        "Write string to instrument"
+        return await self._session.run(self._session.driver._write, data)
+
+    async def ask(self, data):
+        "Write then read string"
+        return await self._session.run(self._session.driver._ask, data)
+
+    async def close(self):
+        "Close the driver and the interface"
+        await self._session.run(self._session.driver.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+async def open(driver_class, interface, *args, executor=None, **kwargs):
+    """Create a driver that uses an asyncio interface and return an AsyncDriver
+
+        scope = await ivi.aio.open(ivi.agilent.agilentMSO7104A,
+                                   ivi.aio.SocketInterface('192.168.1.104'))
+        await scope.timebase.set('scale', 1e-3)
+        waveform = await scope.channels[0].measurement.fetch_waveform()
+
+    executor is a concurrent.futures executor for the driver logic, the loop
+    default executor is used when it is None.
+    """
+    loop = asyncio.get_running_loop()
+    await interface.open()
+    sync_interface = _SyncInterface(interface, loop)
+    driver = await loop.run_in_executor(executor,
+            functools.partial(driver_class, sync_interface, *args, **kwargs))
+    return AsyncDriver(_Session(driver, loop, executor), driver)
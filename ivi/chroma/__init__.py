@@ -24,18 +24,21 @@ THE SOFTWARE.
 
 """
 
-# DC Power Supply
-# Chroma 62000P Programmable DC Power Supply
-
-from .chroma62006p10025 import chroma62006p10025
-from .chroma62006p3008 import chroma62006p3008
-from .chroma62006p3080 import chroma62006p3080
-from .chroma62012p10050 import chroma62012p10050
-from .chroma62012p40120 import chroma62012p40120
-from .chroma62012p6008 import chroma62012p6008
-from .chroma62012p8060 import chroma62012p8060
-from .chroma62024p10050 import chroma62024p10050
-from .chroma62024p40120 import chroma62024p40120
-from .chroma62024p6008 import chroma62024p6008
-from .chroma62024p8060 import chroma62024p8060
-from .chroma62050p100100 import chroma62050p100100
\ No newline at end of file
+from .. import registry
+
+registry.lazy_package(__name__, [
+        # DC Power Supply
+        # Chroma 62000P Programmable DC Power Supply
+
+        ('chroma62006p10025', ('dcpwr',)),
+        ('chroma62006p3008', ('dcpwr',)),
+        ('chroma62006p3080', ('dcpwr',)),
+        ('chroma62012p10050', ('dcpwr',)),
+        ('chroma62012p40120', ('dcpwr',)),
+        ('chroma62012p6008', ('dcpwr',)),
+        ('chroma62012p8060', ('dcpwr',)),
+        ('chroma62024p10050', ('dcpwr',)),
+        ('chroma62024p40120', ('dcpwr',)),
+        ('chroma62024p6008', ('dcpwr',)),
+        ('chroma62024p8060', ('dcpwr',)),
+        ('chroma62050p100100', ('dcpwr',))])
@@ -71,6 +71,13 @@ class chroma62000p(chromaBaseDCPwr):
         self._init_outputs()
 
 
+    def _get_batch_queries(self):
+        return [
+            ("SOUR:CURR?", float, 'output_current_limit', 0),
+            ("CONF:OUTP?", lambda s: s == "ON", 'output_enabled', 0),
+            ("SOUR:VOLT?", float, 'output_voltage_level', 0),
+            ("SOUR:VOLT:PROT:HIGH?", float, 'output_ovp_limit', 0)]
+
     # Tested on Chroma 62012P-80-60; working
     def _get_output_current_limit(self, index):
         """
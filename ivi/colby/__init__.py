@@ -24,7 +24,8 @@ THE SOFTWARE.
 
 """
 
-# Phase shifters
-from .colbyPDL10A import colbyPDL10A
-
+from .. import registry
 
+registry.lazy_package(__name__, [
+        # Phase shifters
+        ('colbyPDL10A', ())])
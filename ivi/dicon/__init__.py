@@ -24,7 +24,8 @@ THE SOFTWARE.
 
 """
 
-# Programmable fiberoptic instrument
-from .diconGP700 import diconGP700
-
+from .. import registry
 
+registry.lazy_package(__name__, [
+        # Programmable fiberoptic instrument
+        ('diconGP700', ())])
@@ -0,0 +1,144 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+import collections
+import re
+import time
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # Python 2 without the futures backport
+    ThreadPoolExecutor = None
+
+# elapsed times must not follow changes of the system clock
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+from . import ivi
+
+class Result(collections.namedtuple('Result', ['driver', 'value', 'exception', 'elapsed'])):
+    "Outcome of an operation on one driver"
+    __slots__ = ()
+
+
+class Results(list):
+    "List of Result objects in driver order, with the total elapsed time"
+
+    elapsed = 0.0
+
+    def values(self):
+        "Returns the values, raising the first exception if any operation failed"
+        for r in self:
+            if r.exception is not None:
+                raise r.exception
+        return [r.value for r in self]
+
+
+def resolve(obj, path):
+    """Look up a dotted attribute path such as 'channels[0].measurement.fetch_waveform'"""
+    for name in path.split('.'):
+        m = re.match(r'^(\w+)(?:\[(.+)\])?$', name)
+        if m is None:
+            raise ivi.SelectorFormatException()
+        obj = getattr(obj, m.group(1))
+        if m.group(2) is not None:
+            key = m.group(2).strip('\'"')
+            obj = obj[int(key) if key.isdigit() else key]
+    return obj
+
+
+def _run(driver, operation, args, kwargs):
+    lock = getattr(driver, '_lock', None)
+    start = _clock()
+    try:
+        if lock is not None:
+            lock.acquire()
+        try:
+            if callable(operation):
+                value = operation(driver, *args, **kwargs)
+            else:
+                value = resolve(driver, operation)
+                if callable(value):
+                    value = value(*args, **kwargs)
+        finally:
+            if lock is not None:
+                lock.release()
+    except Exception as e:
+        return Result(driver, None, e, _clock() - start)
+    return Result(driver, value, None, _clock() - start)
+
+
+class Executor(object):
+    """Runs one operation on many drivers concurrently in a thread pool
+
+    The operation is either a callable taking the driver as the first
+    argument, or an attribute path on the driver.  A path that ends in a
+    method is called with the remaining arguments, otherwise the property
+    value is returned.  Each operation holds the session lock of its driver.
+
+        with ivi.executor.Executor() as e:
+            results = e.map(scopes, 'channels[0].measurement.fetch_waveform')
+        waveforms = results.values()
+    """
+
+    def __init__(self, max_workers=None):
+        if ThreadPoolExecutor is None:
+            raise ImportError("Executor requires concurrent.futures (the futures package on Python 2)")
+        self._max_workers = max_workers
+        self._pool = None
+
+    def map(self, drivers, operation, *args, **kwargs):
+        "Run operation on all drivers and wait for the results"
+        drivers = list(drivers)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self._max_workers or max(len(drivers), 1))
+        start = _clock()
+        futures = [self._pool.submit(_run, d, operation, args, kwargs) for d in drivers]
+        results = Results(f.result() for f in futures)
+        results.elapsed = _clock() - start
+        return results
+
+    def shutdown(self):
+        "Stop the worker threads"
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
+
+
+def map_drivers(drivers, operation, *args, **kwargs):
+    "Run operation on all drivers concurrently with a temporary Executor"
+    with Executor() as e:
+        return e.map(drivers, operation, *args, **kwargs)
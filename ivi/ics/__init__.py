@@ -24,9 +24,8 @@ THE SOFTWARE.
 
 """
 
-# Ethernet to Modbus bridge
-from .ics8099 import ics8099
-
-
-
+from .. import registry
 
+registry.lazy_package(__name__, [
+        # Ethernet to Modbus bridge
+        ('ics8099', ())])
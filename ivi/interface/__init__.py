@@ -24,5 +24,86 @@ THE SOFTWARE.
 
 """
 
+import collections
+import importlib
+import sys
+
 __all__ = []
 
+class Backend(collections.namedtuple('Backend',
+        ['name', 'module', 'opener', 'resource_types', 'lister'])):
+    """Instrument interface backend, imported on first use
+
+    module is the fully qualified module name, opener the name of the class
+    or function in it that opens a resource string, resource_types the VISA
+    resource types the backend handles and lister the name of a function
+    returning a list of resource strings, or None.  Resource classes other
+    than INSTR are appended to the type, as in TCPIP::SOCKET, and HiSLIP
+    resources are TCPIP::HISLIP.  resource_types None handles all resources,
+    including resource strings only the backend itself understands.
+    """
+    __slots__ = ()
+
+    def load(self):
+        "Import the backend module, returns None if it is not installed"
+        return load_backend(self.name)
+
+    def open(self, resource):
+        "Open resource with this backend"
+        return getattr(self.load(), self.opener)(resource)
+
+# backend name -> Backend, in order of preference
+_backends = collections.OrderedDict()
+# backend name -> imported module or None if the import failed
+_loaded = dict()
+
+def register_backend(name, module, opener, resource_types=None, lister=None):
+    "Register an interface backend, replacing any backend of the same name"
+    if resource_types is not None:
+        resource_types = tuple(t.upper() for t in resource_types)
+    _backends[name] = Backend(name, module, opener, resource_types, lister)
+    _loaded.pop(name, None)
+
+def get_backends(resource_type=None):
+    "Returns the registered backends, optionally only those handling resource_type"
+    if resource_type is None:
+        return list(_backends.values())
+    resource_type = resource_type.upper()
+    return [b for b in _backends.values()
+            if b.resource_types is None or resource_type in b.resource_types]
+
+def load_backend(name):
+    "Import a backend module, returns None if it is not installed"
+    try:
+        return _loaded[name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(_backends[name].module)
+    except ImportError:
+        module = None
+    _loaded[name] = module
+    return module
+
+def is_loaded(name):
+    "Returns True if the backend module has already been imported successfully"
+    return _loaded.get(name) is not None
+
+def is_backend_instance(obj):
+    "Returns True if obj was opened by one of the backends already imported"
+    for b in _backends.values():
+        module = sys.modules.get(b.module)
+        if module is not None:
+            cls = getattr(module, b.opener, None)
+            if isinstance(cls, type) and isinstance(obj, cls):
+                return True
+    return False
+
+register_backend('vxi11', 'vxi11', 'Instrument', ('TCPIP',), 'list_resources')
+register_backend('usbtmc', 'usbtmc', 'Instrument', ('USB',), 'list_resources')
+register_backend('hislip', 'ivi.interface.hislip', 'HislipInstrument', ('TCPIP::HISLIP',))
+register_backend('socket', 'ivi.interface.socket', 'SocketInstrument', ('TCPIP::SOCKET',))
+register_backend('linuxgpib', 'ivi.interface.linuxgpib', 'LinuxGpibInstrument', ('GPIB',))
+register_backend('pyserial', 'ivi.interface.pyserial', 'SerialInstrument', ('ASRL',))
+register_backend('pyvisa', 'ivi.interface.pyvisa', 'PyVisaInstrument')
+
@@ -0,0 +1,411 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+from __future__ import absolute_import
+
+import re
+import socket
+import struct
+
+# HiSLIP (IVI-6.1) message types
+INITIALIZE = 0
+INITIALIZE_RESPONSE = 1
+FATAL_ERROR = 2
+ERROR = 3
+ASYNC_LOCK = 4
+ASYNC_LOCK_RESPONSE = 5
+DATA = 6
+DATA_END = 7
+DEVICE_CLEAR_COMPLETE = 8
+DEVICE_CLEAR_ACKNOWLEDGE = 9
+ASYNC_REMOTE_LOCAL_CONTROL = 10
+ASYNC_REMOTE_LOCAL_RESPONSE = 11
+TRIGGER = 12
+INTERRUPTED = 13
+ASYNC_INTERRUPTED = 14
+ASYNC_MAXIMUM_MESSAGE_SIZE = 15
+ASYNC_MAXIMUM_MESSAGE_SIZE_RESPONSE = 16
+ASYNC_INITIALIZE = 17
+ASYNC_INITIALIZE_RESPONSE = 18
+ASYNC_DEVICE_CLEAR = 19
+ASYNC_SERVICE_REQUEST = 20
+ASYNC_STATUS_QUERY = 21
+ASYNC_STATUS_RESPONSE = 22
+ASYNC_DEVICE_CLEAR_ACKNOWLEDGE = 23
+ASYNC_LOCK_INFO = 24
+ASYNC_LOCK_INFO_RESPONSE = 25
+
+# prologue, message type, control code, message parameter, payload length
+HEADER = struct.Struct('>2sBBIQ')
+
+PROTOCOL_VERSION = 0x0100
+VENDOR_ID = b'PI'
+INITIAL_MESSAGE_ID = 0xffffff00
+
+def parse_visa_resource_string(resource_string):
+    # valid resource strings:
+    # TCPIP::10.0.0.1::hislip0::INSTR
+    # TCPIP0::10.0.0.1::hislip0::INSTR
+    # TCPIP0::10.0.0.1::hislip0,4880::INSTR
+    m = re.match(r'^(?P<prefix>(?P<type>TCPIP)\d*)(::(?P<host>[^\s:]+))(::(?P<name>hislip\d+)(,(?P<port>\d+))?)(::(?P<suffix>INSTR))$',
+            resource_string, re.I)
+
+    if m is not None:
+        return dict(
+                type = m.group('type').upper(),
+                prefix = m.group('prefix'),
+                host = m.group('host'),
+                name = m.group('name'),
+                port = int(m.group('port') or 4880),
+                suffix = m.group('suffix'),
+        )
+
+class HislipError(IOError):
+    "Error message received from a HiSLIP server"
+
+def _recv_exact(sock, view):
+    n = 0
+    while n < len(view):
+        k = sock.recv_into(view[n:])
+        if k == 0:
+            raise IOError("HiSLIP connection closed")
+        n += k
+
+def _recv_message(sock):
+    "Receive one message, returns type, control code, parameter and payload"
+    header = bytearray(HEADER.size)
+    _recv_exact(sock, memoryview(header))
+    prologue, msg_type, control, param, length = HEADER.unpack(bytes(header))
+    if prologue != b'HS':
+        raise IOError("Invalid HiSLIP message header")
+    payload = bytearray(length)
+    _recv_exact(sock, memoryview(payload))
+    return msg_type, control, param, bytes(payload)
+
+def _send_message(sock, msg_type, control=0, param=0, payload=b''):
+    sock.sendall(HEADER.pack(b'HS', msg_type, control, param, len(payload)) + payload)
+
+class HislipInstrument:
+    """HiSLIP instrument interface client
+
+    Uses the synchronous channel for data and triggers and the asynchronous
+    channel for device clear, status queries, service requests, locking and
+    remote/local control.  overlapped requests overlapped (True) or
+    synchronized (False) mode, None keeps the mode the server starts in.
+    """
+    def __init__(self, host, name = 'hislip0', port = 4880, timeout = 10, overlapped = None,
+                max_message_size = 1 << 30, rcvbuf = None):
+
+        if host.upper().startswith('TCPIP') and '::' in host:
+            res = parse_visa_resource_string(host)
+
+            if res is None:
+                raise IOError("Invalid resource string")
+
+            host = res['host']
+            name = res['name']
+            port = res['port']
+
+        self.host = host
+        self.name = name
+        self.port = port
+        self.timeout = timeout
+        self.rcvbuf = rcvbuf
+
+        # largest message the client accepts and the server accepts
+        self.max_message_size = max_message_size
+        self.server_max_message_size = 1 << 20
+
+        self._message_id = INITIAL_MESSAGE_ID
+        # set when the last response was read completely (RMT-delivered)
+        self._rmt_delivered = False
+        # unread payload bytes of the current data message, and whether it
+        # ends the response
+        self._remaining = 0
+        self._end = True
+        # status byte of the last service request
+        self.srq_status = None
+
+        self.sync = self._connect()
+        _send_message(self.sync, INITIALIZE, 0, (PROTOCOL_VERSION << 16) | struct.unpack('>H', VENDOR_ID)[0],
+                name.encode('ascii'))
+        msg_type, control, param, payload = self._recv_sync_control(INITIALIZE_RESPONSE)
+        self.overlapped = bool(control & 1)
+        self.server_protocol_version = param >> 16
+        self.session_id = param & 0xffff
+
+        self.async_ = self._connect()
+        _send_message(self.async_, ASYNC_INITIALIZE, 0, self.session_id)
+        msg_type, control, param, payload = self._recv_async(ASYNC_INITIALIZE_RESPONSE)
+        self.server_vendor_id = param
+
+        _send_message(self.async_, ASYNC_MAXIMUM_MESSAGE_SIZE, 0, 0, struct.pack('>Q', max_message_size))
+        msg_type, control, param, payload = self._recv_async(ASYNC_MAXIMUM_MESSAGE_SIZE_RESPONSE)
+        self.server_max_message_size = struct.unpack('>Q', payload)[0]
+
+        if overlapped is not None and bool(overlapped) != self.overlapped:
+            self.clear(overlapped)
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.rcvbuf is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+        return sock
+
+    def _check_error(self, msg_type, payload):
+        if msg_type == FATAL_ERROR or msg_type == ERROR:
+            raise HislipError("HiSLIP error: %s" % payload.decode('utf-8', 'replace'))
+
+    def _recv_sync_control(self, expected):
+        "Receive a non-data message on the synchronous channel, skipping stale data"
+        while True:
+            msg_type, control, param, payload = _recv_message(self.sync)
+            self._check_error(msg_type, payload)
+            if msg_type == expected:
+                return msg_type, control, param, payload
+
+    def _recv_async(self, expected):
+        "Receive a message on the asynchronous channel, recording service requests"
+        while True:
+            msg_type, control, param, payload = _recv_message(self.async_)
+            self._check_error(msg_type, payload)
+            if msg_type == ASYNC_SERVICE_REQUEST:
+                self.srq_status = control
+                if expected == ASYNC_SERVICE_REQUEST:
+                    return msg_type, control, param, payload
+                continue
+            if msg_type == expected:
+                return msg_type, control, param, payload
+
+    def _next_message_id(self):
+        message_id = self._message_id
+        self._message_id = (self._message_id + 2) & 0xffffffff
+        return message_id
+
+    def _last_message_id(self):
+        return (self._message_id - 2) & 0xffffffff
+
+    def _control(self):
+        # RMT-delivered is only reported in synchronized mode
+        control = 0
+        if self._rmt_delivered and not self.overlapped:
+            control = 1
+        self._rmt_delivered = False
+        return control
+
+    def write_raw(self, data):
+        "Write binary data to instrument"
+        self.writev([data])
+
+    def writev(self, buffers):
+        "Write binary data from a list of buffers as one message, without joining them"
+        if not (self._remaining == 0 and self._end):
+            # discard the unread part of the previous response
+            self.read_raw()
+        size = max(1, self.server_max_message_size)
+        chunks = []
+        for data in buffers:
+            data = memoryview(data)
+            for k in range(0, len(data), size):
+                chunks.append(data[k:k+size])
+        if not chunks:
+            chunks.append(b'')
+        for k, chunk in enumerate(chunks):
+            msg_type = DATA if k < len(chunks) - 1 else DATA_END
+            self.sync.sendall(HEADER.pack(b'HS', msg_type, self._control(), self._next_message_id(), len(chunk)))
+            self.sync.sendall(chunk)
+
+    def _fill(self):
+        "Read data message headers until payload is available, False at the end of the response"
+        while self._remaining == 0:
+            if self._end:
+                return False
+            header = bytearray(HEADER.size)
+            _recv_exact(self.sync, memoryview(header))
+            prologue, msg_type, control, param, length = HEADER.unpack(bytes(header))
+            if prologue != b'HS':
+                raise IOError("Invalid HiSLIP message header")
+            if msg_type == DATA or msg_type == DATA_END:
+                self._remaining = length
+                self._end = msg_type == DATA_END
+                if self._end and length == 0:
+                    self._rmt_delivered = True
+                    return False
+            else:
+                payload = bytearray(length)
+                _recv_exact(self.sync, memoryview(payload))
+                self._check_error(msg_type, bytes(payload))
+                # Interrupted and other messages carry no response data
+        return True
+
+    def _start(self):
+        if self._remaining == 0 and self._end:
+            # previous response complete, wait for the next one
+            self._end = False
+
+    def readinto(self, buf):
+        "Read into writable buffer buf until it is full or the response ends, returns number of bytes read"
+        self._start()
+        view = memoryview(buf)
+        size = len(view)
+        n = 0
+        while n < size and self._fill():
+            k = min(self._remaining, size - n)
+            _recv_exact(self.sync, view[n:n+k])
+            self._remaining -= k
+            n += k
+        if self._remaining == 0 and self._end:
+            self._rmt_delivered = True
+        return n
+
+    def read_raw(self, num=-1):
+        "Read binary data from instrument"
+        if num > 0:
+            buf = bytearray(num)
+            n = self.readinto(buf)
+            if n < num:
+                del buf[n:]
+            return bytes(buf)
+
+        # rest of the response, one buffer per data message
+        self._start()
+        parts = []
+        while self._fill():
+            buf = bytearray(self._remaining)
+            _recv_exact(self.sync, memoryview(buf))
+            self._remaining = 0
+            parts.append(buf)
+        self._rmt_delivered = True
+        if len(parts) == 1:
+            return bytes(parts[0])
+        return b''.join(parts)
+
+    def ask_raw(self, data, num=-1):
+        "Write then read binary data"
+        self.write_raw(data)
+        return self.read_raw(num)
+
+    def write(self, message, encoding = 'utf-8'):
+        "Write string to instrument"
+        if type(message) is tuple or type(message) is list:
+            # recursive call for a list of commands
+            for message_i in message:
+                self.write(message_i, encoding)
+            return
+
+        self.write_raw(str(message).encode(encoding))
+
+    def read(self, num=-1, encoding = 'utf-8'):
+        "Read string from instrument"
+        return self.read_raw(num).decode(encoding).rstrip('\r\n')
+
+    def ask(self, message, num=-1, encoding = 'utf-8'):
+        "Write then read string"
+        if type(message) is tuple or type(message) is list:
+            # recursive call for a list of commands
+            val = list()
+            for message_i in message:
+                val.append(self.ask(message_i, num, encoding))
+            return val
+
+        self.write(message, encoding)
+        return self.read(num, encoding)
+
+    def read_stb(self):
+        "Read status byte"
+        _send_message(self.async_, ASYNC_STATUS_QUERY, self._control(), self._last_message_id())
+        msg_type, control, param, payload = self._recv_async(ASYNC_STATUS_RESPONSE)
+        return control
+
+    def wait_for_srq(self, timeout = None):
+        "Wait for a service request, returns the status byte"
+        if timeout is not None:
+            self.async_.settimeout(timeout)
+        try:
+            msg_type, control, param, payload = self._recv_async(ASYNC_SERVICE_REQUEST)
+        finally:
+            self.async_.settimeout(self.timeout)
+        return control
+
+    def trigger(self):
+        "Send trigger command"
+        _send_message(self.sync, TRIGGER, self._control(), self._next_message_id())
+
+    def clear(self, overlapped = None):
+        "Send clear command (device clear), optionally switching overlapped mode"
+        if overlapped is None:
+            overlapped = self.overlapped
+        if self._remaining:
+            # skip the rest of the data message being read
+            _recv_exact(self.sync, memoryview(bytearray(self._remaining)))
+            self._remaining = 0
+        _send_message(self.async_, ASYNC_DEVICE_CLEAR)
+        self._recv_async(ASYNC_DEVICE_CLEAR_ACKNOWLEDGE)
+        _send_message(self.sync, DEVICE_CLEAR_COMPLETE, int(bool(overlapped)))
+        # data sent before the clear is skipped
+        msg_type, control, param, payload = self._recv_sync_control(DEVICE_CLEAR_ACKNOWLEDGE)
+        self.overlapped = bool(control & 1)
+        self._message_id = INITIAL_MESSAGE_ID
+        self._rmt_delivered = False
+        self._remaining = 0
+        self._end = True
+
+    def _remote_local(self, request):
+        _send_message(self.async_, ASYNC_REMOTE_LOCAL_CONTROL, request, self._last_message_id())
+        self._recv_async(ASYNC_REMOTE_LOCAL_RESPONSE)
+
+    def remote(self):
+        "Send remote command"
+        # assert REN and address device
+        self._remote_local(3)
+
+    def local(self):
+        "Send local command"
+        # send go to local
+        self._remote_local(6)
+
+    def lock(self, timeout = 0, lock_string = b''):
+        "Send lock command"
+        _send_message(self.async_, ASYNC_LOCK, 1, int(timeout * 1000), lock_string)
+        msg_type, control, param, payload = self._recv_async(ASYNC_LOCK_RESPONSE)
+        if control != 1:
+            raise IOError("HiSLIP lock failed")
+
+    def unlock(self):
+        "Send unlock command"
+        _send_message(self.async_, ASYNC_LOCK, 0, self._last_message_id())
+        msg_type, control, param, payload = self._recv_async(ASYNC_LOCK_RESPONSE)
+        if control not in (1, 2):
+            raise IOError("HiSLIP unlock failed")
+
+    def close(self):
+        "Close connection"
+        for sock in (self.async_, self.sync):
+            try:
+                sock.close()
+            except socket.error:
+                pass
@@ -27,6 +27,9 @@ THE SOFTWARE.
 import Gpib
 import re
 
+# ibsta bit set when a read ended with EOI or the EOS character
+END = 0x2000
+
 def parse_visa_resource_string(resource_string):
     # valid resource strings:
     # GPIB::10::INSTR
@@ -44,7 +47,8 @@ def parse_visa_resource_string(resource_string):
 
 class LinuxGpibInstrument:
     "Linux GPIB wrapper instrument interface client"
-    def __init__(self, name = 'gpib0', pad = None, sad = 0, timeout = 13, send_eoi = 1, eos_mode = 0):
+    def __init__(self, name = 'gpib0', pad = None, sad = 0, timeout = 13, send_eoi = 1, eos_mode = 0,
+                chunk_size = 512, max_chunk_size = 1048576):
 
         if name.upper().startswith('GPIB') and '::' in name:
             res = parse_visa_resource_string(name)
@@ -65,18 +69,56 @@ class LinuxGpibInstrument:
 
         self.gpib = Gpib.Gpib(name, pad, sad, timeout, send_eoi, eos_mode)
 
+        # size of the first ibrd of a read of unknown length; doubled for
+        # every further ibrd of the same message up to max_chunk_size
+        self.chunk_size = chunk_size
+        self.max_chunk_size = max_chunk_size
+
     def write_raw(self, data):
         "Write binary data to instrument"
         
         self.gpib.write(data)
 
+    def _read_chunk(self, num):
+        "Read up to num bytes, returns data and whether the message ended"
+        data = self.gpib.read(num)
+        return data, bool(self.gpib.ibsta() & END)
+
+    def readinto(self, buf):
+        "Read into writable buffer buf until it is full or EOI, returns number of bytes read"
+        view = memoryview(buf)
+        size = len(view)
+        n = 0
+        while n < size:
+            data, end = self._read_chunk(size - n)
+            view[n:n+len(data)] = data
+            n += len(data)
+            if end or len(data) == 0:
+                break
+        return n
+
     def read_raw(self, num=-1):
         "Read binary data from instrument"
         
-        if num < 0:
-            num = 512
+        if num > 0:
+            # known length (IEEE block payload), read into one buffer
+            buf = bytearray(num)
+            n = self.readinto(buf)
+            return bytes(memoryview(buf)[:n])
+        
+        # unknown length, read until EOI
+        chunks = []
+        size = self.chunk_size
+        while True:
+            data, end = self._read_chunk(size)
+            chunks.append(data)
+            if end or len(data) == 0:
+                break
+            size = min(size * 2, self.max_chunk_size)
         
-        return self.gpib.read(num)
+        if len(chunks) == 1:
+            return chunks[0]
+        return b''.join(chunks)
     
     def ask_raw(self, data, num=-1):
         "Write then read binary data"
@@ -28,6 +28,8 @@ import serial
 import time
 import re
 
+from ..ivi import IOTimeoutException
+
 def parse_visa_resource_string(resource_string):
     # valid resource strings:
     # ASRL1::INSTR
@@ -147,22 +149,57 @@ class SerialInstrument:
             while not self.serial.getDSR():
                 time.sleep(0.01)
     
+    def writev(self, buffers):
+        "Write binary data from a list of buffers as one message, without joining them"
+        
+        for data in buffers:
+            self.serial.write(data)
+        
+        if self.term_char is not None:
+            self.serial.write(str(self.term_char).encode('utf-8')[0:1])
+        
+        if self.message_delay > 0:
+            time.sleep(self.message_delay)
+        
+        if self.wait_dsr:
+            while not self.serial.getDSR():
+                time.sleep(0.01)
+    
+    def readinto(self, buf):
+        "Read exactly len(buf) bytes into writable buffer buf (IEEE block payload), returns number of bytes read"
+        view = memoryview(buf)
+        n = self.serial.readinto(view)
+        if n < len(view):
+            raise IOTimeoutException()
+        return n
+    
     def read_raw(self, num=-1):
         "Read binary data from instrument"
         
-        data = b''
+        if self.term_char is None:
+            if num > 0:
+                data = self.serial.read(num)
+                if len(data) < num:
+                    raise IOTimeoutException()
+                return data
+            # no termination character, read until timeout
+            data = bytearray()
+            while True:
+                chunk = self.serial.read(max(1, self.serial.in_waiting))
+                if len(chunk) == 0:
+                    return bytes(data)
+                data += chunk
+        
         term_char = str(self.term_char).encode('utf-8')[0:1]
         
-        while True:
-            c = self.serial.read(1)
-            data += c
-            num -= 1
-            if c == term_char:
-                break
-            if num == 0:
-                break
-            
-        return data
+        if num > 0:
+            # up to num bytes, ending early at the termination character
+            data = self.serial.read_until(term_char, num)
+            if len(data) < num and not data.endswith(term_char):
+                raise IOTimeoutException()
+            return data
+        
+        return self.serial.read_until(term_char)
     
     def ask_raw(self, data, num=-1):
         "Write then read binary data"
@@ -24,32 +24,33 @@ THE SOFTWARE.
 
 """
 
-import io
-import sys
-from distutils.version import StrictVersion
+from __future__ import absolute_import
 
 try:
+    import pyvisa as visa
+except ImportError:
+    # older PyVISA releases are imported as visa
     import visa
-    try:
+
+# the resource manager searches for the VISA library and its backends,
+# so it is only created for the first resource opened through PyVISA
+visa_rm = None
+
+def visa_instrument_opener(resource, *args, **kwargs):
+    "Open a VISA resource"
+    global visa_rm
+    if not hasattr(visa, 'ResourceManager'):
+        # Old style PyVISA
+        return visa.instrument(resource, *args, **kwargs)
+    if visa_rm is None:
         # New style PyVISA
         visa_rm = visa.ResourceManager()
-        visa_instrument_opener = visa_rm.open_resource
-    except AttributeError:
-        # Old style PyVISA
-        visa_instrument_opener = visa.instrument
-except ImportError:
-    # PyVISA not installed, pass it up
-    raise ImportError
-except:
-    # any other error
-    e = sys.exc_info()[1]
-    sys.stderr.write("python-ivi: PyVISA is installed, but could not be loaded (%s: %s)\n" %
-        (e.__class__.__name__, e.args[0]))
-    raise ImportError
+    return visa_rm.open_resource(resource, *args, **kwargs)
 
 class PyVisaInstrument:
     "PyVisa wrapper instrument interface client"
     def __init__(self, resource, *args, **kwargs):
+        chunk_size = kwargs.pop('chunk_size', None)
         if type(resource) is str:
             self.instrument = visa_instrument_opener(resource, *args, **kwargs)
             # For compatibility with new style PyVISA
@@ -57,21 +58,67 @@ class PyVisaInstrument:
                 self.instrument.trigger = self.instrument.assert_trigger
         else:
             self.instrument = resource
-        self.buffer = io.BytesIO()
+        if chunk_size is not None:
+            # size of the individual VISA reads PyVISA combines into a message
+            self.instrument.chunk_size = chunk_size
+        # last message read from the instrument and read position in it,
+        # used when the resource cannot read a number of bytes by itself
+        self._data = b''
+        self._pos = 0
+        # message based resources read known sizes (IEEE block payloads)
+        # straight from the instrument
+        self._has_read_bytes = hasattr(self.instrument, 'read_bytes')
 
     def write_raw(self, data):
         "Write binary data to instrument"
         self.instrument.write_raw(data)
 
+    def _fill(self):
+        # read the rest of the message
+        self._data = self.instrument.read_raw()
+        self._pos = 0
+
+    def _read_bytes(self, num):
+        "Read num bytes with the resource, None if it cannot or part of a message is buffered"
+        if num > 0 and self._has_read_bytes and self._pos >= len(self._data):
+            return self.instrument.read_bytes(num)
+        return None
+
+    def read_view(self, num=-1):
+        "Read binary data from instrument as a memoryview into the message buffer"
+        data = self._read_bytes(num)
+        if data is not None:
+            return memoryview(data)
+        if self._pos >= len(self._data):
+            self._fill()
+        start = self._pos
+        end = len(self._data) if num < 0 else min(start + num, len(self._data))
+        self._pos = end
+        return memoryview(self._data)[start:end]
+
+    def readinto(self, buf):
+        "Read into writable buffer buf up to the end of the message, returns number of bytes read"
+        view = memoryview(buf)
+        data = self.read_view(len(view))
+        view[:len(data)] = data
+        return len(data)
+
     def read_raw(self, num=-1):
         "Read binary data from instrument"
-        # PyVISA only supports reading entire buffer
-        #return self.instrument.read_raw()
-        data = self.buffer.read(num)
-        if len(data) == 0:
-            self.buffer = io.BytesIO(self.instrument.read_raw())
-            data = self.buffer.read(num)
-        return data
+        data = self._read_bytes(num)
+        if data is not None:
+            return data
+        if self._pos >= len(self._data):
+            self._fill()
+        data = self._data
+        start = self._pos
+        if start == 0 and (num < 0 or num >= len(data)):
+            # whole message, no copy
+            self._pos = len(data)
+            return data
+        end = len(data) if num < 0 else min(start + num, len(data))
+        self._pos = end
+        return data[start:end]
 
     def ask_raw(self, data, num=-1):
         "Write then read binary data"
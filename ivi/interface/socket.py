@@ -0,0 +1,264 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2012-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+from __future__ import absolute_import
+
+import re
+import socket
+
+def parse_visa_resource_string(resource_string):
+    # valid resource strings:
+    # TCPIP::10.0.0.1::5025::SOCKET
+    # TCPIP0::10.0.0.1::5025::SOCKET
+    # TCPIP0::myscope.local::5025::SOCKET
+    m = re.match(r'^(?P<prefix>(?P<type>TCPIP)\d*)(::(?P<host>[^\s:]+))(::(?P<port>\d+))(::(?P<suffix>SOCKET))$',
+            resource_string, re.I)
+
+    if m is not None:
+        return dict(
+                type = m.group('type').upper(),
+                prefix = m.group('prefix'),
+                host = m.group('host'),
+                port = int(m.group('port')),
+                suffix = m.group('suffix'),
+        )
+
+class SocketInstrument:
+    "Raw TCP socket instrument interface client (SCPI over port 5025)"
+    def __init__(self, host, port = 5025, timeout = 10, term_char = '\n', rcvbuf = None, sndbuf = None,
+                nodelay = True, chunk_size = 65536):
+
+        if host.upper().startswith('TCPIP') and '::' in host:
+            res = parse_visa_resource_string(host)
+
+            if res is None:
+                raise IOError("Invalid resource string")
+
+            host = res['host']
+            port = res['port']
+
+        self.host = host
+        self.port = port
+        self.term_char = term_char
+        self.chunk_size = chunk_size
+
+        self.sock = None
+        err = None
+        for af, socktype, proto, canonname, sa in socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM):
+            sock = socket.socket(af, socktype, proto)
+            try:
+                # buffer sizes must be set before connecting to take
+                # effect on the TCP window
+                if rcvbuf is not None:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+                if sndbuf is not None:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+                if nodelay:
+                    # send short commands immediately
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.settimeout(timeout)
+                sock.connect(sa)
+            except socket.error as e:
+                err = e
+                sock.close()
+                continue
+            self.sock = sock
+            break
+
+        if self.sock is None:
+            raise err or IOError("Cannot connect to %s:%d" % (host, port))
+
+        # bytes received after the end of the previous message
+        self._buffer = bytearray()
+        # an IEEE block was read to its end, the rest of the response up to
+        # the termination character is stale
+        self._pending = False
+        self._chunk = bytearray(chunk_size)
+
+    def _recv(self):
+        "Receive what is available into the buffer, returns the number of bytes"
+        if len(self._chunk) != self.chunk_size:
+            self._chunk = bytearray(self.chunk_size)
+        n = self.sock.recv_into(self._chunk)
+        self._buffer += memoryview(self._chunk)[:n]
+        return n
+
+    def _discard_pending(self):
+        "Discard the unread end of the previous response"
+        if self._pending and self.term_char is not None:
+            self.read_raw()
+        self._pending = False
+
+    def write_raw(self, data):
+        "Write binary data to instrument"
+        self._discard_pending()
+        
+        if self.term_char is not None:
+            data += str(self.term_char).encode('utf-8')[0:1]
+        
+        self.sock.sendall(data)
+
+    def writev(self, buffers):
+        "Write binary data from a list of buffers as one message, without joining them"
+        self._discard_pending()
+        views = [memoryview(b) for b in buffers]
+        
+        if self.term_char is not None:
+            views.append(memoryview(str(self.term_char).encode('utf-8')[0:1]))
+        
+        if not hasattr(self.sock, 'sendmsg'):
+            for view in views:
+                self.sock.sendall(view)
+            return
+        
+        views = [view for view in views if len(view)]
+        while views:
+            # sendmsg may send only part of the data
+            n = self.sock.sendmsg(views[:512])
+            while views and n >= len(views[0]):
+                n -= len(views.pop(0))
+            if n:
+                views[0] = views[0][n:]
+
+    def readinto(self, buf):
+        "Read up to len(buf) bytes into writable buffer buf, returns number of bytes read"
+        view = memoryview(buf)
+
+        if self._buffer:
+            # data already received first
+            n = min(len(self._buffer), len(view))
+            view[:n] = self._buffer[:n]
+            del self._buffer[:n]
+            return n
+
+        return self.sock.recv_into(view)
+
+    def discard_terminator(self):
+        "Discard the rest of the current response, up to the termination character, before the next write"
+        self._pending = True
+
+    def read_raw(self, num=-1):
+        "Read binary data from instrument"
+
+        if num > 0:
+            # up to num bytes, received directly into one buffer
+            buf = bytearray(num)
+            n = self.readinto(buf)
+            if n < num:
+                del buf[n:]
+            return bytes(buf)
+
+        buf = self._buffer
+
+        term_char = None
+        if self.term_char is not None:
+            term_char = str(self.term_char).encode('utf-8')[0:1]
+
+        start = 0
+        while True:
+            if term_char is not None:
+                i = buf.find(term_char, start)
+                if i >= 0:
+                    data = bytes(buf[:i+1])
+                    del buf[:i+1]
+                    self._pending = False
+                    return data
+                start = len(buf)
+            if self._recv() == 0:
+                # connection closed
+                break
+
+        data = bytes(buf)
+        del buf[:]
+        self._pending = False
+        return data
+
+    def ask_raw(self, data, num=-1):
+        "Write then read binary data"
+        self.write_raw(data)
+        return self.read_raw(num)
+
+    def write(self, message, encoding = 'utf-8'):
+        "Write string to instrument"
+        if type(message) is tuple or type(message) is list:
+            # recursive call for a list of commands
+            for message_i in message:
+                self.write(message_i, encoding)
+            return
+
+        self.write_raw(str(message).encode(encoding))
+
+    def read(self, num=-1, encoding = 'utf-8'):
+        "Read string from instrument"
+        return self.read_raw(num).decode(encoding).rstrip('\r\n')
+
+    def ask(self, message, num=-1, encoding = 'utf-8'):
+        "Write then read string"
+        if type(message) is tuple or type(message) is list:
+            # recursive call for a list of commands
+            val = list()
+            for message_i in message:
+                val.append(self.ask(message_i, num, encoding))
+            return val
+
+        self.write(message, encoding)
+        return self.read(num, encoding)
+
+    def read_stb(self):
+        "Read status byte"
+        raise NotImplementedError()
+
+    def trigger(self):
+        "Send trigger command"
+        self.write("*TRG")
+
+    def clear(self):
+        "Send clear command"
+        # raw sockets have no device clear; drop any unread response
+        del self._buffer[:]
+        self.write("*CLS")
+
+    def remote(self):
+        "Send remote command"
+        raise NotImplementedError()
+
+    def local(self):
+        "Send local command"
+        raise NotImplementedError()
+
+    def lock(self):
+        "Send lock command"
+        raise NotImplementedError()
+
+    def unlock(self):
+        "Send unlock command"
+        raise NotImplementedError()
+
+    def close(self):
+        "Close connection"
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
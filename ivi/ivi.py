@@ -25,42 +25,23 @@ THE SOFTWARE.
 """
 
 # import libraries
-import inspect
 import numpy as np
 import re
+import sys
+import threading
+import time
+import weakref
 from functools import partial
 
-# try importing drivers
-# python-vxi11 for LAN instruments
+# cache expiration must not follow changes of the system clock
 try:
-    import vxi11
-except ImportError:
-    pass
+    _monotonic = time.monotonic
+except AttributeError:
+    _monotonic = time.time
 
-# python-usbtmc for USBTMC instrument support
-try:
-    import usbtmc
-except ImportError:
-    pass
-
-# linuxgpib wrapper for linux-gpib Gpib class
-# for GPIB interfaces
-try:
-    from .interface import linuxgpib
-except ImportError:
-    pass
-
-# pySerial wrapper for serial instrument support
-try:
-    from .interface import pyserial
-except ImportError:
-    pass
-
-# pyvisa wrapper for PyVISA library support
-try:
-    from .interface import pyvisa
-except ImportError:
-    pass
+# instrument interface backends (python-vxi11, python-usbtmc, linux-gpib,
+# pySerial, PyVISA) are imported when a resource first needs them
+from . import interface
 
 # set to True to try loading PyVISA first before
 # other interface libraries
@@ -74,6 +55,22 @@ def set_prefer_pyvisa(value=True):
     global _prefer_pyvisa
     _prefer_pyvisa = bool(value)
 
+# SessionPool used by drivers initialized with a resource
+# string, None to open a new session for every driver
+_session_pool = None
+
+def get_session_pool():
+    return _session_pool
+
+def set_session_pool(pool=True):
+    "Installs a SessionPool (True for a default one, None to disable)"
+    global _session_pool
+    if pool is True:
+        pool = SessionPool()
+    elif pool is False:
+        pool = None
+    _session_pool = pool
+
 # version information
 from .version import __version__
 version = __version__
@@ -109,6 +106,42 @@ class UnknownPhysicalNameException(IviDriverException): pass
 class ValueNotSupportedException(IviDriverException): pass
 
 
+# Cache tags are resolved once, when a property is registered, and are
+# keyed by the code object of the getter or setter.  Cached accessors then
+# only need to look at the code object of the calling frame to find their
+# tag instead of walking the interpreter stack on every access.
+_cache_tags = dict()
+_cache_tag_names = dict()
+# code objects of registered property setters, a setter marking its own
+# tag valid means the value changed, so dependent attributes get invalidated
+_cache_setters = set()
+
+
+def get_cache_tag(name):
+    "Convert an accessor name into a cache tag (_get_channel_range -> channel_range)"
+    try:
+        return _cache_tag_names[name]
+    except KeyError:
+        pass
+    tag = name
+    if tag[0:4] == "_get": tag = tag[4:]
+    if tag[0:4] == "_set": tag = tag[4:]
+    if tag[0:1] == "_": tag = tag[1:]
+    _cache_tag_names[name] = tag
+    return tag
+
+
+def register_cache_tag(f, setter=False):
+    "Resolve the cache tag for an accessor function ahead of time"
+    code = getattr(getattr(f, '__func__', f), '__code__', None)
+    if code is None:
+        return
+    if code not in _cache_tags:
+        _cache_tags[code] = get_cache_tag(code.co_name)
+    if setter:
+        _cache_setters.add(code)
+
+
 def get_index(l, i):
     """Validate index from list or dict of possible values"""
     if type(l) is dict:
@@ -151,6 +184,8 @@ class PropertyCollection(object):
         d['_props'][name] = (fget, fset, fdel)
         d['_docs'][name] = doc
         d[name] = None
+        if '_compiled_base' in type(self).__dict__:
+            _compile_collection(self)
     
     def _add_method(self, name, f=None, doc=None):
         "Add a managed method"
@@ -161,9 +196,11 @@ class PropertyCollection(object):
     def _del_property(self, name):
         "Remove managed property or method"
         d = object.__getattribute__(self, '__dict__')
-        del d['_props'][name]
+        d['_props'].pop(name, None)
         del d['_docs'][name]
         del d[name]
+        if '_compiled_base' in type(self).__dict__:
+            _compile_collection(self)
     
     def _lock(self, lock=True):
         "Set lock state to prevent creation or deletion of unmanaged members"
@@ -177,11 +214,9 @@ class PropertyCollection(object):
     def __getattribute__(self, name):
         if name == '__dict__':
             return object.__getattribute__(self, name)
-        d = object.__getattribute__(self, '__dict__')
-        d.setdefault('_props', dict())
-        d.setdefault('_locked', False)
-        if name in d['_props']:
-            f = d['_props'][name][0]
+        props = object.__getattribute__(self, '__dict__').get('_props')
+        if props and name in props:
+            f = props[name][0]
             if f is None:
                 raise AttributeError("unreadable attribute")
             return f()
@@ -216,6 +251,187 @@ class PropertyCollection(object):
         object.__delattr__(self, name)
         
 
+def _compiled_property(name):
+    "Build a class-level property that dispatches to the accessors registered on the instance"
+    def fget(self):
+        f = self._props[name][0]
+        if f is None:
+            raise AttributeError("unreadable attribute")
+        return f()
+    def fset(self, value):
+        f = self._props[name][1]
+        if f is None:
+            raise AttributeError("can't set attribute")
+        f(value)
+    def fdel(self):
+        f = self._props[name][2]
+        if f is None:
+            raise AttributeError("can't delete attribute")
+        f()
+    return property(fget, fset, fdel)
+
+
+def _compiled_setattr(self, name, value):
+    d = self.__dict__
+    if name not in d and d.get('_locked'):
+        raise AttributeError("locked")
+    object.__setattr__(self, name, value)
+
+
+def _compiled_delattr(self, name):
+    d = self.__dict__
+    if name not in d and d.get('_locked'):
+        raise AttributeError("locked")
+    object.__delattr__(self, name)
+
+
+# compiled classes, keyed by base class and set of property names
+_compiled_classes = dict()
+
+
+def _compile_collection(obj):
+    "Switch a single PropertyCollection over to a compiled class"
+    cls = type(obj)
+    base = cls.__dict__.get('_compiled_base', cls)
+    names = frozenset(object.__getattribute__(obj, '__dict__').get('_props', ()))
+    key = (base, names)
+    try:
+        new_cls = _compiled_classes[key]
+    except KeyError:
+        ns = {
+            '__getattribute__': object.__getattribute__,
+            '__setattr__': _compiled_setattr,
+            '__delattr__': _compiled_delattr,
+            '__module__': base.__module__,
+            '_compiled_base': base}
+        for name in names:
+            ns[name] = _compiled_property(name)
+        new_cls = _compiled_classes[key] = type(base.__name__, (base,), ns)
+    if cls is not new_cls:
+        object.__setattr__(obj, '__class__', new_cls)
+
+
+def compile_properties(obj):
+    """Replace dynamic attribute lookup on obj and all of its sub-groups with
+    class-level descriptors.
+
+    PropertyCollection normally resolves every attribute access, including
+    plain instance attributes, in Python code.  After compilation, managed
+    properties are real descriptors on a generated subclass (shared by all
+    instances of the same driver class) and everything else is looked up
+    natively.  Properties added or removed later are picked up automatically.
+    Returns obj."""
+    if isinstance(obj, IndexedPropertyCollection):
+        obj._compile()
+        return obj
+    _compile_collection(obj)
+    for v in list(object.__getattribute__(obj, '__dict__').values()):
+        if isinstance(v, (PropertyCollection, IndexedPropertyCollection)):
+            compile_properties(v)
+    return obj
+
+
+class IndexedPropertyProxy(object):
+    "Lightweight view of one index of an IndexedPropertyCollection"
+    # instances only store the index, the property and documentation
+    # tables of their collection and any sub-proxies, so the class is
+    # shared between all collections
+    __slots__ = ('_index', '_props', '_docs', '_children')
+
+    def __init__(self, index, props, docs):
+        object.__setattr__(self, '_index', index)
+        object.__setattr__(self, '_props', props)
+        object.__setattr__(self, '_docs', docs)
+        object.__setattr__(self, '_children', None)
+
+    def __getattr__(self, name):
+        try:
+            itm = self._props[name]
+        except KeyError:
+            raise AttributeError(name)
+        if type(itm) == tuple:
+            fget = itm[0]
+            if fget is None:
+                raise AttributeError("unreadable attribute")
+            return fget(self._index)
+        elif type(itm) == dict:
+            children = self._children
+            if children is None:
+                children = dict()
+                object.__setattr__(self, '_children', children)
+            try:
+                return children[name]
+            except KeyError:
+                pass
+            if '_compiled_base' in type(self).__dict__:
+                child_cls = _compile_proxy_class(itm)
+            else:
+                child_cls = IndexedPropertyProxy
+            obj = children[name] = child_cls(self._index, itm, self._docs[name])
+            return obj
+        elif hasattr(itm, "__call__"):
+            return partial(itm, self._index)
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        itm = self._props.get(name)
+        if type(itm) == tuple:
+            fset = itm[1]
+            if fset is None:
+                raise AttributeError("can't set attribute")
+            fset(self._index, value)
+            return
+        raise AttributeError("locked")
+
+    def __delattr__(self, name):
+        itm = self._props.get(name)
+        if type(itm) == tuple:
+            fdel = itm[2]
+            if fdel is None:
+                raise AttributeError("can't delete attribute")
+            fdel(self._index)
+            return
+        raise AttributeError("locked")
+
+    def __dir__(self):
+        return sorted(self._props)
+
+
+class _index_accessor(object):
+    "Class-level descriptor that looks up a name in the property table of a proxy"
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        itm = obj._props.get(self.name)
+        if type(itm) == tuple and itm[0] is not None:
+            return itm[0](obj._index)
+        return obj.__getattr__(self.name)
+
+
+def _compile_proxy_class(props):
+    "Return the compiled proxy class for a property table"
+    names = frozenset(props)
+    key = (IndexedPropertyProxy, names)
+    try:
+        return _compiled_classes[key]
+    except KeyError:
+        pass
+    ns = {
+        '__slots__': (),
+        '__module__': IndexedPropertyProxy.__module__,
+        '_compiled_base': IndexedPropertyProxy}
+    for name in names:
+        if not hasattr(IndexedPropertyProxy, name):
+            ns[name] = _index_accessor(name)
+    cls = _compiled_classes[key] = type('IndexedPropertyProxy', (IndexedPropertyProxy,), ns)
+    return cls
+
+
 class IndexedPropertyCollection(object):
     "A building block to create hierarchical trees of methods and properties with an index that is converted to a parameter"
     def __init__(self):
@@ -224,6 +440,21 @@ class IndexedPropertyCollection(object):
         self._indicies = list()
         self._indicies_dict = dict()
         self._objs = list()
+        self._proxy_class = IndexedPropertyProxy
+        self._compiled = False
+    
+    def _compile(self, compiled=True):
+        "Switch the element proxies over to (or back from) a compiled proxy class"
+        self._compiled = compiled
+        if compiled:
+            self._proxy_class = _compile_proxy_class(self._props)
+        else:
+            self._proxy_class = IndexedPropertyProxy
+        for obj in self._objs:
+            if obj is not None:
+                # sub-proxies are recreated with the matching class
+                object.__setattr__(obj, '__class__', self._proxy_class)
+                object.__setattr__(obj, '_children', None)
     
     def _add_property(self, name, fget=None, fset=None, fdel=None, doc=None, props = None, docs = None):
         "Add a managed property"
@@ -245,6 +476,8 @@ class IndexedPropertyCollection(object):
         else:
             props[n] = (fget, fset, fdel)
             docs[n] = doc
+            if self._compiled:
+                self._compile()
     
     def _add_method(self, name, f=None, doc=None, props = None, docs = None):
         "Add a managed method"
@@ -266,6 +499,8 @@ class IndexedPropertyCollection(object):
         else:
             props[n] = f
             docs[n] = doc
+            if self._compiled:
+                self._compile()
     
     def _add_sub_property(self, sub, name, fget=None, fset=None, fdel=None, doc=None):
         "Add a sub-property (equivalent to _add_property('sub.name', ...))"
@@ -286,44 +521,33 @@ class IndexedPropertyCollection(object):
         else:
             del self._props[name]
             del self._docs[name]
+            if self._compiled:
+                self._compile()
     
-    def _build_obj(self, props, docs, i):
-        "Build a tree of PropertyCollection objects with the proper index associations"
-        obj = PropertyCollection()
-        for n in props:
-            itm = props[n]
-            doc = docs[n]
-            if type(itm) == tuple:
-                fget, fset, fdel = itm
-                fgeti = fseti = fdeli = None
-                if fget is not None: fgeti = partial(fget, i)
-                if fset is not None: fseti = partial(fset, i)
-                if fdel is not None: fdeli = partial(fdel, i)
-                obj._add_property(n, fgeti, fseti, fdeli, doc)
-            elif type(itm) == dict:
-                o2 = self._build_obj(itm, doc, i)
-                obj.__dict__[n] = o2
-            elif hasattr(itm, "__call__"):
-                obj._add_method(n, partial(itm, i), doc)
-        obj._lock()
+    def _get_obj(self, i):
+        "Return the proxy object for an index, creating it on first access"
+        obj = self._objs[i]
+        if obj is None:
+            obj = self._objs[i] = self._proxy_class(i, self._props, self._docs)
         return obj
     
     def _set_list(self, l):
         "Set a list of allowable indicies as an associative array"
         self._indicies = list(l)
         self._indicies_dict = get_index_dict(self._indicies)
-        self._objs = list()
-        for i in range(len(self._indicies)):
-            self._objs.append(self._build_obj(self._props, self._docs, i))
+        self._objs = [None] * len(self._indicies)
     
     def __getitem__(self, key):
         if type(key) is slice:
-            return self._objs[key]
+            return [self._get_obj(i) for i in range(len(self._objs))[key]]
         i = get_index(self._indicies_dict, key)
-        return self._objs[i]
+        obj = self._objs[i]
+        if obj is None:
+            obj = self._objs[i] = self._proxy_class(i, self._props, self._docs)
+        return obj
 
     def __iter__(self):
-        return self._objs.__iter__()
+        return (self._get_obj(i) for i in range(len(self._objs)))
     
     def __len__(self):
         return len(self._indicies)
@@ -332,6 +556,28 @@ class IndexedPropertyCollection(object):
         return len(self._indicies)
 
 
+def _locked(d, f):
+    "Wrap f to run while holding the lock stored in dict d"
+    # the lock is looked up on every call, a pooled session replaces it
+    def locked(*args, **kwargs):
+        with d['_lock']:
+            return f(*args, **kwargs)
+    locked.__doc__ = f.__doc__
+    locked.__wrapped__ = f
+    return locked
+
+
+def _transaction(f):
+    "Decorator for Driver methods that run while holding the session lock"
+    def transaction(self, *args, **kwargs):
+        with self._lock:
+            return f(self, *args, **kwargs)
+    transaction.__name__ = f.__name__
+    transaction.__doc__ = f.__doc__
+    transaction.__wrapped__ = f
+    return transaction
+
+
 class IviContainer(PropertyCollection):
     def __init__(self, *args, **kwargs):
         super(IviContainer, self).__init__(*args, **kwargs)
@@ -368,6 +614,22 @@ class IviContainer(PropertyCollection):
         if type(doc) == Doc:
             doc.name = name
 
+        if type(attr) == tuple:
+            fget, fset, fdel = attr
+            if fget is not None:
+                register_cache_tag(fget)
+            if fset is not None:
+                register_cache_tag(fset, True)
+
+        # hold the session lock for the whole property access or method call,
+        # except for the calls that manage the lock itself
+        if '_lock' in self.__dict__ and name not in ('utility.lock_object', 'utility.unlock_object'):
+            d = self.__dict__
+            if type(attr) == tuple:
+                attr = tuple(None if f is None else _locked(d, f) for f in attr)
+            else:
+                attr = _locked(d, attr)
+
         if cur_obj == self:
             if type(attr) == tuple:
                 fget, fset, fdel = attr
@@ -390,13 +652,29 @@ class IviContainer(PropertyCollection):
 
 class Doc(object):
     "IVI documentation object"
+    __slots__ = ('_doc', '_trimmed', 'name', 'cls', 'grp', 'section')
+
     def __init__(self, doc = '', cls = '', grp = '', section = '', name = ''):
-        self.doc = trim_doc(doc)
+        # docstrings are only trimmed when the documentation is requested
+        self._doc = doc
+        self._trimmed = False
         self.name = name
         self.cls = cls
         self.grp = grp
         self.section = section
     
+    @property
+    def doc(self):
+        if not self._trimmed:
+            self._doc = trim_doc(self._doc)
+            self._trimmed = True
+        return self._doc
+    
+    @doc.setter
+    def doc(self, value):
+        self._doc = value
+        self._trimmed = False
+    
     def render(self):
         txt = '.. attribute:: ' + self.name + '\n\n'
         if self.cls != '':
@@ -412,37 +690,82 @@ class Doc(object):
 
 
 class TraceY(object):
-    "Y trace object"
+    """Y trace object
+
+    y_raw holds the raw samples as a numpy array.  Anything assigned to it
+    goes through np.asarray, so an array made with np.frombuffer on a
+    received block is stored without a copy.  The scaled y is computed on
+    first access and cached until y_raw or the scaling attributes change;
+    call invalidate() after modifying y_raw in place.  dtype selects
+    float64 or float32 output.
+    """
+    # samples converted to Python floats at a time when iterating
+    iter_chunk = 65536
+
     def __init__(self):
         self.average_count = 1
         self.y_increment = 0
         self.y_origin = 0
         self.y_reference = 0
-        self.y_raw = None
         self.y_hole = None
+        self.dtype = np.float64
+        self._y_raw = None
+        self._y = None
+        self._y_key = None
+
+    @property
+    def y_raw(self):
+        return self._y_raw
+
+    @y_raw.setter
+    def y_raw(self, value):
+        if value is not None:
+            value = np.asarray(value)
+        self._y_raw = value
+        self.invalidate()
+
+    def invalidate(self):
+        "Discard the cached scaled data"
+        self._y = None
 
     @property
     def y(self):
-        y = np.array(self.y_raw)
-        yf = y.astype(float)
-        if self.y_hole is not None:
-            yf[y == self.y_hole] = float('nan')
-        return ((yf - self.y_reference) * self.y_increment) + self.y_origin
+        key = (self.y_increment, self.y_origin, self.y_reference, self.y_hole, np.dtype(self.dtype))
+        if self._y is None or self._y_key != key:
+            raw = self._y_raw
+            if raw is None:
+                y = np.zeros(0, dtype=self.dtype)
+            else:
+                y = raw.astype(self.dtype)
+                y -= self.y_reference
+                y *= self.y_increment
+                y += self.y_origin
+                if self.y_hole is not None:
+                    y[raw == self.y_hole] = np.nan
+            # the cached array is shared between callers
+            y.flags.writeable = False
+            self._y = y
+            self._y_key = key
+        return self._y
+
+    def _iter_chunks(self, a):
+        for k in range(0, len(a), self.iter_chunk):
+            for v in a[k:k+self.iter_chunk].tolist():
+                yield v
 
     def __getitem__(self, index):
-        y = self.y_raw[index]
-        if y == self.y_hole:
-            y = float('nan')
-        return ((y - self.y_reference) * self.y_increment) + self.y_origin
+        return self.y[index]
 
     def __iter__(self):
-        return (float('nan') if y == self.y_hole else ((y - self.y_reference) * self.y_increment + self.y_origin) for i, y in enumerate(self.y_raw))
+        return self._iter_chunks(self.y)
 
     def __len__(self):
-        return len(self.y_raw)
+        if self._y_raw is None:
+            return 0
+        return len(self._y_raw)
 
     def count(self):
-        return len(self.y_raw)
+        return len(self)
 
 
 class TraceYT(TraceY):
@@ -452,23 +775,42 @@ class TraceYT(TraceY):
         self.x_increment = 0
         self.x_origin = 0
         self.x_reference = 0
+        self._x = None
+        self._x_key = None
 
     @property
     def x(self):
-        return ((np.arange(len(self.y_raw)) - self.x_reference) * self.x_increment) + self.x_origin
+        key = (len(self), self.x_increment, self.x_origin, self.x_reference, np.dtype(self.dtype))
+        if self._x is None or self._x_key != key:
+            x = np.arange(len(self), dtype=np.float64)
+            x -= self.x_reference
+            x *= self.x_increment
+            x += self.x_origin
+            x = x.astype(self.dtype, copy=False)
+            x.flags.writeable = False
+            self._x = x
+            self._x_key = key
+        return self._x
 
     @property
     def t(self):
         return self.x
 
+    def share_x(self, other):
+        "Use the cached x array of other when both have the same length and x scaling, returns True if shared"
+        x = other.x
+        key = (len(self), self.x_increment, self.x_origin, self.x_reference, np.dtype(self.dtype))
+        if other._x_key != key:
+            return False
+        self._x = x
+        self._x_key = key
+        return True
+
     def __getitem__(self, index):
-        y = self.y_raw[index]
-        if y == self.y_hole:
-            y = float('nan')
-        return (((index - self.x_reference) * self.x_increment) + self.x_origin, ((y - self.y_reference) * self.y_increment) + self.y_origin)
+        return (self.x[index], self.y[index])
 
     def __iter__(self):
-        return ((((i - self.x_reference) * self.x_increment) + self.x_origin, float('nan') if y == self.y_hole else ((y - self.y_reference) * self.y_increment) + self.y_origin) for i, y in enumerate(self.y_raw))
+        return zip(self._iter_chunks(self.x), self._iter_chunks(self.y))
 
 
 def add_attribute(obj, name, attr, doc = None):
@@ -488,13 +830,28 @@ def add_group_capability(obj, cap):
     obj._identity_group_capabilities.insert(0, cap)
 
 
-def build_ieee_block(data):
-    "Build IEEE block"
+def byte_view(data):
+    "Returns a flat memoryview of the bytes of any buffer protocol object"
+    view = memoryview(data)
+    if view.ndim != 1 or view.itemsize != 1:
+        view = view.cast('B')
+    return view
+
+
+def ieee_block_header(length):
+    "Build IEEE block header for length bytes of data"
     # IEEE block binary data is prefixed with #lnnnnnnnn
     # where l is length of n and n is the
     # length of the data
-    # ex: #800002000 prefixes 2000 data bytes
-    return str('#8%08d' % len(data)).encode('utf-8') + data
+    # ex: #42000 prefixes 2000 data bytes
+    n = str(length)
+    return str('#%d%s' % (len(n), n)).encode('utf-8')
+
+
+def build_ieee_block(data):
+    "Build IEEE block"
+    view = byte_view(data)
+    return b''.join((ieee_block_header(len(view)), view))
 
     
 def decode_ieee_block(data):
@@ -506,10 +863,9 @@ def decode_ieee_block(data):
     if len(data) == 0:
         return b''
     
-    ind = 0
-    c = '#'.encode('utf-8')
-    while data[ind:ind+1] != c:
-        ind += 1
+    ind = data.find(b'#')
+    if ind < 0:
+        return b''
     
     ind += 1
     l = int(data[ind:ind+1])
@@ -524,6 +880,42 @@ def decode_ieee_block(data):
         return data[ind:]
 
 
+def parse_ascii_values(data, delim=',', dtype=float):
+    "Parse delimited ASCII numbers, such as a SCPI response, into a numpy array"
+    if type(data) == bytes:
+        data = data.decode('utf-8')
+    data = data.strip()
+    if len(data) == 0:
+        return np.zeros(0, dtype=dtype)
+    # numpy converts the whole list of strings in one call
+    return np.array(data.split(delim), dtype=dtype)
+
+
+def parse_binary_values(data, dtype='f4', byteorder='big'):
+    """Decode binary numbers, such as a SCPI FORM REAL,32 block, into a numpy array
+
+    byteorder is 'big' (SCPI FORM:BORD NORM) or 'little' (FORM:BORD SWAP).  The
+    array is a read-only view of data when data is bytes; no copy is made.
+    """
+    dt = np.dtype(dtype).newbyteorder('>' if byteorder == 'big' else '<')
+    view = byte_view(data)
+    return np.frombuffer(view, dtype=dt, count=len(view) // dt.itemsize)
+
+
+def sample_view(data, dtype, count=-1, offset=0):
+    """Read-only array view of count samples of dtype starting at byte offset
+
+    Unlike np.frombuffer, a block shorter than count samples is not an error,
+    the view then holds the complete samples that are present.
+    """
+    dt = np.dtype(dtype)
+    offset = min(offset, len(data))
+    avail = (len(data) - offset) // dt.itemsize
+    if count < 0 or count > avail:
+        count = avail
+    return np.frombuffer(data, dtype=dt, count=count, offset=offset)
+
+
 def get_sig(sig):
     "Parse various signal inputs into x and y components"
     if type(sig) == tuple and len(sig) == 2:
@@ -558,6 +950,23 @@ def rms(y):
     return np.linalg.norm(y) / np.sqrt(y.size)
 
 
+def split_scpi_response(data, sep=';'):
+    "Split the responses to a compound SCPI query, ignoring separators in quoted strings"
+    l = []
+    quote = None
+    start = 0
+    for i, c in enumerate(data):
+        if quote is not None:
+            if c == quote:
+                quote = None
+        elif c == '"' or c == "'":
+            quote = c
+        elif c == sep:
+            l.append(data[start:i].strip())
+            start = i + 1
+    l.append(data[start:].strip())
+    return l
+
 def trim_doc(docstring):
     if not docstring:
         return ''
@@ -626,7 +1035,7 @@ def doc(obj=None, itm=None, docs=None, prefix=None):
             if type(obj) == dict and n in obj:
                 return doc(obj[n], r, prefix=prefix+n)
             
-            elif n in obj.__dict__:
+            elif hasattr(obj, '__dict__') and n in obj.__dict__:
                 return doc(obj.__dict__[n], r, prefix=prefix+n)
             
             elif hasattr(obj, '_docs') and n in obj._docs:
@@ -656,7 +1065,13 @@ def doc(obj=None, itm=None, docs=None, prefix=None):
         return "error"
         
     
-    if hasattr(obj, '__dict__'):
+    if isinstance(obj, IndexedPropertyProxy):
+        # proxies share the documentation dict of their collection
+        st = doc(docs=obj._docs, prefix=prefix)
+        if len(st) > 0:
+            return st
+
+    elif hasattr(obj, '__dict__'):
         # if obj has __dict__, iterate over it
         for n in sorted(obj.__dict__.keys()):
             o = obj.__dict__[n]
@@ -756,21 +1171,240 @@ def help(obj=None, itm=None, complete=False, indent=0):
 def list_resources():
     res = []
 
-    if 'vxi11' in globals():
-        # search for VXI11 devices
+    for backend in interface.get_backends():
+        if backend.lister is None or backend.load() is None:
+            continue
+        # search for devices
         try:
-            res.extend(vxi11.list_resources())
+            res.extend(getattr(backend.load(), backend.lister)())
         except:
             pass
 
-    if 'usbtmc' in globals():
-        # search for USBTMC devices
+    return res
+
+
+def open_interface(resource, prefer_pyvisa=False):
+    "Opens a new interface object for a VISA resource string"
+    # parse VISA resource string
+    # valid resource strings:
+    # TCPIP::10.0.0.1::INSTR
+    # TCPIP0::10.0.0.1::INSTR
+    # TCPIP::10.0.0.1::gpib,5::INSTR
+    # TCPIP0::10.0.0.1::gpib,5::INSTR
+    # TCPIP0::10.0.0.1::usb0::INSTR
+    # TCPIP0::10.0.0.1::usb0[1234::5678::MYSERIAL::0]::INSTR
+    # USB::1234::5678::INSTR
+    # USB::1234::5678::SERIAL::INSTR
+    # USB0::0x1234::0x5678::INSTR
+    # USB0::0x1234::0x5678::SERIAL::INSTR
+    # USB0::0x1234::0x5678::SERIAL::0::INSTR
+    # GPIB::10::INSTR
+    # GPIB0::10::INSTR
+    # ASRL1::INSTR
+    # ASRL::COM1,9600,8n1::INSTR
+    # ASRL::/dev/ttyUSB0,9600::INSTR
+    # ASRL::/dev/ttyUSB0,9600,8n1::INSTR
+    # TCPIP0::10.0.0.1::hislip0::INSTR
+    # TCPIP0::10.0.0.1::hislip0,4880::INSTR
+    # TCPIP::10.0.0.1::5025::SOCKET
+    # TCPIP0::10.0.0.1::5025::SOCKET
+    m = re.match('^(?P<prefix>(?P<type>TCPIP|USB|GPIB|ASRL)\d*)(::(?P<arg1>[^\s:]+))?(::(?P<arg2>[^\s:]+(\[.+\])?))?(::(?P<arg3>[^\s:]+))?(::(?P<arg4>[^\s:]+))?(::(?P<suffix>INSTR|SOCKET))$', resource, re.I)
+    if m is None:
+        # only backends that parse resource strings themselves, like PyVISA
+        res_type = None
+        backends = [b for b in interface.get_backends() if b.resource_types is None]
+    else:
+        res_type = m.group('type').upper()
+        if m.group('suffix').upper() != 'INSTR':
+            res_type += '::' + m.group('suffix').upper()
+        elif res_type == 'TCPIP' and (m.group('arg2') or '').lower().startswith('hislip'):
+            res_type += '::HISLIP'
+        backends = interface.get_backends(res_type)
+
+    if prefer_pyvisa:
+        backends.sort(key=lambda b: b.name != 'pyvisa')
+
+    # use the first backend that is installed
+    for backend in backends:
+        if backend.load() is not None:
+            return backend.open(resource)
+
+    if res_type is None:
+        raise IOException('Invalid resource string')
+    raise IOException('Cannot use resource type %s' % res_type)
+
+
+class PooledSession(object):
+    "Open interface shared by all drivers using the same resource string"
+    def __init__(self, pool, resource, interface):
+        self.pool = pool
+        self.resource = resource
+        self.interface = interface
+        # drivers sharing the session share its lock, so one driver's
+        # transactions are never interleaved with another's
+        self.lock = threading.RLock()
+        self.refs = 0
+        self.owners = dict()
+        self.last_used = time.time()
+
+
+class SessionPool(object):
+    """Pool of open instrument sessions keyed by resource string
+    
+    Drivers initialized with a resource string while a pool is installed
+    with set_session_pool get an already open interface when there is one,
+    and hand it back to the pool when they are closed.  Sessions are
+    reference counted, so several drivers may use the same session at once;
+    a driver that is garbage collected without being closed releases its
+    reference as well.
+    
+    max_open limits the number of open sessions; when the limit is reached,
+    the least recently used idle session is closed to make room, and if
+    every session is in use acquire waits up to timeout seconds for one to
+    be released.  Sessions idle for more than idle_timeout seconds are closed.
+    health_check is called with the interface before an idle session is
+    reused; if it returns False or raises, the session is closed and
+    reopened.
+    """
+    def __init__(self, max_open=None, idle_timeout=60.0, health_check=None, timeout=0):
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+        self.timeout = timeout
+        self._sessions = dict()
+        self._orphans = []
+        self._cond = threading.Condition(threading.Lock())
+    
+    def __len__(self):
+        return len(self._sessions)
+    
+    def __contains__(self, resource):
+        return resource in self._sessions
+    
+    def _open(self, resource, prefer_pyvisa):
+        return open_interface(resource, prefer_pyvisa)
+    
+    def _check(self, interface):
+        if self.health_check is None:
+            return True
         try:
-            res.extend(usbtmc.list_resources())
+            return self.health_check(interface) is not False
+        except Exception:
+            return False
+    
+    def _discard(self, session):
+        del self._sessions[session.resource]
+        try:
+            session.interface.close()
         except:
             pass
-
-    return res
+    
+    def _idle(self):
+        return sorted((s for s in self._sessions.values() if s.refs == 0),
+                key=lambda s: s.last_used)
+    
+    def _release(self, session):
+        session.refs -= 1
+        session.last_used = time.time()
+        if session.refs <= 0:
+            session.refs = 0
+            if self._sessions.get(session.resource) is not session:
+                # removed from the pool while in use
+                try:
+                    session.interface.close()
+                except:
+                    pass
+            self._cond.notify_all()
+    
+    def _collect(self):
+        # weakref callbacks only queue the release, they may run at any
+        # point in any thread, including while this pool is locked
+        while self._orphans:
+            session, ref = self._orphans.pop()
+            if session.owners.pop(id(ref), None) is ref:
+                self._release(session)
+    
+    def acquire(self, resource, prefer_pyvisa=False, owner=None):
+        """Returns an open session for resource, opening one if required
+        
+        If owner is given, the session is released when owner is garbage
+        collected without calling release.
+        """
+        with self._cond:
+            self._collect()
+            self._evict()
+            session = self._sessions.get(resource)
+            if session is not None and session.refs == 0 and not self._check(session.interface):
+                self._discard(session)
+                session = None
+            if session is None:
+                deadline = None
+                while self.max_open is not None and len(self._sessions) >= self.max_open:
+                    idle = self._idle()
+                    if idle:
+                        self._discard(idle[0])
+                        continue
+                    if deadline is None:
+                        deadline = time.time() + (self.timeout or 0)
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise IOException('Session pool exhausted (%d sessions open)' % len(self._sessions))
+                    self._cond.wait(remaining)
+                    # the resource may have been opened while waiting
+                    session = self._sessions.get(resource)
+                    if session is not None:
+                        break
+            if session is None:
+                session = PooledSession(self, resource, self._open(resource, prefer_pyvisa))
+                self._sessions[resource] = session
+            session.refs += 1
+            session.last_used = time.time()
+            if owner is not None:
+                orphans = self._orphans
+                ref = weakref.ref(owner, lambda r: orphans.append((session, r)))
+                session.owners[id(ref)] = ref
+            return session
+    
+    def release(self, session, owner=None):
+        "Returns a session acquired with acquire to the pool"
+        with self._cond:
+            self._collect()
+            if owner is not None:
+                for key, ref in list(session.owners.items()):
+                    if ref() is owner:
+                        del session.owners[key]
+                        break
+            self._release(session)
+            self._evict()
+    
+    def _evict(self, max_idle=None):
+        if max_idle is None:
+            max_idle = self.idle_timeout
+        if max_idle is None:
+            return
+        limit = time.time() - max_idle
+        for session in self._idle():
+            if session.last_used <= limit:
+                self._discard(session)
+    
+    def evict(self, max_idle=None):
+        "Closes sessions idle for longer than max_idle seconds (default idle_timeout)"
+        with self._cond:
+            self._collect()
+            self._evict(max_idle)
+            self._cond.notify_all()
+    
+    def close(self):
+        "Closes all idle sessions and forgets the ones in use"
+        with self._cond:
+            self._collect()
+            for session in list(self._sessions.values()):
+                if session.refs == 0:
+                    self._discard(session)
+                else:
+                    # closed by release once the last driver lets go
+                    del self._sessions[session.resource]
+            self._cond.notify_all()
 
 
 class DriverOperation(IviContainer):
@@ -1569,6 +2203,36 @@ class DriverUtility(IviContainer):
         pass
 
 
+class _BatchContext(object):
+    "Context manager returned by Driver.batch()"
+    def __init__(self, driver):
+        self._driver = driver
+        self._outer = False
+    
+    def __enter__(self):
+        driver = self._driver
+        # other threads must not add to or read around the batch
+        driver._lock.acquire()
+        if driver._batch_supported and driver._batch is None:
+            self._outer = True
+            driver._batch = []
+        return driver
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        driver = self._driver
+        try:
+            if self._outer:
+                try:
+                    # commands already sent to the batch are part of the
+                    # cached state, so they go out even if the block raised
+                    driver._flush_batch()
+                finally:
+                    driver._batch = None
+        finally:
+            driver._lock.release()
+        return False
+
+
 class Driver(DriverOperation, DriverIdentity, DriverUtility):
     "Inherent IVI methods for all instruments"
 
@@ -1581,12 +2245,30 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
                 kw[k] = kwargs.pop(k)
         
         self._interface = None
+        self._session = None
         self._initialized = False
         self.__dict__.setdefault('_instrument_id', '')
         self._cache_valid = dict()
+        self._cache_ttl = dict()
+        self._cache_dependencies = dict()
+        self._cache_dependents = dict()
+        # reentrant session lock, held for every I/O transaction and
+        # property access, and by utility.lock_object
+        self._lock = threading.RLock()
+        # commands buffered by batch(), None when not batching
+        self._batch = None
+        self._batch_encoding = 'utf-8'
+        self._batch_supported = True
+        self._batch_max_length = 1024
         
         super(Driver, self).__init__(*args, **kwargs)
         
+        # operations that change the instrument state wholesale invalidate
+        # everything unless a driver declares a narrower set of dependents
+        self._set_cache_dependencies('utility_reset', '*')
+        self._set_cache_dependencies('memory_recall', '*')
+        self._set_cache_dependencies('system_load_setup', '*')
+        
         self._add_method('initialize',
                         self._initialize,
                         """
@@ -1663,6 +2345,9 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
                             'TCPIP0::10.0.0.1::gpib,5::INSTR'
                             'TCPIP0::10.0.0.1::usb0::INSTR'
                             'TCPIP0::10.0.0.1::usb0[1234::5678::MYSERIAL::0]::INSTR'
+                            'TCPIP0::10.0.0.1::hislip0::INSTR'
+                            'TCPIP::10.0.0.1::5025::SOCKET'
+                            'TCPIP0::10.0.0.1::5025::SOCKET'
                             'USB::1234::5678::INSTR'
                             'USB::1234::5678::SERIAL::INSTR'
                             'USB0::0x1234::0x5678::INSTR'
@@ -1803,112 +2488,28 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
             else:
                 raise UnknownOptionException('Invalid option')
 
+        if self._session is not None:
+            # initialized again without closing
+            self._session.pool.release(self._session, self)
+            self._session = None
+
         # process resource
         if self._driver_operation_simulate:
             print("Simulating; ignoring resource")
         elif resource is None:
             raise IOException('No resource specified!')
         elif type(resource) == str:
-            # parse VISA resource string
-            # valid resource strings:
-            # TCPIP::10.0.0.1::INSTR
-            # TCPIP0::10.0.0.1::INSTR
-            # TCPIP::10.0.0.1::gpib,5::INSTR
-            # TCPIP0::10.0.0.1::gpib,5::INSTR
-            # TCPIP0::10.0.0.1::usb0::INSTR
-            # TCPIP0::10.0.0.1::usb0[1234::5678::MYSERIAL::0]::INSTR
-            # USB::1234::5678::INSTR
-            # USB::1234::5678::SERIAL::INSTR
-            # USB0::0x1234::0x5678::INSTR
-            # USB0::0x1234::0x5678::SERIAL::INSTR
-            # USB0::0x1234::0x5678::SERIAL::0::INSTR
-            # GPIB::10::INSTR
-            # GPIB0::10::INSTR
-            # ASRL1::INSTR
-            # ASRL::COM1,9600,8n1::INSTR
-            # ASRL::/dev/ttyUSB0,9600::INSTR
-            # ASRL::/dev/ttyUSB0,9600,8n1::INSTR
-            m = re.match('^(?P<prefix>(?P<type>TCPIP|USB|GPIB|ASRL)\d*)(::(?P<arg1>[^\s:]+))?(::(?P<arg2>[^\s:]+(\[.+\])?))?(::(?P<arg3>[^\s:]+))?(::(?P<arg4>[^\s:]+))?(::(?P<suffix>INSTR))$', resource, re.I)
-            if m is None:
-                if 'pyvisa' in globals():
-                    # connect with PyVISA
-                    self._interface = pyvisa.PyVisaInstrument(resource)
-                else:
-                    raise IOException('Invalid resource string')
+            if _session_pool is not None:
+                # reuse an open session to the same resource
+                self._session = _session_pool.acquire(resource, self._prefer_pyvisa, self)
+                self._interface = self._session.interface
+                self._lock = self._session.lock
             else:
-                res_type = m.group('type').upper()
-                res_prefix = m.group('prefix')
-                res_arg1 = m.group('arg1')
-                res_arg2 = m.group('arg2')
-                res_arg3 = m.group('arg3')
-                res_suffix = m.group('suffix')
-
-                if res_type == 'TCPIP':
-                    # TCP connection
-                    if self._prefer_pyvisa and 'pyvisa' in globals():
-                        # connect with PyVISA
-                        self._interface = pyvisa.PyVisaInstrument(resource)
-                    elif 'vxi11' in globals():
-                        # connect with VXI-11
-                        self._interface = vxi11.Instrument(resource)
-                    elif 'pyvisa' in globals():
-                        # connect with PyVISA
-                        self._interface = pyvisa.PyVisaInstrument(resource)
-                    else:
-                        raise IOException('Cannot use resource type %s' % res_type)
-                elif res_type == 'USB':
-                    # USB connection
-                    if self._prefer_pyvisa and 'pyvisa' in globals():
-                        # connect with PyVISA
-                        self._interface = pyvisa.PyVisaInstrument(resource)
-                    elif 'usbtmc' in globals():
-                        # connect with USBTMC
-                        self._interface = usbtmc.Instrument(resource)
-                    elif 'pyvisa' in globals():
-                        # connect with PyVISA
-                        self._interface = pyvisa.PyVisaInstrument(resource)
-                    else:
-                        raise IOException('Cannot use resource type %s' % res_type)
-                elif res_type == 'GPIB':
-                    # GPIB connection
-                    if self._prefer_pyvisa and 'pyvisa' in globals():
-                        # connect with PyVISA
-                        self._interface = pyvisa.PyVisaInstrument(resource)
-                    elif 'linuxgpib' in globals():
-                        # connect with linux-gpib
-                        self._interface = linuxgpib.LinuxGpibInstrument(resource)
-                    elif 'pyvisa' in globals():
-                        # connect with PyVISA
-                        self._interface = pyvisa.PyVisaInstrument(resource)
-                    else:
-                        raise IOException('Cannot use resource type %s' % res_type)
-                elif res_type == 'ASRL':
-                    # Serial connection
-                    if self._prefer_pyvisa and 'pyvisa' in globals():
-                        # connect with PyVISA
-                        self._interface = pyvisa.PyVisaInstrument(resource)
-                    elif 'pyserial' in globals():
-                        # connect with PySerial
-                        self._interface = pyserial.SerialInstrument(resource)
-                    elif 'pyvisa' in globals():
-                        # connect with PyVISA
-                        self._interface = pyvisa.PyVisaInstrument(resource)
-                    else:
-                        raise IOException('Cannot use resource type %s' % res_type)
-
-                elif 'pyvisa' in globals():
-                    # connect with PyVISA
-                    self._interface = pyvisa.PyVisaInstrument(resource)
-                else:
-                    raise IOException('Unknown resource type %s' % res_type)
-
+                self._interface = open_interface(resource, self._prefer_pyvisa)
             self._driver_operation_io_resource_descriptor = resource
 
-        elif 'vxi11' in globals() and resource.__class__ == vxi11.Instrument:
-            # Got a vxi11 instrument, can use it as is
-            self._interface = resource
-        elif 'usbtmc' in globals() and resource.__class__ == usbtmc.Instrument:
-            # Got a usbtmc instrument, can use it as is
+        elif interface.is_backend_instance(resource):
+            # Got an instrument opened by one of the backends, can use it as is
             self._interface = resource
         elif set(['read_raw', 'write_raw']).issubset(set(resource.__class__.__dict__)):
             # has read_raw and write_raw, so should be a usable interface
@@ -1922,9 +2523,24 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
         self._initialized = True
 
 
+    def _utility_lock_object(self, maximum_time=None):
+        if maximum_time is None:
+            self._lock.acquire()
+        elif not self._lock.acquire(timeout=maximum_time):
+            raise MaxTimeoutExceededException()
+    
+    def _utility_unlock_object(self):
+        self._lock.release()
+    
     def _close(self):
         "Closes an IVI session"
-        if self._interface:
+        if self._batch:
+            self._flush_batch()
+        if self._session is not None:
+            # leave the interface open for the next driver
+            self._session.pool.release(self._session, self)
+            self._session = None
+        elif self._interface:
             try:
                 self._interface.close()
             except:
@@ -1940,41 +2556,129 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
     
     def _get_cache_tag(self, tag=None, skip=1):
         if tag is None:
-            stack = inspect.stack()
-            start = 0 + skip
-            if len(stack) < start + 1:
+            try:
+                code = sys._getframe(skip).f_code
+            except ValueError:
                 return ''
-            tag = stack[start][3] 
-        
-        if tag[0:4] == "_get": tag = tag[4:]
-        if tag[0:4] == "_set": tag = tag[4:]
-        if tag[0] == "_": tag = tag[1:]
-        
-        return tag
+            try:
+                return _cache_tags[code]
+            except KeyError:
+                # not registered as a property accessor, resolve it now
+                tag = _cache_tags[code] = get_cache_tag(code.co_name)
+                return tag
+
+        return get_cache_tag(tag)
 
     def _get_cache_valid(self, tag=None, index=-1, skip_disable=False):
-        if not skip_disable and not self._driver_operation_cache:
+        # bypass PropertyCollection attribute lookup, this is called on
+        # every cached property access
+        d = object.__getattribute__(self, '__dict__')
+        if not skip_disable and not d['_driver_operation_cache']:
             return False
-        tag = self._get_cache_tag(tag, 2)
+        if tag is None:
+            try:
+                tag = _cache_tags[sys._getframe(1).f_code]
+            except KeyError:
+                tag = self._get_cache_tag(None, 2)
+        else:
+            tag = get_cache_tag(tag)
         if index >= 0:
-            tag = tag + '_%d' % index
-        try:
-            return self._cache_valid[tag]
-        except KeyError:
-            self._cache_valid[tag] = False
-            return False
+            valid = d['_cache_valid'].get((tag, index), False)
+        else:
+            valid = d['_cache_valid'].get(tag, False)
+        if valid is True or valid is False:
+            return valid
+        # entries with a time to live store their expiration time
+        return _monotonic() < valid
 
     def _set_cache_valid(self, valid=True, tag=None, index=-1):
-        tag = self._get_cache_tag(tag, 2)
+        d = object.__getattribute__(self, '__dict__')
+        changed = False
+        if tag is None:
+            code = sys._getframe(1).f_code
+            try:
+                tag = _cache_tags[code]
+            except KeyError:
+                tag = self._get_cache_tag(None, 2)
+            changed = valid and code in _cache_setters
+        else:
+            tag = get_cache_tag(tag)
+        key = tag
         if index >= 0:
-            tag = tag + '_%d' % index
-        self._cache_valid[tag] = valid
+            key = (tag, index)
+        valid = bool(valid)
+        if valid and tag in d['_cache_ttl']:
+            valid = _monotonic() + d['_cache_ttl'][tag]
+        d['_cache_valid'][key] = valid
+        if changed and tag in d['_cache_dependencies']:
+            self._invalidate_cache_dependents(tag, index)
+
+    def _set_cache_ttl(self, tag, ttl):
+        "Set the time in seconds after which a cached attribute expires, None to disable"
+        tag = get_cache_tag(tag)
+        if ttl is None:
+            self._cache_ttl.pop(tag, None)
+        else:
+            self._cache_ttl[tag] = float(ttl)
+
+    def _set_cache_dependencies(self, tag, *dependents):
+        "Declare the cached attributes invalidated when tag changes, '*' invalidates all"
+        self._cache_dependencies[get_cache_tag(tag)] = [get_cache_tag(t) for t in dependents]
+        self._cache_dependents = dict()
+
+    def _add_cache_dependencies(self, tag, *dependents):
+        "Add cached attributes to be invalidated when tag changes"
+        tag = get_cache_tag(tag)
+        self._cache_dependencies.setdefault(tag, list()).extend(get_cache_tag(t) for t in dependents)
+        self._cache_dependents = dict()
+
+    def _get_cache_dependents(self, tag):
+        "Returns the transitive set of attributes that depend on tag"
+        try:
+            return self._cache_dependents[tag]
+        except KeyError:
+            pass
+        deps = set()
+        pending = list(self._cache_dependencies.get(tag, []))
+        while pending:
+            t = pending.pop()
+            if t not in deps:
+                deps.add(t)
+                pending.extend(self._cache_dependencies.get(t, []))
+        deps.discard(tag)
+        self._cache_dependents[tag] = deps
+        return deps
+
+    def _invalidate_cache_dependents(self, tag=None, index=-1):
+        "Invalidate the cached attributes that depend on tag (defaults to the calling function)"
+        if tag is None:
+            tag = self._get_cache_tag(None, 2)
+        else:
+            tag = get_cache_tag(tag)
+        deps = self._get_cache_dependents(tag)
+        if not deps:
+            return
+        if '*' in deps:
+            self._cache_valid = dict()
+            return
+        cache = self._cache_valid
+        for key in list(cache):
+            if type(key) is tuple:
+                # indexed entries are only invalidated for the same index,
+                # unless the change did not come from an indexed attribute
+                if key[0] in deps and (index < 0 or key[1] == index):
+                    del cache[key]
+            elif key in deps:
+                del cache[key]
 
     def _driver_operation_invalidate_all_attributes(self):
         self._cache_valid = dict()
 
+    @_transaction
     def _write_raw(self, data):
         "Write binary data to instrument"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Call to write_raw")
             return
@@ -1982,8 +2686,11 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
             raise NotInitializedException()
         self._interface.write_raw(data)
     
+    @_transaction
     def _read_raw(self, num=-1):
         "Read binary data from instrument"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Call to read_raw")
             return b''
@@ -1991,8 +2698,11 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
             raise NotInitializedException()
         return self._interface.read_raw(num)
     
+    @_transaction
     def _ask_raw(self, data, num=-1):
         "Write then read binary data"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Call to ask_raw")
             return b''
@@ -2005,8 +2715,12 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
             self._write_raw(data)
             return self._read_raw(num)
     
+    @_transaction
     def _write(self, data, encoding = 'utf-8'):
         "Write string to instrument"
+        if self._batch is not None:
+            self._batch_write(data, encoding)
+            return
         if self._driver_operation_simulate:
             print("[simulating] Write (%s) '%s'" % (encoding, data))
             return
@@ -2023,8 +2737,11 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
 
             self._write_raw(str(data).encode(encoding))
     
+    @_transaction
     def _read(self, num=-1, encoding = 'utf-8'):
         "Read string from instrument"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Read (%s)" % encoding)
             return ''
@@ -2035,8 +2752,11 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
         except AttributeError:
             return self._read_raw(num).decode(encoding).rstrip('\r\n')
     
+    @_transaction
     def _ask(self, data, num=-1, encoding = 'utf-8'):
         "Write then read string"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Ask (%s) '%s'" % (encoding, data))
             return ''
@@ -2056,6 +2776,171 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
             self._write(data, encoding)
             return self._read(num, encoding)
     
+    def batch(self):
+        """Buffer writes and send them to the instrument as one message
+        
+        Commands written inside the with block are joined with ';' and sent
+        when the block ends, or earlier when the driver reads from the
+        instrument or the message would exceed the maximum length.  Does
+        nothing for drivers that do not support it.
+        
+            with scope.batch():
+                scope.channels[0].range = 1.0
+                scope.channels[0].offset = 0.0
+        """
+        return _BatchContext(self)
+    
+    def _batch_write(self, data, encoding):
+        "Add commands to the batch"
+        if type(data) is tuple or type(data) is list:
+            for data_i in data:
+                self._batch_write(data_i, encoding)
+            return
+        data = str(data).strip()
+        if not data:
+            return
+        if self._batch and encoding != self._batch_encoding:
+            self._flush_batch()
+        self._batch_encoding = encoding
+        self._batch.append(data)
+    
+    def _join_batch(self, commands):
+        """Join commands into as few messages as allowed by the maximum length
+        
+        Returns a list of (message, number of commands) tuples.
+        """
+        max_length = self._batch_max_length
+        # vxi11 reports the receive buffer size of the device
+        max_recv_size = getattr(self._interface, 'max_recv_size', None)
+        if max_recv_size:
+            max_length = min(max_length, max_recv_size)
+        messages = []
+        msg = ''
+        n = 0
+        for cmd in commands:
+            # start from the root of the command tree, otherwise the
+            # instrument resolves the header relative to the previous one
+            if cmd[0] not in ':*':
+                cmd = ':' + cmd
+            if msg and len(msg) + len(cmd) + 1 > max_length:
+                messages.append((msg, n))
+                msg = cmd
+                n = 1
+            elif msg:
+                msg += ';' + cmd
+                n += 1
+            else:
+                msg = cmd
+                n = 1
+        if msg:
+            messages.append((msg, n))
+        return messages
+    
+    @_transaction
+    def _flush_batch(self):
+        "Send the commands buffered by batch()"
+        commands = self._batch
+        if not commands:
+            return
+        self._batch = None
+        try:
+            for msg, n in self._join_batch(commands):
+                self._write(msg, self._batch_encoding)
+        finally:
+            self._batch = []
+    
+    def query_batch(self, queries=None):
+        """Send several queries to the instrument in one message
+        
+        queries is a list of query strings or (query, converter) tuples and
+        the list of responses is returned, each passed through its converter.
+        Without queries, all settings the driver can read in bulk are read
+        into the attribute cache with a single round trip.
+        
+            vpp, freq = scope.query_batch([(':measure:vpp? channel1', float),
+                                           (':measure:frequency? channel1', float)])
+        """
+        if queries is None:
+            queries = self._get_batch_queries()
+        return self._ask_many(queries)
+    
+    def _get_batch_queries(self):
+        """Returns the queries read by query_batch() without arguments as
+        (query, converter, attribute, index) tuples"""
+        return []
+    
+    @_transaction
+    def _ask_many(self, queries, encoding = 'utf-8'):
+        """Send several queries and commands as one message and split the response
+        
+        Each entry is a string or a (query, converter, attribute, index) tuple
+        where all but the query are optional.  Entries without '?' in the
+        header are commands that produce no response, such as a channel
+        selection.  When attribute is given, the converted value is stored in
+        self._<attribute> (or self._<attribute>[index]) and the attribute is
+        marked valid in the cache.  Returns the converted responses of the
+        queries in order.  Responses must not contain binary blocks.
+        """
+        entries = []
+        for entry in queries:
+            if type(entry) is not tuple:
+                entry = (entry,)
+            entries.append(entry + (None,) * (4 - len(entry)))
+        commands = [str(e[0]).strip() for e in entries]
+        is_query = ['?' in cmd.split(None, 1)[0] for cmd in commands]
+        
+        if self._driver_operation_simulate:
+            print("[simulating] Ask many (%s) %r" % (encoding, commands))
+            values = []
+            for q, (query, converter, attr, index) in zip(is_query, entries):
+                if q:
+                    if attr is None:
+                        values.append(None)
+                    elif index is None:
+                        values.append(getattr(self, '_' + attr))
+                    else:
+                        values.append(getattr(self, '_' + attr)[index])
+            return values
+        
+        responses = []
+        if self._batch_supported:
+            k = 0
+            for msg, n in self._join_batch(commands):
+                count = sum(is_query[k:k+n])
+                k += n
+                if count == 0:
+                    self._write(msg, encoding)
+                    continue
+                resp = split_scpi_response(self._ask(msg, encoding=encoding))
+                if len(resp) != count:
+                    raise UnexpectedResponseException()
+                responses.extend(resp)
+        else:
+            for q, cmd in zip(is_query, commands):
+                if q:
+                    responses.append(self._ask(cmd, encoding=encoding))
+                else:
+                    self._write(cmd, encoding)
+        
+        values = []
+        responses = iter(responses)
+        for q, (query, converter, attr, index) in zip(is_query, entries):
+            if not q:
+                continue
+            value = next(responses)
+            if converter is not None:
+                value = converter(value)
+            values.append(value)
+            if attr is not None:
+                if index is None:
+                    setattr(self, '_' + attr, value)
+                    self._set_cache_valid(True, attr)
+                else:
+                    getattr(self, '_' + attr)[index] = value
+                    self._set_cache_valid(True, attr, index)
+        return values
+    
+    @_transaction
     def _ask_for_values(self, msg, delim=',', converter=float, array=True):
         '''
         write then read a list or array of data
@@ -2069,18 +2954,43 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
         converter : type
             a datatype used to typecase the elements in the returned list
         array: bool
-            convert the output to a numpy array 
-        
+            convert the output to a numpy array
+
         '''
         s = self._ask(msg)
-        s_split = s.split(delim)
-        out = map(converter, s_split)
-        if array:
-            out = np.array(out)
+        if converter is float or converter is int:
+            out = parse_ascii_values(s, delim, converter)
+            if not array:
+                out = out.tolist()
+        else:
+            out = [converter(x) for x in s.split(delim)]
+            if array:
+                out = np.array(out)
         return out
+
+    @_transaction
+    def _ask_for_binary_values(self, msg, dtype='f4', byteorder='big', encoding = 'utf-8'):
+        '''
+        write then read an IEEE block of binary numbers as a numpy array
+
+        Parameters
+        --------------
+        msg : str
+            message to write to instrument
+        dtype : numpy dtype
+            type of each value, 'f4' for FORM REAL,32 and 'f8' for FORM REAL,64
+        byteorder : str
+            'big' for FORM:BORD NORM, 'little' for FORM:BORD SWAP
+
+        '''
+        self._write(msg, encoding)
+        return parse_binary_values(self._read_ieee_block(), dtype, byteorder)
     
+    @_transaction
     def _read_stb(self):
         "Read status byte"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Read status")
             return 0
@@ -2091,8 +3001,11 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
         except (AttributeError, NotImplementedError):
             return int(self._ask("*STB?"))
     
+    @_transaction
     def _trigger(self):
         "Device trigger"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Trigger")
         if not self._initialized or self._interface is None:
@@ -2102,8 +3015,11 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
         except (AttributeError, NotImplementedError):
             self._write("*TRG")
     
+    @_transaction
     def _clear(self):
         "Device clear"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Clear")
         if not self._initialized or self._interface is None:
@@ -2113,68 +3029,204 @@ class Driver(DriverOperation, DriverIdentity, DriverUtility):
         except (AttributeError, NotImplementedError):
             self._write("*CLS")
     
+    @_transaction
     def _remote(self):
         "Device set remote"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Remote")
         if not self._initialized or self._interface is None:
             raise NotInitializedException()
         return self._interface.remote()
     
+    @_transaction
     def _local(self):
         "Device set local"
+        if self._batch:
+            self._flush_batch()
         if self._driver_operation_simulate:
             print("[simulating] Local")
         if not self._initialized or self._interface is None:
             raise NotInitializedException()
         return self._interface.local()
     
-    def _read_ieee_block(self):
-        "Read IEEE block"
+    @_transaction
+    def _read_ieee_block_header(self):
+        "Read IEEE block header, returns the payload length, -1 for indefinite length or None if nothing was read"
         # IEEE block binary data is prefixed with #lnnnnnnnn
         # where l is length of n and n is the
         # length of the data
         # ex: #800002000 prefixes 2000 data bytes
+        # #0 starts a block that lasts until the end of the message
 
-        ch = self._read_raw(1)
+        ch = self._read_raw(2)
 
         if len(ch) == 0:
-            return b''
+            return None
 
-        while ch != b'#':
-            ch = self._read_raw(1)
+        # skip anything before the #
+        while ch[0:1] != b'#':
+            c = self._read_raw(1)
+            if len(c) == 0:
+                return None
+            ch = ch[1:] + c
 
-        l = int(self._read_raw(1))
+        if len(ch) < 2:
+            ch += self._read_raw(1)
+
+        l = int(ch[1:2])
         if l > 0:
-            num = int(self._read_raw(l))
-            raw_data = self._read_raw(num)
-        else:
-            raw_data = self._read_raw()
+            digits = self._read_raw(l)
+            while len(digits) < l:
+                d = self._read_raw(l - len(digits))
+                if len(d) == 0:
+                    break
+                digits += d
+            return int(digits)
+        return -1
+
+    def _end_ieee_block(self):
+        "Let the interface drop the response terminator after a complete block"
+        try:
+            discard = self._interface.discard_terminator
+        except AttributeError:
+            return
+        discard()
+
+    def _read_into(self, view):
+        "Read binary data from instrument into writable memoryview, returns the number of bytes read"
+        if self._batch:
+            self._flush_batch()
+        if self._driver_operation_simulate:
+            print("[simulating] Call to read_into")
+            return 0
+        if not self._initialized or self._interface is None:
+            raise NotInitializedException()
+        try:
+            return self._interface.readinto(view)
+        except AttributeError:
+            data = self._interface.read_raw(len(view))
+            view[:len(data)] = data
+            return len(data)
 
-        return raw_data
+    def _iter_ieee_block(self, chunk_size=None, progress=None):
+        """Read IEEE block, yielding the payload in chunks of up to chunk_size bytes
+        
+        The whole payload is read at once when chunk_size is None.  progress is
+        called with the number of bytes received so far and the block length
+        (-1 for indefinite length blocks) after every chunk.  The session lock
+        is held until the generator is exhausted or closed.
+        """
+        with self._lock:
+            num = self._read_ieee_block_header()
+            if num is None:
+                return
+
+            total = 0
+            while num < 0 or total < num:
+                if num < 0:
+                    size = chunk_size or -1
+                elif chunk_size is None:
+                    size = num - total
+                else:
+                    size = min(chunk_size, num - total)
+                data = self._read_raw(size)
+                if len(data) == 0:
+                    break
+                total += len(data)
+                if progress is not None:
+                    progress(total, num)
+                yield data
+                if num < 0 and (size < 0 or len(data) < size):
+                    # end of message
+                    break
+            if num >= 0 and total == num:
+                self._end_ieee_block()
+
+    @_transaction
+    def _read_ieee_block(self, chunk_size=None, progress=None):
+        "Read IEEE block"
+        # joining a single chunk returns it without copying
+        return b''.join(self._iter_ieee_block(chunk_size, progress))
+
+    @_transaction
+    def _read_ieee_block_into(self, buf, chunk_size=None, progress=None):
+        """Read IEEE block payload into writable buffer buf, returns the number of bytes read
+        
+        buf can be any contiguous writable buffer, such as a bytearray or a
+        numpy array.  An indefinite length block fills buf up to the end of the
+        message.
+        """
+        view = memoryview(buf)
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast('B')
+
+        num = self._read_ieee_block_header()
+        if num is None:
+            return 0
+        definite = num >= 0
+        if not definite:
+            num = len(view)
+        elif num > len(view):
+            raise ValueError("Buffer too small for IEEE block of %d bytes" % num)
+
+        total = 0
+        while total < num:
+            size = num - total if chunk_size is None else min(chunk_size, num - total)
+            n = self._read_into(view[total:total+size])
+            if n == 0:
+                break
+            total += n
+            if progress is not None:
+                progress(total, num)
+        if definite and total == num:
+            self._end_ieee_block()
+        return total
     
     def _ask_for_ieee_block(self, data, encoding = 'utf-8'):
         "Write string then read IEEE block"
         self._write(data, encoding)
         return self._read_ieee_block()
 
-    def _write_ieee_block(self, data, prefix = None, encoding = 'utf-8'):
-        "Write IEEE block"
+    @_transaction
+    def _write_ieee_block(self, data, prefix = None, encoding = 'utf-8', chunk_size = 1048576):
+        """Write IEEE block
+        
+        data can be any buffer protocol object, such as bytes, bytearray,
+        memoryview or a numpy array.  Interfaces that implement writev get the
+        prefix and header and the payload in chunks of chunk_size bytes
+        without any copy; other interfaces get one joined message.
+        """
         # IEEE block binary data is prefixed with #lnnnnnnnn
         # where l is length of n and n is the
         # length of the data
-        # ex: #800002000 prefixes 2000 data bytes
+        # ex: #42000 prefixes 2000 data bytes
         
-        block = b''
+        head = b''
         
         if type(prefix) == str:
-            block = prefix.encode(encoding)
+            head = prefix.encode(encoding)
         elif type(prefix) == bytes:
-            block = prefix
+            head = prefix
         
-        block = block + build_ieee_block(data)
+        view = byte_view(data)
+        head += ieee_block_header(len(view))
+        
+        writev = None
+        if self._initialized and not self._driver_operation_simulate:
+            writev = getattr(self._interface, 'writev', None)
+        
+        if writev is None:
+            self._write_raw(b''.join((head, view)))
+            return
         
-        self._write_raw(block)
+        if self._batch:
+            self._flush_batch()
+        parts = [head]
+        for k in range(0, len(view), chunk_size):
+            parts.append(view[k:k+chunk_size])
+        writev(parts)
     
     def doc(self, obj=None, itm=None, docs=None, prefix=None):
         """Python IVI documentation generator"""
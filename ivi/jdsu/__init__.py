@@ -24,7 +24,8 @@ THE SOFTWARE.
 
 """
 
-# Optical Grating Filters
-from .jdsuTB9 import jdsuTB9
-
+from .. import registry
 
+registry.lazy_package(__name__, [
+        # Optical Grating Filters
+        ('jdsuTB9', ())])
@@ -33,6 +33,7 @@ class jdsuTB9(ivi.Driver):
         self.__dict__.setdefault('_instrument_id', 'TB9')
 
         super(jdsuTB9, self).__init__(*args, **kwargs)
+        self._batch_supported = False
 
         self._identity_description = "JDS Uniphase TB9 Series Optical Grating Filter driver"
         self._identity_identifier = ""
@@ -131,9 +132,6 @@ class jdsuTB9(ivi.Driver):
                 error_code = 0
         return (error_code, error_message)
 
-    def _utility_lock_object(self):
-        pass
-
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("RST")
@@ -152,9 +150,6 @@ class jdsuTB9(ivi.Driver):
                 message = "Self test failed"
         return (code, message)
 
-    def _utility_unlock_object(self):
-        pass
-
 
 
     def _get_wavelength(self):
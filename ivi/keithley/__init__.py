@@ -25,11 +25,14 @@ THE SOFTWARE.
 
 """
 
-# Source measure units
-from .keithley236 import keithley236
-from .keithley236 import keithley237
-
-# Digital multimeters
-from .keithley199 import keithley199
-from .keithley2000 import keithley2000
-from .keithley192 import keithley192
+from .. import registry
+
+registry.lazy_package(__name__, [
+        # Source measure units
+        ('keithley236', ('dcpwr',)),
+        ('keithley237', ('dcpwr',), 'keithley236'),
+
+        # Digital multimeters
+        ('keithley199', ('dmm',)),
+        ('keithley2000', ('dmm', 'swtch')),
+        ('keithley192', ('dmm',))])
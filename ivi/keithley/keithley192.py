@@ -113,6 +113,7 @@ class keithley192(ivi.Driver, dmm.Base, dmm.MultiPoint, dmm.SoftwareTrigger,
         self.__dict__.setdefault('_instrument_id', '192')
 
         super(keithley192, self).__init__(*args, **kwargs)
+        self._batch_supported = False
 
         self._identity_description = "Keithley model 192 programmable DMM"
         self._identity_identifier = ""
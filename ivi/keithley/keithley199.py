@@ -129,6 +129,7 @@ class keithley199(ivi.Driver, dmm.Base, dmm.MultiPoint, dmm.SoftwareTrigger):
         self.__dict__.setdefault('_instrument_id', '199')
 
         super(keithley199, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         self._identity_description = "Keithley model 199 programmable DMM"
         self._identity_identifier = "199"
         self._identity_revision = ""
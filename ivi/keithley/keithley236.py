@@ -44,6 +44,7 @@ class keithley236(dcpwr.Base, dcpwr.Measurement, ivi.Driver):
     def __init__(self, *args, **kwargs):
         self.__dict__.setdefault('_instrument_id', '236')
         super(keithley236, self).__init__(*args, **kwargs)
+        self._batch_supported = False
 
         self._add_property('outputs[].mode',
                 self._get_output_mode,
@@ -136,12 +137,6 @@ class keithley236(dcpwr.Base, dcpwr.Measurement, ivi.Driver):
     def _utility_disable(self):
         pass
 
-    def _utility_lock_object(self):
-        pass
-
-    def _utility_unlock_object(self):
-        pass
-
     def _init_outputs(self):
         try:
             super(keithley236, self)._init_outputs()
@@ -24,14 +24,17 @@ THE SOFTWARE.
 
 """
 
-# Oscilloscopes
-# WaveRunner Xi-A / MXi-A Oscilloscopes
-from .lecroyWR204MXIA import lecroyWR204MXIA
-from .lecroyWR204XIA import lecroyWR204XIA
-from .lecroyWR104MXIA import lecroyWR104MXIA
-from .lecroyWR104XIA import lecroyWR104XIA
-from .lecroyWR64MXIA import lecroyWR64MXIA
-from .lecroyWR64XIA import lecroyWR64XIA
-from .lecroyWR62XIA import lecroyWR62XIA
-from .lecroyWR44MXIA import lecroyWR44MXIA
-from .lecroyWR44XIA import lecroyWR44XIA
+from .. import registry
+
+registry.lazy_package(__name__, [
+        # Oscilloscopes
+        # WaveRunner Xi-A / MXi-A Oscilloscopes
+        ('lecroyWR204MXIA', ('scope',)),
+        ('lecroyWR204XIA', ('scope',)),
+        ('lecroyWR104MXIA', ('scope',)),
+        ('lecroyWR104XIA', ('scope',)),
+        ('lecroyWR64MXIA', ('scope',)),
+        ('lecroyWR64XIA', ('scope',)),
+        ('lecroyWR62XIA', ('scope',)),
+        ('lecroyWR44MXIA', ('scope',)),
+        ('lecroyWR44XIA', ('scope',))])
@@ -148,6 +148,33 @@ TimebaseReferenceMapping = {
     'center': 'cent',
     'right': 'righ'}
 
+# WAVEDESC fields used for waveform transfers, as (name, struct format, offset)
+WaveDescFields = [
+    ('comm_type', 'h', 32),
+    ('wave_descriptor', 'l', 36),
+    ('user_text', 'l', 40),
+    ('trigtime_array', 'l', 48),
+    ('ris_time_array', 'l', 52),
+    ('wave_array_1', 'l', 60),
+    ('wave_array_count', 'l', 116),
+    ('vertical_gain', 'f', 156),
+    ('vertical_offset', 'f', 160),
+    ('horiz_interval', 'f', 176),
+    ('horiz_offset', 'd', 180)]
+
+
+def decode_wavedesc(data):
+    "Decode the fields of a binary WAVEDESC block that are needed to scale a waveform"
+    if data[0:8] != b'WAVEDESC':
+        raise ivi.UnexpectedResponseException()
+    # COMM_ORDER is 0 for HIFIRST, 1 for LOFIRST
+    order = '<' if data[34:36] == b'\x01\x00' else '>'
+    desc = dict()
+    for name, fmt, offset in WaveDescFields:
+        desc[name] = struct.unpack_from(order + fmt, data, offset)[0]
+    desc['byte_order'] = order
+    return desc
+
 
 class lecroyBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.common.Reset,
                        scpi.common.SelfTest, scpi.common.Memory,
@@ -513,9 +540,6 @@ class lecroyBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.commo
             error_message = error_message.strip(' "')
         return (error_code, error_message)
 
-    def _utility_lock_object(self):
-        pass
-
     # TODO: test utility reset
     def _utility_reset(self):
         if not self._driver_operation_simulate:
@@ -538,9 +562,6 @@ class lecroyBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.commo
                 message = "Self test failed"
         return (code, message)
 
-    def _utility_unlock_object(self):
-        pass
-
     def _init_channels(self):
         try:
             super(lecroyBaseScope, self)._init_channels()
@@ -1405,73 +1426,59 @@ class lecroyBaseScope(scpi.common.IdnCommand, scpi.common.ErrorQuery, scpi.commo
     # def _set_trigger_ac_line_slope(self, value):
     #     self._set_trigger_edge_slope(value)
 
-    # Modified for LeCroy, WORKING ON WR104XI-A
-    def _measurement_fetch_waveform(self, index):
-        index = ivi.get_index(self._channel_name, index)
-
-        if self._driver_operation_simulate:
-            return list()
-
-        # Send the MSB first
-        # old - self._write(":waveform:byteorder msbfirst")
-        self._write("COMM_ORDER HI")
-        self._write("COMM_FORMAT DEF9,WORD,BIN")
-
-        # Read wave description and split up parts into variables
-        pre = self._ask("%s:INSPECT? WAVEDESC" % self._channel_name[index]).split("\r\n")
+    def _decode_waveform(self, raw_data):
+        "Create a trace from the response to WAVEFORM? ALL"
+        desc = decode_wavedesc(raw_data)
 
+        # Verify that the data is in 'word' format
+        if desc['comm_type'] != 1:
+            raise ivi.UnexpectedResponseException()
 
-        # Replace following with a more simple solution, make it < Python 2.7 compatible
-        temp = []
-        for item in pre:
-            temp.append(item.split(':'))
+        offset = desc['wave_descriptor'] + desc['user_text'] + \
+                desc['trigtime_array'] + desc['ris_time_array']
+        points = desc['wave_array_1'] // 2
 
-        # Dict comprehension, python 2.7+
-        #mydict = {t[0].strip(): ["".join(elem.strip()) for elem in t[1:]] for t in temp}
-        #format = str(mydict["COMM_TYPE"][0])
-        #points = int(mydict["PNTS_PER_SCREEN"][0])
-        #xincrement = float(mydict["HORIZ_INTERVAL"][0])
-        #xorigin = float(mydict["HORIZ_OFFSET"][0])
-        #yincrement = float(mydict["VERTICAL_GAIN"][0])
-        #yorigin = float(mydict["VERTICAL_OFFSET"][0])
+        trace = ivi.TraceYT()
 
-        # Dict with lost comprehension, python 2.6+
-        mydict = dict([(d[0].strip(), "".join(d[1:]).strip()) for d in temp])
+        trace.x_increment = desc['horiz_interval']
+        trace.x_origin = desc['horiz_offset']
+        trace.x_reference = 0
+        trace.y_increment = desc['vertical_gain']
+        trace.y_origin = -desc['vertical_offset']
+        trace.y_reference = 0
+        trace.y_hole = 0
 
-        format = str(mydict["COMM_TYPE"])
-        points = int(mydict["PNTS_PER_SCREEN"])
-        xincrement = float(mydict["HORIZ_INTERVAL"])
-        xorigin = float(mydict["HORIZ_OFFSET"])
-        yincrement = float(mydict["VERTICAL_GAIN"])
-        yorigin = float(mydict["VERTICAL_OFFSET"])
+        trace.y_raw = ivi.sample_view(raw_data, desc['byte_order'] + 'i2', points, offset)
 
-        # Verify that the data is in 'word' format
-        if format.lower() != "word":
-            raise ivi.UnexpectedResponseException()
-
-        # Read waveform data
-        self._write("%s:WAVEFORM? DAT1" % self._channel_name[index])
-        raw_data = raw_data = self._read_ieee_block()
-
-        # Split out points and convert to time and voltage pairs
-        data = list()
-        for i in range(points):
-            x = (i * xincrement) + xorigin
+        return trace
 
-            yval = struct.unpack(">H", raw_data[i * 2:i * 2 + 2])[0]
+    def _measurement_fetch_waveform(self, index):
+        index = ivi.get_index(self._channel_name, index)
 
-            if yval > 32767:
-                yval = yval - (2 ** 16)
+        if self._driver_operation_simulate:
+            return ivi.TraceYT()
 
-            if yval == 0:
-                # hole value
-                y = float('nan')
-            else:
-                y = (yincrement * yval) - yorigin
+        self._write("COMM_ORDER HI")
+        self._write("COMM_FORMAT DEF9,WORD,BIN")
 
-            data.append((x, y))
+        # Read the descriptor and the data array in one block
+        self._write("%s:WAVEFORM? ALL" % self._channel_name[index])
+        return self._decode_waveform(self._read_ieee_block())
 
-        return data
+    def _measurement_fetch_waveform_list(self, indices):
+        if self._driver_operation_simulate:
+            return [ivi.TraceYT() for index in indices]
+
+        # The transfer format is set once for all channels
+        with self.batch():
+            self._write("COMM_ORDER HI")
+            self._write("COMM_FORMAT DEF9,WORD,BIN")
+
+        traces = list()
+        for index in indices:
+            self._write("%s:WAVEFORM? ALL" % self._channel_name[index])
+            traces.append(self._decode_waveform(self._read_ieee_block()))
+        return traces
 
     def _measurement_read_waveform(self, index, maximum_time):
         return self._measurement_fetch_waveform(index)
@@ -0,0 +1,88 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import numpy as np
+import struct
+import unittest
+
+from ... import ivi
+from ...test.support import RecordingInterface
+from .. import lecroyBaseScope
+from .. import lecroyWR104XIA
+
+def make_waveform(order):
+    "Build a WAVEFORM? ALL response with a user text and trigger time array"
+    desc = bytearray(346)
+    desc[0:8] = b'WAVEDESC'
+    struct.pack_into(order + 'hh', desc, 32, 1, 1 if order == '<' else 0)
+    struct.pack_into(order + 'lll', desc, 36, 346, 20, 0)
+    struct.pack_into(order + 'll', desc, 48, 16, 0)
+    struct.pack_into(order + 'l', desc, 60, 8)
+    struct.pack_into(order + 'l', desc, 116, 4)
+    struct.pack_into(order + 'ff', desc, 156, 0.5, 1.0)
+    struct.pack_into(order + 'fd', desc, 176, 1e-3, -2e-3)
+    return (bytes(desc) + b'u' * 20 + b't' * 16 +
+        np.array([-2, 0, 2, 4], dtype=order + 'i2').tobytes())
+
+class TestWaveDesc(unittest.TestCase):
+
+    def check(self, order):
+        data = make_waveform(order)
+        desc = lecroyBaseScope.decode_wavedesc(data)
+        self.assertEqual(desc['byte_order'], order)
+        self.assertEqual(desc['comm_type'], 1)
+        self.assertEqual(desc['wave_descriptor'], 346)
+        self.assertEqual(desc['user_text'], 20)
+        self.assertEqual(desc['trigtime_array'], 16)
+        self.assertEqual(desc['ris_time_array'], 0)
+        self.assertEqual(desc['wave_array_1'], 8)
+        self.assertEqual(desc['wave_array_count'], 4)
+        self.assertEqual(desc['vertical_gain'], 0.5)
+        self.assertEqual(desc['vertical_offset'], 1.0)
+        self.assertAlmostEqual(desc['horiz_interval'], 1e-3)
+        self.assertEqual(desc['horiz_offset'], -2e-3)
+
+        # the samples follow the descriptor, user text and trigger times
+        trace = lecroyWR104XIA(RecordingInterface())._decode_waveform(data)
+        self.assertEqual(trace.y_raw.tolist(), [-2, 0, 2, 4])
+        # 0 is the hole value
+        self.assertTrue(np.isnan(trace.y[1]))
+        self.assertEqual(trace.y[[0, 2, 3]].tolist(), [-2.0, 0.0, 1.0])
+        self.assertTrue(np.allclose(trace.x, [-2e-3, -1e-3, 0, 1e-3]))
+
+    def test_lofirst(self):
+        self.check('<')
+
+    def test_hifirst(self):
+        self.check('>')
+
+    def test_not_wavedesc(self):
+        self.assertRaises(ivi.UnexpectedResponseException,
+            lecroyBaseScope.decode_wavedesc, b'#9000000346' + make_waveform('<'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,8 @@ THE SOFTWARE.
 
 """
 
-# Digital multimeters
-from .philipsPM2534 import philipsPM2534
+from .. import registry
 
+registry.lazy_package(__name__, [
+        # Digital multimeters
+        ('philipsPM2534', ('dmm',))])
@@ -103,6 +103,7 @@ class philipsPM2534(ivi.Driver, dmm.Base, dmm.DeviceInfo):
         self.__dict__.setdefault('_instrument_id', 'PM2534')
 
         super(philipsPM2534, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         self._identity_description = "Philips PM2534 System Multimeter"
         self._identity_identifier = "PM2534"
         self._identity_revision = ""
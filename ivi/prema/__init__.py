@@ -24,5 +24,8 @@ THE SOFTWARE.
 
 """
 
-# Digital multimeters
-from .prema6031A import prema6031A
+from .. import registry
+
+registry.lazy_package(__name__, [
+        # Digital multimeters
+        ('prema6031A', ('dmm',))])
@@ -121,6 +121,7 @@ class prema6031A(ivi.Driver, dmm.Base, dmm.DeviceInfo):
         self.__dict__.setdefault('_instrument_id', '6031A')
 
         super(prema6031A, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         self._identity_description = "Prema 6031A integrating digital multimeter"
         self._identity_identifier = "6031A"
         self._identity_revision = ""
@@ -0,0 +1,188 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2012-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+import collections
+import fnmatch
+import importlib
+import sys
+import types
+
+# vendor -> ordered dict of driver class name -> DriverInfo
+_index = collections.OrderedDict()
+
+class DriverInfo(collections.namedtuple('DriverInfo',
+        ['vendor', 'name', 'model', 'module', 'classes'])):
+    "Description of a driver class that is imported on first use"
+    __slots__ = ()
+
+    @property
+    def path(self):
+        "Fully qualified module name of the driver"
+        return 'ivi.%s.%s' % (self.vendor, self.module)
+
+    def load(self):
+        "Import the driver and return the driver class"
+        return getattr(importlib.import_module('ivi.' + self.vendor), self.name)
+
+
+def _bind_drivers(g, name, index):
+    # importing a driver module binds it, and any sibling driver modules it
+    # imports, as attributes of the package; replace those with the classes
+    for info in index.values():
+        module = sys.modules.get(name + '.' + info.module)
+        if module is not None:
+            cls = getattr(module, info.name, None)
+            if cls is not None:
+                g[info.name] = cls
+
+
+class _DriverPackage(types.ModuleType):
+    "Vendor package that keeps driver classes bound over their modules"
+
+    def __setattr__(self, attr, value):
+        # the import system binds a submodule to its package after running it,
+        # so 'import ivi.vendor.driver' would otherwise shadow the class
+        super(_DriverPackage, self).__setattr__(attr, value)
+        if isinstance(value, types.ModuleType):
+            index = _index.get(self.__name__.rpartition('.')[2])
+            if index is not None:
+                _bind_drivers(self.__dict__, self.__name__, index)
+
+
+def lazy_package(name, drivers):
+    """Register the drivers of a vendor package
+
+    drivers is a list of (class name, IVI classes) tuples, with an optional
+    third element naming the module when it differs from the class name.
+    The driver modules are only imported when the class is first accessed
+    as an attribute of the package.
+    """
+    g = sys.modules[name].__dict__
+    vendor = name.rpartition('.')[2]
+    index = collections.OrderedDict()
+    for entry in drivers:
+        cls, classes = entry[0], tuple(entry[1])
+        module = entry[2] if len(entry) > 2 else cls
+        model = cls[len(vendor):] if cls.startswith(vendor) else cls
+        index[cls] = DriverInfo(vendor, cls, model, module, classes)
+    _index[vendor] = index
+    g['__all__'] = list(index)
+    if sys.version_info >= (3, 5):
+        sys.modules[name].__class__ = _DriverPackage
+
+    if sys.version_info < (3, 7):
+        # no module level __getattr__, import everything up front
+        for info in index.values():
+            importlib.import_module('.' + info.module, name)
+        _bind_drivers(g, name, index)
+        return
+
+    def __getattr__(attr):
+        info = index.get(attr)
+        if info is None:
+            raise AttributeError("module %r has no attribute %r" % (name, attr))
+        importlib.import_module('.' + info.module, name)
+        _bind_drivers(g, name, index)
+        return g[attr]
+
+    def __dir__():
+        return sorted(set(g) | set(index))
+
+    g['__getattr__'] = __getattr__
+    g['__dir__'] = __dir__
+
+
+def lazy_modules(name, modules):
+    "Import the listed submodules of a package when they are first accessed"
+    g = sys.modules[name].__dict__
+
+    if sys.version_info < (3, 7):
+        for m in modules:
+            importlib.import_module('.' + m, name)
+        return
+
+    modules = frozenset(modules)
+
+    def __getattr__(attr):
+        if attr not in modules:
+            raise AttributeError("module %r has no attribute %r" % (name, attr))
+        return importlib.import_module('.' + attr, name)
+
+    def __dir__():
+        return sorted(set(g) | modules)
+
+    g['__getattr__'] = __getattr__
+    g['__dir__'] = __dir__
+
+
+def _load_index():
+    from . import _vendors
+    for vendor in _vendors:
+        if vendor not in _index:
+            importlib.import_module('.' + vendor, __package__)
+    return _index
+
+
+def get_vendors():
+    "Returns the names of all vendor driver packages"
+    from . import _vendors
+    return list(_vendors)
+
+
+def get_drivers(ivi_class=None, vendor=None, model=None):
+    """Returns a list of DriverInfo for the drivers matching all of the given
+    criteria, without importing any driver modules
+
+    ivi_class is an IVI class name such as 'scope' or 'dcpwr'.  vendor is a
+    vendor package name.  model is matched case-insensitively against the
+    model name (e.g. 'MSO7104A') and the driver class name, and may contain
+    shell-style wildcards ('MSO7*').
+    """
+    index = _load_index()
+    if model is not None:
+        model = model.lower()
+    l = []
+    for v in index:
+        if vendor is not None and v != vendor:
+            continue
+        for info in index[v].values():
+            if ivi_class is not None and ivi_class not in info.classes:
+                continue
+            if model is not None and not (
+                    fnmatch.fnmatchcase(info.model.lower(), model) or
+                    fnmatch.fnmatchcase(info.name.lower(), model)):
+                continue
+            l.append(info)
+    return l
+
+
+def find_driver(model, vendor=None):
+    "Returns the driver class for a model, importing only that driver"
+    l = get_drivers(vendor=vendor, model=model)
+    if not l:
+        raise KeyError("no driver found for model %r" % model)
+    return l[0].load()
+
@@ -352,6 +352,20 @@ class Base(ivi.IviContainer):
                         
                         any(any(math.isnan(b) for b in a) for a in waveform)
                         """, cls, grp, '4.3.16'))
+        self._add_method('measurement.fetch_waveforms',
+                        self._measurement_fetch_waveforms,
+                        ivi.Doc("""
+                        This function returns the waveforms of several channels from a previously
+                        initiated acquisition, like calling Fetch Waveform on each channel.
+                        
+                        channels is a list of channel names or indices.  If it is not specified,
+                        the waveforms of all enabled analog channels are returned.
+                        
+                        The return value is a dict of traces keyed by channel name.  Traces with
+                        the same record length and time scaling share one time axis array.
+                        Drivers fetch the channels with as few instrument transactions as
+                        possible, using a multi-source transfer where the instrument has one.
+                        """))
         self._add_property('measurement.status',
                         self._get_measurement_status,
                         None,
@@ -754,6 +768,28 @@ class Base(ivi.IviContainer):
     def _measurement_read_waveform(self, index, maximum_time):
         return self._measurement_fetch_waveform(index)
     
+    def _measurement_fetch_waveforms(self, channels=None):
+        if channels is None:
+            # analog channels come first in the channel list
+            count = getattr(self, '_analog_channel_count', self._channel_count)
+            channels = [i for i in range(count) if self._get_channel_enabled(i)]
+        indices = [ivi.get_index(self._channel_name, c) for c in channels]
+        traces = self._measurement_fetch_waveform_list(indices)
+        # share one x array between traces with the same length and x scaling
+        shared = dict()
+        for trace in traces:
+            if not isinstance(trace, ivi.TraceYT):
+                continue
+            key = (len(trace), trace.x_increment, trace.x_origin, trace.x_reference)
+            if key in shared:
+                trace.share_x(shared[key])
+            else:
+                shared[key] = trace
+        return dict((self._channel_name[i], t) for i, t in zip(indices, traces))
+    
+    def _measurement_fetch_waveform_list(self, indices):
+        return [self._measurement_fetch_waveform(index) for index in indices]
+    
     def _measurement_initiate(self):
         pass
 
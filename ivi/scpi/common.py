@@ -91,7 +91,7 @@ class Reset(object):
         if not self._driver_operation_simulate:
             self._write("*RST")
             self._clear()
-            self.driver_operation.invalidate_all_attributes()
+            self._invalidate_cache_dependents()
 
     def _utility_reset_with_defaults(self):
         self._utility_reset()
@@ -140,7 +140,7 @@ class Memory(extra.common.Memory):
             raise OutOfRangeException()
         if not self._driver_operation_simulate:
             self._write("*rcl %d" % (index + self._memory_offset))
-            self.driver_operation.invalidate_all_attributes()
+            self._invalidate_cache_dependents()
 
 
 class SystemSetup(extra.common.SystemSetup):
@@ -160,4 +160,4 @@ class SystemSetup(extra.common.SystemSetup):
         
         self._write_raw(data)
         
-        self.driver_operation.invalidate_all_attributes()
+        self._invalidate_cache_dependents()
@@ -109,13 +109,23 @@ class Base(common.IdnCommand, common.ErrorQuery, common.Reset, common.SelfTest,
             return '1'
         return '0'
 
-    def _utility_disable(self):
-        pass
-
-    def _utility_lock_object(self):
-        pass
+    def _get_batch_queries(self):
+        true = self._get_bool_str(True)
+        queries = super(Base, self)._get_batch_queries()
+        for i in range(self._output_count):
+            if self._output_count > 1:
+                queries.append("instrument:nselect %d" % (i+1))
+            queries.extend([
+                ("source:current:level?", float, 'output_current_limit', i),
+                ("source:current:protection:state?", lambda s: 'trip' if s == true else 'regulate',
+                    'output_current_limit_behavior', i),
+                ("output?", lambda s: s == true, 'output_enabled', i),
+                ("source:voltage:protection:state?", lambda s: s == true, 'output_ovp_enabled', i),
+                ("source:voltage:protection:level?", float, 'output_ovp_limit', i),
+                ("source:voltage:level?", float, 'output_voltage_level', i)])
+        return queries
 
-    def _utility_unlock_object(self):
+    def _utility_disable(self):
         pass
 
     def _init_outputs(self):
@@ -128,12 +128,6 @@ class Base(common.IdnCommand, common.ErrorQuery, common.Reset, common.SelfTest,
     def _utility_disable(self):
         pass
     
-    def _utility_lock_object(self):
-        pass
-    
-    def _utility_unlock_object(self):
-        pass
-    
     def _get_measurement_function(self):
         if not self._driver_operation_simulate and not self._get_cache_valid():
             value = self._ask(":sense:function?").lower().strip('"')
@@ -24,65 +24,68 @@ THE SOFTWARE.
 
 """
 
-# Oscilloscopes
-# DPO4000
-from .tektronixDPO4032 import tektronixDPO4032
-from .tektronixDPO4034 import tektronixDPO4034
-from .tektronixDPO4054 import tektronixDPO4054
-from .tektronixDPO4104 import tektronixDPO4104
-# MSO4000
-from .tektronixMSO4032 import tektronixMSO4032
-from .tektronixMSO4034 import tektronixMSO4034
-from .tektronixMSO4054 import tektronixMSO4054
-from .tektronixMSO4104 import tektronixMSO4104
-# DPO4000B
-from .tektronixDPO4014B import tektronixDPO4014B
-from .tektronixDPO4034B import tektronixDPO4034B
-from .tektronixDPO4054B import tektronixDPO4054B
-from .tektronixDPO4102B import tektronixDPO4102B
-from .tektronixDPO4104B import tektronixDPO4104B
-# MSO4000B
-from .tektronixMSO4014B import tektronixMSO4014B
-from .tektronixMSO4034B import tektronixMSO4034B
-from .tektronixMSO4054B import tektronixMSO4054B
-from .tektronixMSO4102B import tektronixMSO4102B
-from .tektronixMSO4104B import tektronixMSO4104B
-# MDO4000
-from .tektronixMDO4054 import tektronixMDO4054
-from .tektronixMDO4104 import tektronixMDO4104
-# MDO4000B
-from .tektronixMDO4014B import tektronixMDO4014B
-from .tektronixMDO4034B import tektronixMDO4034B
-from .tektronixMDO4054B import tektronixMDO4054B
-from .tektronixMDO4104B import tektronixMDO4104B
-# MDO3000
-from .tektronixMDO3012 import tektronixMDO3012
-from .tektronixMDO3014 import tektronixMDO3014
-from .tektronixMDO3022 import tektronixMDO3022
-from .tektronixMDO3024 import tektronixMDO3024
-from .tektronixMDO3032 import tektronixMDO3032
-from .tektronixMDO3034 import tektronixMDO3034
-from .tektronixMDO3052 import tektronixMDO3052
-from .tektronixMDO3054 import tektronixMDO3054
-from .tektronixMDO3102 import tektronixMDO3102
-from .tektronixMDO3104 import tektronixMDO3104
+from .. import registry
 
-# Function Generators
-from .tektronixAWG2005 import tektronixAWG2005
-from .tektronixAWG2020 import tektronixAWG2020
-from .tektronixAWG2021 import tektronixAWG2021
-from .tektronixAWG2040 import tektronixAWG2040
-from .tektronixAWG2041 import tektronixAWG2041
+registry.lazy_package(__name__, [
+        # Oscilloscopes
+        # DPO4000
+        ('tektronixDPO4032', ('scope',)),
+        ('tektronixDPO4034', ('scope',)),
+        ('tektronixDPO4054', ('scope',)),
+        ('tektronixDPO4104', ('scope',)),
+        # MSO4000
+        ('tektronixMSO4032', ('scope',)),
+        ('tektronixMSO4034', ('scope',)),
+        ('tektronixMSO4054', ('scope',)),
+        ('tektronixMSO4104', ('scope',)),
+        # DPO4000B
+        ('tektronixDPO4014B', ('scope',)),
+        ('tektronixDPO4034B', ('scope',)),
+        ('tektronixDPO4054B', ('scope',)),
+        ('tektronixDPO4102B', ('scope',)),
+        ('tektronixDPO4104B', ('scope',)),
+        # MSO4000B
+        ('tektronixMSO4014B', ('scope',)),
+        ('tektronixMSO4034B', ('scope',)),
+        ('tektronixMSO4054B', ('scope',)),
+        ('tektronixMSO4102B', ('scope',)),
+        ('tektronixMSO4104B', ('scope',)),
+        # MDO4000
+        ('tektronixMDO4054', ('scope',)),
+        ('tektronixMDO4104', ('scope',)),
+        # MDO4000B
+        ('tektronixMDO4014B', ('scope',)),
+        ('tektronixMDO4034B', ('scope',)),
+        ('tektronixMDO4054B', ('scope',)),
+        ('tektronixMDO4104B', ('scope',)),
+        # MDO3000
+        ('tektronixMDO3012', ('scope', 'fgen')),
+        ('tektronixMDO3014', ('scope', 'fgen')),
+        ('tektronixMDO3022', ('scope', 'fgen')),
+        ('tektronixMDO3024', ('scope', 'fgen')),
+        ('tektronixMDO3032', ('scope', 'fgen')),
+        ('tektronixMDO3034', ('scope', 'fgen')),
+        ('tektronixMDO3052', ('scope', 'fgen')),
+        ('tektronixMDO3054', ('scope', 'fgen')),
+        ('tektronixMDO3102', ('scope', 'fgen')),
+        ('tektronixMDO3104', ('scope', 'fgen')),
 
-# Power Supplies
-from .tektronixPS2520G import tektronixPS2520G
-from .tektronixPS2521G import tektronixPS2521G
+        # Function Generators
+        ('tektronixAWG2005', ('fgen',)),
+        ('tektronixAWG2020', ('fgen',)),
+        ('tektronixAWG2021', ('fgen',)),
+        ('tektronixAWG2040', ('fgen',)),
+        ('tektronixAWG2041', ('fgen',)),
 
-# Optical attenuators
-from .tektronixOA5002 import tektronixOA5002
-from .tektronixOA5012 import tektronixOA5012
-from .tektronixOA5022 import tektronixOA5022
-from .tektronixOA5032 import tektronixOA5032
+        # Power Supplies
+        ('tektronixPS2520G', ('dcpwr',)),
+        ('tektronixPS2521G', ('dcpwr',)),
 
-# Current probe amplifiers
-from .tektronixAM5030 import tektronixAM5030
+        # Optical attenuators
+        ('tektronixOA5002', ()),
+        ('tektronixOA5012', ()),
+        ('tektronixOA5022', ()),
+        ('tektronixOA5032', ()),
+
+        # Current probe amplifiers
+        ('tektronixAM5030', ())])
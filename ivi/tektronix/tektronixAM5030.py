@@ -36,6 +36,7 @@ class tektronixAM5030(ivi.Driver):
         self.__dict__.setdefault('_instrument_id', 'AM5030')
 
         super(tektronixAM5030, self).__init__(*args, **kwargs)
+        self._batch_supported = False
 
         self._identity_description = "Tektronix AM5030 current probe amplifier driver"
         self._identity_identifier = ""
@@ -210,9 +211,6 @@ class tektronixAM5030(ivi.Driver):
                 error_code = 0
         return (error_code, error_message)
 
-    def _utility_lock_object(self):
-        pass
-
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("init")
@@ -231,9 +229,6 @@ class tektronixAM5030(ivi.Driver):
                 message = "Self test failed"
         return (code, message)
 
-    def _utility_unlock_object(self):
-        pass
-
 
 
     def _get_amps(self):
@@ -151,9 +151,6 @@ class tektronixAWG2000(ivi.Driver, fgen.Base, fgen.StdFunc, fgen.ArbWfm,
             error_message = error_message.strip(' "')
         return (error_code, error_message)
     
-    def _utility_lock_object(self):
-        pass
-    
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("*RST")
@@ -174,9 +171,6 @@ class tektronixAWG2000(ivi.Driver, fgen.Base, fgen.StdFunc, fgen.ArbWfm,
                 message = "Self test failed"
         return (code, message)
     
-    def _utility_unlock_object(self):
-        pass
-    
     
     
     def _init_outputs(self):
@@ -493,16 +487,17 @@ class tektronixAWG2000(ivi.Driver, fgen.Base, fgen.StdFunc, fgen.ArbWfm,
             self._arbitrary_waveform_n += 1
             handle = "w%04d.wfm" % self._arbitrary_waveform_n
             have_handle = handle not in self._catalog_names
-        self._write(":data:destination \"%s\"" % handle)
-        self._write(":wfmpre:bit_nr 12")
-        self._write(":wfmpre:bn_fmt rp")
-        self._write(":wfmpre:byt_nr 2")
-        self._write(":wfmpre:byt_or msb")
-        self._write(":wfmpre:encdg bin")
-        self._write(":wfmpre:pt_fmt y")
-        self._write(":wfmpre:yzero 0")
-        self._write(":wfmpre:ymult %e" % (2/(1<<12)))
-        self._write(":wfmpre:xincr %e" % xincr)
+        with self.batch():
+            self._write(":data:destination \"%s\"" % handle)
+            self._write(":wfmpre:bit_nr 12")
+            self._write(":wfmpre:bn_fmt rp")
+            self._write(":wfmpre:byt_nr 2")
+            self._write(":wfmpre:byt_or msb")
+            self._write(":wfmpre:encdg bin")
+            self._write(":wfmpre:pt_fmt y")
+            self._write(":wfmpre:yzero 0")
+            self._write(":wfmpre:ymult %e" % (2/(1<<12)))
+            self._write(":wfmpre:xincr %e" % xincr)
         
         raw_data = b''
         
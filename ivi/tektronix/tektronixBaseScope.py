@@ -24,8 +24,6 @@ THE SOFTWARE.
 
 """
 
-import array
-import sys
 import time
 
 from .. import ivi
@@ -203,6 +201,9 @@ class tektronixBaseScope(scpi.common.IdnCommand, scpi.common.Reset, scpi.common.
 
         self._acquisition_segmented_count = 2
         self._acquisition_segmented_index = 1
+        self._waveform_settings = dict()
+        self._waveform_preamble = dict()
+        self._waveform_transfer = [('encdg', 'fastest'), ('width', '2'), ('start', '1'), ('stop', '1e10')]
         self._timebase_mode = 'main'
         self._timebase_reference = 'center'
         self._timebase_position = 0.0
@@ -366,6 +367,13 @@ class tektronixBaseScope(scpi.common.IdnCommand, scpi.common.Reset, scpi.common.
                         or an empty string to clear the advisory line.
                         """))
 
+        # auto setup may change any setting
+        self._set_cache_dependencies('measurement_auto_setup', '*')
+        # the waveform preamble follows the timebase, acquisition and channel setup
+        for name in dir(type(self)):
+            if name.startswith(('_set_timebase_', '_set_acquisition_', '_set_channel_')):
+                self._add_cache_dependencies(name, 'waveform_preamble')
+
         self._init_channels()
 
     def _initialize(self, resource = None, id_query = False, reset = False, **keywargs):
@@ -395,12 +403,6 @@ class tektronixBaseScope(scpi.common.IdnCommand, scpi.common.Reset, scpi.common.
     def _utility_disable(self):
         pass
 
-    def _utility_lock_object(self):
-        pass
-
-    def _utility_unlock_object(self):
-        pass
-
     def _init_channels(self):
         try:
             super(tektronixBaseScope, self)._init_channels()
@@ -1261,23 +1263,26 @@ class tektronixBaseScope(scpi.common.IdnCommand, scpi.common.Reset, scpi.common.
     def _set_trigger_ac_line_slope(self, value):
         self._set_trigger_edge_slope(value)
 
-    def _measurement_fetch_waveform(self, index):
-        index = ivi.get_index(self._channel_name, index)
-
-        if self._driver_operation_simulate:
-            return ivi.TraceYT()
-
-        self._write(":data:source %s" % self._channel_name[index])
-        self._write(":data:encdg fastest")
-        self._write(":data:width 2")
-        self._write(":data:start 1")
-        self._write(":data:stop 1e10")
+    def _write_waveform_setting(self, name, value):
+        "Send a :data transfer setting unless the instrument already has it"
+        tag = 'waveform_' + name
+        if self._get_cache_valid(tag) and self._waveform_settings.get(name) == value:
+            return
+        self._write(":data:%s %s" % (name, value))
+        self._waveform_settings[name] = value
+        self._set_cache_valid(True, tag)
+
+    def _get_waveform_preamble(self, index):
+        "Preamble of the current data source, which must be channel index"
+        if not self._get_cache_valid(index=index):
+            self._waveform_preamble[index] = self._ask(":wfmoutpre?").split(';')
+            self._set_cache_valid(index=index)
+        return self._waveform_preamble[index]
 
+    def _waveform_trace(self, pre):
+        "Create a trace scaled by preamble pre, returns the trace, the number of points and the sample dtype"
         trace = ivi.TraceYT()
 
-        # Read preamble
-        pre = self._ask(":wfmoutpre?").split(';')
-
         acq_format = pre[7].strip().upper()
         points = int(pre[6])
         point_size = int(pre[0])
@@ -1292,36 +1297,89 @@ class tektronixBaseScope(scpi.common.IdnCommand, scpi.common.Reset, scpi.common.
         trace.y_origin = float(pre[16])
 
         if acq_format != 'Y':
-            raise UnexpectedResponseException()
+            raise ivi.UnexpectedResponseException()
 
         if point_enc != 'BINARY':
-            raise UnexpectedResponseException()
+            raise ivi.UnexpectedResponseException()
 
-        # Read waveform data
-        raw_data = self._ask_for_ieee_block(":curve?")
-        self._read_raw() # flush buffer
-
-        # Store in trace object
         if point_fmt == 'RP' and point_size == 1:
-            trace.y_raw = array.array('B', raw_data[0:points*2])
+            dtype = 'u1'
         elif point_fmt == 'RP' and point_size == 2:
-            trace.y_raw = array.array('H', raw_data[0:points*2])
+            dtype = 'u2'
         elif point_fmt == 'RI' and point_size == 1:
-            trace.y_raw = array.array('b', raw_data[0:points*2])
+            dtype = 'i1'
         elif point_fmt == 'RI' and point_size == 2:
-            trace.y_raw = array.array('h', raw_data[0:points*2])
+            dtype = 'i2'
         elif point_fmt == 'FP' and point_size == 4:
             trace.y_increment = 1
             trace.y_reference = 0
             trace.y_origin = 0
-            trace.y_raw = array.array('f', raw_data[0:points*4])
+            dtype = 'f4'
         else:
-            raise UnexpectedResponseException()
+            raise ivi.UnexpectedResponseException()
+
+        dtype = ('<' if byte_order == 'LSB' else '>') + dtype
+        return trace, points, dtype
+
+    def _waveform_data_trace(self, index, trace, points, dtype, raw_data):
+        "Store the samples of raw_data in trace, re-reading the preamble if its record length is stale"
+        y_raw = ivi.sample_view(raw_data, dtype)
+        if len(y_raw) != points:
+            # the record length changed without a driver setter, e.g. on the
+            # front panel, so the cached preamble no longer describes the data
+            self._set_cache_valid(False, 'waveform_preamble', index)
+            self._write_waveform_setting('source', self._channel_name[index])
+            trace, points, dtype = self._waveform_trace(self._get_waveform_preamble(index))
+            y_raw = ivi.sample_view(raw_data, dtype)
+        trace.y_raw = y_raw[:points]
+        return trace
 
-        if (byte_order == 'LSB') != (sys.byteorder == 'little'):
-            trace.y_raw.byteswap()
+    def _measurement_fetch_waveform(self, index):
+        index = ivi.get_index(self._channel_name, index)
 
-        return trace
+        if self._driver_operation_simulate:
+            return ivi.TraceYT()
+
+        with self.batch():
+            self._write_waveform_setting('source', self._channel_name[index])
+            for name, value in self._waveform_transfer:
+                self._write_waveform_setting(name, value)
+
+        # Read preamble
+        trace, points, dtype = self._waveform_trace(self._get_waveform_preamble(index))
+
+        # Read waveform data
+        raw_data = self._ask_for_ieee_block(":curve?")
+        self._read_raw() # flush buffer
+
+        # Store in trace object
+        return self._waveform_data_trace(index, trace, points, dtype, raw_data)
+
+    def _measurement_fetch_waveform_list(self, indices):
+        if self._driver_operation_simulate:
+            return [ivi.TraceYT() for index in indices]
+
+        with self.batch():
+            for name, value in self._waveform_transfer:
+                self._write_waveform_setting(name, value)
+
+        # The preamble describes a single source.  Its fields are separated
+        # by ';', so the preambles cannot be read with one compound query.
+        traces = list()
+        for index in indices:
+            if not self._get_cache_valid('waveform_preamble', index):
+                self._write_waveform_setting('source', self._channel_name[index])
+            traces.append(self._waveform_trace(self._get_waveform_preamble(index)))
+
+        # With several sources, :curve? returns one block per source,
+        # separated by ';'
+        self._write_waveform_setting('source', ','.join(self._channel_name[index] for index in indices))
+        self._write(":curve?")
+        raw_data = [self._read_ieee_block() for index in indices]
+        self._read_raw() # flush buffer
+
+        return [self._waveform_data_trace(index, trace, points, dtype, data)
+                for index, (trace, points, dtype), data in zip(indices, traces, raw_data)]
 
     def _measurement_read_waveform(self, index, maximum_time):
         return self._measurement_fetch_waveform(index)
@@ -1468,4 +1526,5 @@ class tektronixBaseScope(scpi.common.IdnCommand, scpi.common.Reset, scpi.common.
     def _measurement_auto_setup(self):
         if not self._driver_operation_simulate:
             self._write(":autoset execute")
+            self._invalidate_cache_dependents()
 
@@ -33,6 +33,7 @@ class tektronixOA5000(ivi.Driver):
         self.__dict__.setdefault('_instrument_id', '')
         
         super(tektronixOA5000, self).__init__(*args, **kwargs)
+        self._batch_supported = False
         
         self._identity_description = "Tektronix OA5000 series optical attenuator driver"
         self._identity_identifier = ""
@@ -149,9 +150,6 @@ class tektronixOA5000(ivi.Driver):
                 error_code = 0
         return (error_code, error_message)
 
-    def _utility_lock_object(self):
-        pass
-
     def _utility_reset(self):
         if not self._driver_operation_simulate:
             self._write("*RST")
@@ -170,9 +168,6 @@ class tektronixOA5000(ivi.Driver):
                 message = "Self test failed"
         return (code, message)
 
-    def _utility_unlock_object(self):
-        pass
-
 
 
     def _get_attenuation(self):
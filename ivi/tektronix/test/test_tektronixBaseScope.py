@@ -0,0 +1,82 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import numpy as np
+import unittest
+
+from ...test.support import RecordingInterface
+from .. import tektronixDPO4104
+
+PREAMBLE = b'2;16;BINARY;RI;LSB;"Ch1, DC coupling";4;Y;"s";0;1.0E-3;0;0;"V";5.0E-1;0;0\n'
+BLOCK = b'#18' + np.arange(4, dtype='<i2').tobytes()
+
+class TestTektronixFetchWaveforms(unittest.TestCase):
+
+    def setUp(self):
+        self.instr = RecordingInterface()
+        self.driver = tektronixDPO4104(self.instr)
+        del self.instr.writes[:]
+
+    def test_channels(self):
+        pre2 = PREAMBLE.replace(b'5.0E-1', b'2', 1)
+        self.instr.data = PREAMBLE + pre2 + BLOCK + b';' + BLOCK + b'\n'
+        traces = self.driver.measurement.fetch_waveforms(['ch1', 'ch2'])
+        self.assertEqual(self.instr.writes[1:], [
+            b':data:source ch1', b':wfmoutpre?',
+            b':data:source ch2', b':wfmoutpre?',
+            b':data:source ch1,ch2', b':curve?'])
+        # both blocks and the final terminator are consumed
+        self.assertEqual(self.instr.data, b'')
+        self.assertEqual(sorted(traces), ['ch1', 'ch2'])
+        self.assertEqual(traces['ch1'].y.tolist(), [0.0, 0.5, 1.0, 1.5])
+        self.assertEqual(traces['ch2'].y.tolist(), [0.0, 2.0, 4.0, 6.0])
+        self.assertTrue(traces['ch2'].x is traces['ch1'].x)
+
+    def test_cached_preamble(self):
+        self.instr.data = PREAMBLE + PREAMBLE + BLOCK + b';' + BLOCK + b'\n'
+        self.driver.measurement.fetch_waveforms(['ch1', 'ch2'])
+        del self.instr.writes[:]
+        self.instr.data = BLOCK + b';' + BLOCK + b'\n'
+        self.driver.measurement.fetch_waveforms(['ch1', 'ch2'])
+        self.assertEqual(self.instr.writes, [b':curve?'])
+        self.assertEqual(self.instr.data, b'')
+
+    def test_record_length_changed(self):
+        self.instr.data = PREAMBLE + PREAMBLE + BLOCK + b';' + BLOCK + b'\n'
+        self.driver.measurement.fetch_waveforms(['ch1', 'ch2'])
+        del self.instr.writes[:]
+        # both blocks are read before the stale preamble of ch2 is replaced
+        block = b'#212' + np.arange(6, dtype='<i2').tobytes()
+        self.instr.data = BLOCK + b';' + block + b'\n' + PREAMBLE.replace(b';4;Y;', b';6;Y;')
+        traces = self.driver.measurement.fetch_waveforms(['ch1', 'ch2'])
+        self.assertEqual(self.instr.writes, [b':curve?', b':data:source ch2', b':wfmoutpre?'])
+        self.assertEqual(self.instr.data, b'')
+        self.assertEqual(traces['ch1'].y_raw.tolist(), [0, 1, 2, 3])
+        self.assertEqual(traces['ch2'].y_raw.tolist(), list(range(6)))
+
+if __name__ == '__main__':
+    unittest.main()
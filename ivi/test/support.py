@@ -0,0 +1,86 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+import importlib
+import sys
+import types
+
+def import_interface(name, *libraries):
+    """Import ivi.interface.<name> for tests that replace the instrument
+    library with a fake
+
+    Empty stand-in modules are used for the libraries that are not installed.
+    A module imported with stand-ins is not left in sys.modules, so opening
+    a resource still finds the library missing.
+    """
+    stubs = []
+    for lib in libraries:
+        try:
+            importlib.import_module(lib)
+        except ImportError:
+            sys.modules[lib] = types.ModuleType(lib)
+            stubs.append(lib)
+    path = 'ivi.interface.' + name
+    try:
+        return importlib.import_module(path)
+    finally:
+        if stubs:
+            for lib in stubs:
+                del sys.modules[lib]
+            sys.modules.pop(path, None)
+            package = sys.modules['ivi.interface']
+            if getattr(package, name, None) is not None:
+                delattr(package, name)
+
+class RecordingInterface(object):
+    """Interface that records writes and answers reads from queued responses
+
+    The queued responses are read as one byte stream, a read returns up to
+    num bytes or up to and including the next newline.  With nothing queued,
+    reads answer 1.
+    """
+
+    def __init__(self):
+        self.writes = []
+        self.data = b''
+
+    def respond(self, *responses):
+        "Queue responses for the following reads"
+        self.data += b''.join(responses)
+
+    def write_raw(self, data):
+        self.writes.append(data)
+
+    def read_raw(self, num=-1):
+        if not self.data:
+            return b'1\n'
+        if num < 0:
+            num = self.data.find(b'\n') + 1 or len(self.data)
+        data, self.data = self.data[:num], self.data[num:]
+        return data
+
+    def close(self):
+        pass
@@ -0,0 +1,121 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import asyncio
+import sys
+import unittest
+
+import ivi
+
+if sys.version_info >= (3, 7):
+    from ivi import aio
+
+def run(coro):
+    return asyncio.run(coro)
+
+@unittest.skipIf(sys.version_info < (3, 7), "requires Python 3.7")
+class TestAio(unittest.TestCase):
+
+    def test_simulated_instrument(self):
+        async def test():
+            sim = aio.SimulatedInstrument({':test:value?': '5'})
+            await sim.write_raw(b':a:b 1;:a:c 2\n')
+            self.assertEqual(sim.settings, {':a:b': '1', ':a:c': '2'})
+            self.assertEqual(await sim.ask_raw(b'a:b?;:a:c?;:test:value?'), b'1;2;5\n')
+            self.assertEqual(await sim.ask_raw(b':a:d?'), b'0\n')
+        run(test())
+
+    def test_driver(self):
+        async def test():
+            sim = aio.SimulatedInstrument()
+            scope = await aio.open(ivi.agilent.agilentDSO7104A, sim)
+            self.assertEqual(len(scope.channels), 4)
+            await scope.channels[1].set('offset', 0.5)
+            self.assertEqual(sim.settings[':channel2:offset'], '5.000000e-01')
+            self.assertEqual(await scope.channels[1].offset, 0.5)
+            self.assertEqual(await scope.identity.instrument_model, 'Simulated instrument')
+            self.assertEqual(await scope.ask(':channel2:offset?'), '5.000000e-01')
+            with self.assertRaises(AttributeError):
+                scope.channels[0].offset = 1
+            await scope.close()
+        run(test())
+
+    def test_concurrent(self):
+        async def test():
+            sims = [aio.SimulatedInstrument() for k in range(4)]
+            scopes = await asyncio.gather(*[aio.open(ivi.agilent.agilentDSO7104A, sim) for sim in sims])
+            await asyncio.gather(*[s.timebase.set('scale', 1e-3 * (k + 1)) for k, s in enumerate(scopes)])
+            values = await asyncio.gather(*[s.timebase.scale for s in scopes])
+            self.assertEqual(values, [1e-3, 2e-3, 3e-3, 4e-3])
+        run(test())
+
+    def test_socket(self):
+        async def test():
+            sim = aio.SimulatedInstrument()
+            server = await sim.start_server()
+            port = server.sockets[0].getsockname()[1]
+            try:
+                async with await aio.open(ivi.agilent.agilentDSO7104A,
+                        aio.SocketInterface('127.0.0.1', port, timeout=5)) as scope:
+                    await scope.channels[0].set('range', 8.0)
+                    self.assertEqual(sim.settings[':channel1:range'], '8.000000e+00')
+                    scope.driver._set_cache_valid(False, 'channel_range', 0)
+                    self.assertEqual(await scope.channels[0].range, 8.0)
+            finally:
+                server.close()
+                await server.wait_closed()
+        run(test())
+
+    def test_socket_long_response(self):
+        async def test():
+            value = '1' * 100000
+            sim = aio.SimulatedInstrument({':data?': value})
+            server = await sim.start_server()
+            port = server.sockets[0].getsockname()[1]
+            try:
+                instr = aio.SocketInterface('127.0.0.1', port, timeout=5)
+                self.assertEqual(await instr.ask_raw(b':data?'), value.encode() + b'\n')
+                await instr.close()
+                instr = aio.SocketInterface('127.0.0.1', port, timeout=5, limit=1024)
+                with self.assertRaises(ivi.IOException):
+                    await instr.ask_raw(b':data?')
+                await instr.close()
+            finally:
+                server.close()
+                await server.wait_closed()
+        run(test())
+
+    def test_blocking_call_from_loop(self):
+        async def test():
+            sim = aio.SimulatedInstrument()
+            scope = await aio.open(ivi.agilent.agilentDSO7104A, sim)
+            with self.assertRaises(RuntimeError):
+                scope.driver._ask('*IDN?')
+        run(test())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import time
+import unittest
+
+import ivi
+from ivi import executor
+
+class SleepInterface(object):
+    "Interface that takes delay seconds to answer a query"
+
+    def __init__(self, delay, response):
+        self.delay = delay
+        self.response = response
+
+    def write_raw(self, data):
+        pass
+
+    def read_raw(self, num=-1):
+        time.sleep(self.delay)
+        return self.response
+
+    def close(self):
+        pass
+
+class TestExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.drivers = [ivi.Driver(SleepInterface(0.05, b'%d\n' % k)) for k in range(8)]
+
+    def test_map_callable(self):
+        results = executor.map_drivers(self.drivers, lambda d, q: d._ask(q), '*IDN?')
+        self.assertEqual(results.values(), [str(k) for k in range(8)])
+        self.assertTrue(all(r.elapsed >= 0.05 for r in results))
+        # bounded by the slowest instrument rather than the sum
+        self.assertTrue(results.elapsed < 0.05 * 8 / 2)
+
+    def test_map_path(self):
+        with executor.Executor(4) as e:
+            results = e.map(self.drivers, 'driver_operation.simulate')
+            self.assertEqual(results.values(), [False] * 8)
+            results = e.map(self.drivers, 'utility.error_query')
+            self.assertEqual(results.values()[0], (0, 'No error'))
+
+    def test_exception(self):
+        def op(d):
+            if d is self.drivers[2]:
+                raise ValueError()
+            return 1
+        results = executor.map_drivers(self.drivers, op)
+        self.assertTrue(isinstance(results[2].exception, ValueError))
+        self.assertEqual(results[3].value, 1)
+        self.assertRaises(ValueError, results.values)
+
+    def test_resolve(self):
+        class Obj(object):
+            pass
+        o = Obj()
+        o.channels = {'a': Obj(), 1: Obj()}
+        o.channels[1].name = 'one'
+        o.channels['a'].name = 'a'
+        self.assertEqual(executor.resolve(o, 'channels[1].name'), 'one')
+        self.assertEqual(executor.resolve(o, "channels['a'].name"), 'a')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import socket
+import struct
+import threading
+import unittest
+
+import ivi
+from ivi.interface import hislip
+
+class StandInServer(object):
+    """HiSLIP server stand-in
+
+    Answers queries from a dict, splitting responses into data messages of
+    chunk bytes, and accepts messages of at most max_message_size bytes.
+    """
+
+    def __init__(self, responses, chunk=1000, max_message_size=4096, overlapped=False):
+        self.responses = responses
+        self.chunk = chunk
+        self.max_message_size = max_message_size
+        self.overlapped = overlapped
+        self.received = []
+        self.messages = []
+        self.triggers = 0
+        self.status = 0x10
+        self.client_max_message_size = None
+        self.async_conn = None
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(2)
+        self.port = self.server.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def serve(self):
+        for k in range(2):
+            conn, addr = self.server.accept()
+            msg_type, control, param, payload = hislip._recv_message(conn)
+            if msg_type == hislip.INITIALIZE:
+                self.sub_address = payload
+                hislip._send_message(conn, hislip.INITIALIZE_RESPONSE, int(self.overlapped),
+                        (0x0100 << 16) | 7)
+                t = threading.Thread(target=self.serve_sync, args=(conn,))
+            else:
+                self.session_id = param
+                hislip._send_message(conn, hislip.ASYNC_INITIALIZE_RESPONSE, 0, 0x5349)
+                self.async_conn = conn
+                t = threading.Thread(target=self.serve_async, args=(conn,))
+            t.daemon = True
+            t.start()
+        self.server.close()
+
+    def serve_sync(self, conn):
+        data = b''
+        try:
+            while True:
+                msg_type, control, param, payload = hislip._recv_message(conn)
+                self.messages.append((msg_type, control, param, len(payload)))
+                if msg_type == hislip.DATA:
+                    data += payload
+                elif msg_type == hislip.DATA_END:
+                    data += payload
+                    self.received.append(data)
+                    response = self.responses.get(data)
+                    data = b''
+                    if response is not None:
+                        while len(response) > self.chunk:
+                            hislip._send_message(conn, hislip.DATA, 0, param, response[:self.chunk])
+                            response = response[self.chunk:]
+                        hislip._send_message(conn, hislip.DATA_END, 0, param, response)
+                elif msg_type == hislip.TRIGGER:
+                    self.triggers += 1
+                elif msg_type == hislip.DEVICE_CLEAR_COMPLETE:
+                    self.overlapped = bool(control & 1)
+                    hislip._send_message(conn, hislip.DEVICE_CLEAR_ACKNOWLEDGE, control)
+        except IOError:
+            conn.close()
+
+    def serve_async(self, conn):
+        try:
+            while True:
+                msg_type, control, param, payload = hislip._recv_message(conn)
+                if msg_type == hislip.ASYNC_MAXIMUM_MESSAGE_SIZE:
+                    self.client_max_message_size = struct.unpack('>Q', payload)[0]
+                    hislip._send_message(conn, hislip.ASYNC_MAXIMUM_MESSAGE_SIZE_RESPONSE, 0, 0,
+                            struct.pack('>Q', self.max_message_size))
+                elif msg_type == hislip.ASYNC_STATUS_QUERY:
+                    hislip._send_message(conn, hislip.ASYNC_STATUS_RESPONSE, self.status)
+                elif msg_type == hislip.ASYNC_DEVICE_CLEAR:
+                    hislip._send_message(conn, hislip.ASYNC_DEVICE_CLEAR_ACKNOWLEDGE, int(self.overlapped))
+                elif msg_type == hislip.ASYNC_REMOTE_LOCAL_CONTROL:
+                    hislip._send_message(conn, hislip.ASYNC_REMOTE_LOCAL_RESPONSE)
+                elif msg_type == hislip.ASYNC_LOCK:
+                    hislip._send_message(conn, hislip.ASYNC_LOCK_RESPONSE, 1)
+        except IOError:
+            conn.close()
+
+    def service_request(self, status):
+        hislip._send_message(self.async_conn, hislip.ASYNC_SERVICE_REQUEST, status)
+
+class TestHislipInstrument(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = bytes(bytearray(k % 256 for k in range(10000)))
+        self.server = StandInServer({
+                b'*IDN?': b'Python IVI,HiSLIP stand-in,0,0\n',
+                b':DATA?': b'#510000' + self.payload + b'\n',
+        })
+        self.resource = 'TCPIP0::127.0.0.1::hislip0,%d::INSTR' % self.server.port
+        self.instr = None
+
+    def tearDown(self):
+        if self.instr is not None:
+            self.instr.close()
+
+    def test_parse(self):
+        res = hislip.parse_visa_resource_string('TCPIP0::10.0.0.1::hislip0::INSTR')
+        self.assertEqual((res['host'], res['name'], res['port']), ('10.0.0.1', 'hislip0', 4880))
+        self.assertTrue(hislip.parse_visa_resource_string('TCPIP0::10.0.0.1::inst0::INSTR') is None)
+
+    def test_initialize(self):
+        self.instr = ivi.open_interface(self.resource)
+        self.assertTrue(isinstance(self.instr, hislip.HislipInstrument))
+        self.assertEqual(self.server.sub_address, b'hislip0')
+        self.assertEqual(self.server.session_id, 7)
+        self.assertEqual(self.instr.server_max_message_size, 4096)
+        self.assertEqual(self.server.client_max_message_size, 1 << 30)
+        self.assertFalse(self.instr.overlapped)
+
+    def test_ask(self):
+        self.instr = hislip.HislipInstrument(self.resource)
+        self.assertEqual(self.instr.ask('*IDN?'), 'Python IVI,HiSLIP stand-in,0,0')
+        self.assertEqual(self.instr.ask('*IDN?'), 'Python IVI,HiSLIP stand-in,0,0')
+        # second query reports the first response as delivered
+        ids = [m[2] for m in self.server.messages]
+        self.assertEqual(ids, [0xffffff00, 0xffffff02])
+        self.assertEqual([m[1] for m in self.server.messages], [0, 1])
+
+    def test_ieee_block(self):
+        driver = ivi.Driver(hislip.HislipInstrument(self.resource))
+        self.instr = driver._interface
+        self.assertEqual(driver._ask_for_ieee_block(':DATA?'), self.payload)
+        self.assertEqual(driver._read_raw(), b'\n')
+        self.assertEqual(driver._ask('*IDN?'), 'Python IVI,HiSLIP stand-in,0,0')
+
+    def test_partial_read(self):
+        self.instr = hislip.HislipInstrument(self.resource)
+        self.instr.write(':DATA?')
+        self.assertEqual(self.instr.read_raw(7), b'#510000')
+        # writing discards the rest of the response
+        self.assertEqual(self.instr.ask('*IDN?'), 'Python IVI,HiSLIP stand-in,0,0')
+
+    def test_large_write(self):
+        self.instr = hislip.HislipInstrument(self.resource)
+        data = b':DATA ' + b'1' * 10000 + b'\n'
+        self.instr.write_raw(data)
+        self.instr.ask('*IDN?')
+        self.assertEqual(self.server.received[0], data)
+        self.assertEqual([m[0] for m in self.server.messages[:3]], [hislip.DATA, hislip.DATA, hislip.DATA_END])
+
+    def test_async_channel(self):
+        self.instr = hislip.HislipInstrument(self.resource)
+        self.assertEqual(self.instr.read_stb(), 0x10)
+        self.instr.trigger()
+        self.instr.remote()
+        self.instr.local()
+        self.instr.lock()
+        self.instr.unlock()
+        self.server.service_request(0x50)
+        self.assertEqual(self.instr.wait_for_srq(1), 0x50)
+        self.instr.ask('*IDN?')
+        self.assertEqual(self.server.triggers, 1)
+
+    def test_overlapped(self):
+        self.instr = hislip.HislipInstrument(self.resource, overlapped=True)
+        self.assertTrue(self.instr.overlapped)
+        self.assertTrue(self.server.overlapped)
+        # queries can be sent before reading earlier responses
+        self.instr.write('*IDN?')
+        self.instr.write('*IDN?')
+        self.assertEqual(self.instr.read(), 'Python IVI,HiSLIP stand-in,0,0')
+        self.assertEqual(self.instr.read(), 'Python IVI,HiSLIP stand-in,0,0')
+
+    def test_clear(self):
+        self.instr = hislip.HislipInstrument(self.resource)
+        self.instr.write(':DATA?')
+        self.instr.read_raw(3)
+        self.instr.clear()
+        self.assertEqual(self.instr.ask('*IDN?'), 'Python IVI,HiSLIP stand-in,0,0')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import collections
+import sys
+import unittest
+
+import ivi
+from ivi import interface
+
+class FakeInstrument(object):
+    "Interface opened by the fake backend"
+
+    def __init__(self, resource):
+        self.resource = resource
+
+    def write_raw(self, data):
+        pass
+
+    def read_raw(self, num=-1):
+        return b'\n'
+
+    def close(self):
+        pass
+
+class TestBackends(unittest.TestCase):
+
+    def setUp(self):
+        self.backends = interface._backends
+        self.loaded = interface._loaded
+        interface._backends = collections.OrderedDict()
+        interface._loaded = dict()
+        interface.register_backend('missing', 'ivi.test.no_such_backend', 'Instrument', ('TCPIP',))
+        interface.register_backend('fake', __name__, 'FakeInstrument', ('TCPIP', 'GPIB'))
+        interface.register_backend('pyvisa', __name__, 'FakeInstrument')
+
+    def tearDown(self):
+        interface._backends = self.backends
+        interface._loaded = self.loaded
+
+    def test_lazy(self):
+        self.assertFalse(interface.is_loaded('fake'))
+        self.assertFalse('ivi.test.no_such_backend' in sys.modules)
+        instr = ivi.open_interface('TCPIP0::10.0.0.1::INSTR')
+        self.assertTrue(isinstance(instr, FakeInstrument))
+        self.assertTrue(interface.is_loaded('fake'))
+        self.assertFalse(interface.is_loaded('missing'))
+
+    def test_resource_types(self):
+        self.assertEqual([b.name for b in interface.get_backends('gpib')], ['fake', 'pyvisa'])
+        self.assertEqual([b.name for b in interface.get_backends('ASRL')], ['pyvisa'])
+
+    def test_prefer_pyvisa(self):
+        self.assertEqual(interface.get_backends('TCPIP')[-1].name, 'pyvisa')
+        instr = ivi.open_interface('TCPIP0::10.0.0.1::INSTR', prefer_pyvisa=True)
+        self.assertTrue(interface.is_loaded('pyvisa'))
+        self.assertFalse(interface.is_loaded('fake'))
+
+    def test_no_backend(self):
+        interface._backends.pop('pyvisa')
+        self.assertRaises(ivi.IOException, ivi.open_interface, 'ASRL1::INSTR')
+        self.assertRaises(ivi.IOException, ivi.open_interface, 'nonsense')
+
+    def test_backend_instance(self):
+        instr = ivi.open_interface('GPIB0::5::INSTR')
+        self.assertTrue(interface.is_backend_instance(instr))
+        self.assertFalse(interface.is_backend_instance(object()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,9 +24,14 @@ THE SOFTWARE.
 
 """
 
+import gc
+import numpy as np
+import threading
+import time
 import unittest
 
 import ivi
+from ivi.test.support import RecordingInterface
 
 class TestIndex(unittest.TestCase):
 
@@ -57,5 +62,707 @@ class TestIndex(unittest.TestCase):
         self.assertRaises(ivi.SelectorRangeException, ivi.get_index, self.index_dict, 100);
         self.assertRaises(ivi.SelectorNameException, ivi.get_index, self.index_dict, 'bad_item');
 
+class TestDoc(unittest.TestCase):
+
+    def test_doc(self):
+        d = ivi.Doc("""
+                    First line
+
+                    Second paragraph
+                        indented
+                    """, 'IviScope', 'Base', '4.2.1')
+        self.assertEqual(d.doc, 'First line\n\nSecond paragraph\n    indented')
+        self.assertEqual(str(d), d.doc)
+        self.assertTrue(d.render().startswith('.. attribute:: \n\n   *IVI class IviScope'))
+        d.doc = """
+                Replaced
+                """
+        self.assertEqual(str(d), 'Replaced')
+
+class TestIndexedPropertyCollection(unittest.TestCase):
+
+    def setUp(self):
+        self.values = [0, 0, 0]
+        self.coll = ivi.IndexedPropertyCollection()
+        self.coll._add_property('value', self.values.__getitem__, self.values.__setitem__)
+        self.coll._add_property('sub.value', lambda i: i * 10)
+        self.coll._add_method('double', lambda i, x: x * 2 + i)
+        self.coll._set_list(['ch1', 'ch2', 'ch3'])
+
+    def test_lazy_construction(self):
+        self.assertEqual(self.coll._objs, [None, None, None])
+        self.coll[1]
+        self.assertEqual(self.coll._objs[0], None)
+        self.assertTrue(self.coll[1] is self.coll['ch2'])
+
+    def test_access(self):
+        self.coll['ch3'].value = 5
+        self.assertEqual(self.values, [0, 0, 5])
+        self.assertEqual(self.coll[2].value, 5)
+        self.assertEqual(self.coll[1].sub.value, 10)
+        self.assertTrue(self.coll[1].sub is self.coll[1].sub)
+        self.assertEqual(self.coll[1].double(3), 7)
+        self.assertEqual([c.value for c in self.coll], [0, 0, 5])
+        self.assertEqual([c.sub.value for c in self.coll[1:]], [10, 20])
+
+    def test_locked(self):
+        self.assertRaises(AttributeError, setattr, self.coll[0], 'other', 1)
+        self.assertRaises(AttributeError, setattr, self.coll[0].sub, 'value', 1)
+        self.assertRaises(AttributeError, getattr, self.coll[0], 'other')
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.coll[0], '__dict__'))
+
+    def test_property_added_later(self):
+        self.coll[0]
+        self.coll._add_property('late', lambda i: -i)
+        self.assertEqual(self.coll[2].late, -2)
+
+class TestCompileProperties(unittest.TestCase):
+
+    def setUp(self):
+        self.values = [0, 0]
+        self.driver = ivi.Driver()
+        self.driver._add_property('group.value',
+                        lambda: self.values[0],
+                        lambda v: self.values.__setitem__(0, v))
+        self.driver._add_property('channels[].value',
+                        self.values.__getitem__,
+                        self.values.__setitem__)
+        self.driver._add_method('channels[].double',
+                        lambda i, x: x * 2 + i)
+        self.driver.channels._set_list(['ch1', 'ch2'])
+        ivi.compile_properties(self.driver)
+
+    def test_compiled_access(self):
+        self.driver.group.value = 3
+        self.assertEqual(self.driver.group.value, 3)
+        self.driver.channels[1].value = 4
+        self.assertEqual(self.driver.channels[1].value, 4)
+        self.assertEqual(self.driver.channels[1].double(2), 5)
+        self.assertEqual(self.driver.driver_operation.simulate, False)
+        self.assertRaises(AttributeError, setattr, self.driver.driver_operation, 'simulate', True)
+
+    def test_compiled_class_shared(self):
+        other = ivi.Driver()
+        ivi.compile_properties(other)
+        self.assertTrue(type(other) is type(self.driver))
+        self.assertTrue(type(other.identity) is type(self.driver.identity))
+        self.assertTrue(isinstance(other, ivi.Driver))
+
+    def test_compiled_proxy_class_shared(self):
+        other = ivi.Driver()
+        other._add_property('channels[].value', lambda i: -i)
+        other._add_method('channels[].double', lambda i, x: x)
+        other.channels._set_list(['ch1'])
+        ivi.compile_properties(other)
+        self.assertTrue(type(other.channels[0]) is type(self.driver.channels[0]))
+        self.assertEqual(other.channels[0].value, 0)
+        self.assertEqual(self.driver.channels[1].value, 0)
+        self.assertEqual(other.channels[0].double(2), 2)
+
+    def test_add_after_compile(self):
+        self.driver._add_property('group.other', lambda: 7)
+        self.assertEqual(self.driver.group.other, 7)
+        self.driver._add_property('channels[].other', lambda i: -i)
+        self.assertEqual(self.driver.channels[1].other, -1)
+
+class CachedDriver(ivi.Driver):
+    def __init__(self, *args, **kwargs):
+        super(CachedDriver, self).__init__(*args, **kwargs)
+        self._test_value = 0
+        self._test_query_count = 0
+        self._add_property('test.value',
+                        self._get_test_value,
+                        self._set_test_value)
+
+    def _get_test_value(self):
+        if not self._get_cache_valid():
+            self._test_query_count += 1
+            self._set_cache_valid()
+        return self._test_value
+
+    def _set_test_value(self, value):
+        self._test_value = value
+        self._set_cache_valid()
+
+    def _test_operation(self):
+        self._invalidate_cache_dependents()
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = CachedDriver()
+
+    def test_get_cache_tag(self):
+        self.assertEqual(ivi.get_cache_tag('_get_channel_range'), 'channel_range')
+        self.assertEqual(ivi.get_cache_tag('_set_channel_range'), 'channel_range')
+        self.assertEqual(ivi.get_cache_tag('channel_range'), 'channel_range')
+        self.assertEqual(self.driver._get_cache_tag('_get_test_value'), 'test_value')
+
+    def test_implicit_tag(self):
+        self.driver.test.value
+        self.driver.test.value
+        self.assertEqual(self.driver._test_query_count, 1)
+        self.assertTrue(self.driver._get_cache_valid('test_value'))
+        self.driver._set_cache_valid(False, 'test_value')
+        self.driver.test.value
+        self.assertEqual(self.driver._test_query_count, 2)
+
+    def test_setter_validates(self):
+        self.driver.test.value = 5
+        self.assertEqual(self.driver.test.value, 5)
+        self.assertEqual(self.driver._test_query_count, 0)
+
+    def test_index(self):
+        self.driver._set_cache_valid(True, 'channel_range', 1)
+        self.assertTrue(self.driver._get_cache_valid('channel_range', 1))
+        self.assertFalse(self.driver._get_cache_valid('channel_range', 0))
+        self.assertFalse(self.driver._get_cache_valid('channel_range'))
+
+    def test_cache_disabled(self):
+        self.driver.test.value
+        self.driver.driver_operation.cache = False
+        self.driver.test.value
+        self.assertEqual(self.driver._test_query_count, 2)
+
+    def test_invalidate_all(self):
+        self.driver.test.value
+        self.driver.driver_operation.invalidate_all_attributes()
+        self.driver.test.value
+        self.assertEqual(self.driver._test_query_count, 2)
+
+    def test_ttl(self):
+        self.driver._set_cache_ttl('test_value', 0.05)
+        self.driver.test.value
+        self.driver.test.value
+        self.assertEqual(self.driver._test_query_count, 1)
+        time.sleep(0.1)
+        self.driver.test.value
+        self.assertEqual(self.driver._test_query_count, 2)
+        self.driver._set_cache_ttl('test_value', None)
+        self.driver.test.value = 1
+        time.sleep(0.1)
+        self.driver.test.value
+        self.assertEqual(self.driver._test_query_count, 2)
+
+    def test_setter_invalidates_dependents(self):
+        self.driver._set_cache_dependencies('test_value', 'test_offset')
+        self.driver._set_cache_dependencies('test_offset', 'test_gain')
+        self.driver._set_cache_valid(True, 'test_offset')
+        self.driver._set_cache_valid(True, 'test_gain')
+        self.driver._set_cache_valid(True, 'test_other')
+        # reading the value does not change it
+        self.driver.test.value
+        self.assertTrue(self.driver._get_cache_valid('test_offset'))
+        # writing it invalidates dependents, transitively
+        self.driver.test.value = 2
+        self.assertTrue(self.driver._get_cache_valid('test_value'))
+        self.assertFalse(self.driver._get_cache_valid('test_offset'))
+        self.assertFalse(self.driver._get_cache_valid('test_gain'))
+        self.assertTrue(self.driver._get_cache_valid('test_other'))
+
+    def test_indexed_dependents(self):
+        self.driver._set_cache_dependencies('channel_range', 'channel_offset', 'trigger_level')
+        self.driver._set_cache_dependencies('trigger_source', 'channel_offset')
+        for i in range(2):
+            self.driver._set_cache_valid(True, 'channel_offset', i)
+        self.driver._set_cache_valid(True, 'trigger_level')
+        self.driver._invalidate_cache_dependents('channel_range', 1)
+        self.assertTrue(self.driver._get_cache_valid('channel_offset', 0))
+        self.assertFalse(self.driver._get_cache_valid('channel_offset', 1))
+        self.assertFalse(self.driver._get_cache_valid('trigger_level'))
+        self.driver._invalidate_cache_dependents('trigger_source')
+        self.assertFalse(self.driver._get_cache_valid('channel_offset', 0))
+
+    def test_operation_dependents(self):
+        self.driver._set_cache_dependencies('test_operation', 'test_value')
+        self.driver._set_cache_valid(True, 'test_other')
+        self.driver.test.value
+        self.driver._test_operation()
+        self.driver.test.value
+        self.assertEqual(self.driver._test_query_count, 2)
+        self.assertTrue(self.driver._get_cache_valid('test_other'))
+
+    def test_reset_invalidates_all(self):
+        self.driver._set_cache_valid(True, 'test_other')
+        self.driver._invalidate_cache_dependents('utility_reset')
+        self.assertFalse(self.driver._get_cache_valid('test_other'))
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.instr = RecordingInterface()
+        self.driver = ivi.Driver(self.instr)
+
+    def test_batch(self):
+        with self.driver.batch():
+            self.driver._write(":timebase:scale 1")
+            self.driver._write("timebase:position 0")
+            self.driver._write("*CLS")
+            self.assertEqual(self.instr.writes, [])
+        self.assertEqual(self.instr.writes,
+                [b':timebase:scale 1;:timebase:position 0;*CLS'])
+
+    def test_nested(self):
+        with self.driver.batch():
+            self.driver._write(":a 1")
+            with self.driver.batch():
+                self.driver._write(":b 1")
+            self.driver._write([":c 1", ":d 1"])
+        self.assertEqual(self.instr.writes, [b':a 1;:b 1;:c 1;:d 1'])
+
+    def test_read_flushes(self):
+        with self.driver.batch():
+            self.driver._write(":a 1")
+            self.assertEqual(self.driver._ask(":b?"), '1')
+            self.driver._write(":c 1")
+        self.assertEqual(self.instr.writes, [b':a 1', b':b?', b':c 1'])
+
+    def test_max_length(self):
+        self.driver._batch_max_length = 10
+        with self.driver.batch():
+            for c in 'abcd':
+                self.driver._write(":%s 1" % c)
+        self.assertEqual(self.instr.writes, [b':a 1;:b 1', b':c 1;:d 1'])
+
+    def test_exception_flushes(self):
+        try:
+            with self.driver.batch():
+                self.driver._write(":a 1")
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertEqual(self.instr.writes, [b':a 1'])
+        self.driver._write(":b 1")
+        self.assertEqual(self.instr.writes, [b':a 1', b':b 1'])
+
+    def test_not_supported(self):
+        self.driver._batch_supported = False
+        with self.driver.batch():
+            self.driver._write("F1")
+            self.driver._write("R2")
+        self.assertEqual(self.instr.writes, [b'F1', b'R2'])
+
+class TestAskMany(unittest.TestCase):
+
+    def setUp(self):
+        self.instr = RecordingInterface()
+        self.driver = ivi.Driver(self.instr)
+
+    def test_split_scpi_response(self):
+        self.assertEqual(ivi.split_scpi_response('1;2.5; ON'), ['1', '2.5', 'ON'])
+        self.assertEqual(ivi.split_scpi_response('"a;b";1,2'), ['"a;b"', '1,2'])
+        self.assertEqual(ivi.split_scpi_response('1'), ['1'])
+
+    def test_ask_many(self):
+        self.instr.respond(b'1.5;"a;b";+3\n')
+        values = self.driver._ask_many([(':a?', float), ':b?', ':c:select 2', (':c?', int)])
+        self.assertEqual(values, [1.5, '"a;b"', 3])
+        self.assertEqual(self.instr.writes, [b':a?;:b?;:c:select 2;:c?'])
+
+    def test_cache(self):
+        self.driver._test_value = 0
+        self.driver._test_list = [0, 0]
+        self.instr.respond(b'2;3\n')
+        self.driver._ask_many([(':a?', int, 'test_value'), (':b?', int, 'test_list', 1)])
+        self.assertEqual(self.driver._test_value, 2)
+        self.assertEqual(self.driver._test_list, [0, 3])
+        self.assertTrue(self.driver._get_cache_valid('test_value'))
+        self.assertTrue(self.driver._get_cache_valid('test_list', 1))
+        self.assertFalse(self.driver._get_cache_valid('test_list', 0))
+
+    def test_max_length(self):
+        self.driver._batch_max_length = 8
+        self.instr.respond(b'1;2\n', b'3\n')
+        self.assertEqual(self.driver.query_batch([(':a?', int), (':b?', int), (':c?', int)]), [1, 2, 3])
+        self.assertEqual(self.instr.writes, [b':a?;:b?', b':c?'])
+
+    def test_bad_response(self):
+        self.instr.respond(b'1\n')
+        self.assertRaises(ivi.UnexpectedResponseException, self.driver._ask_many, [':a?', ':b?'])
+
+    def test_not_supported(self):
+        self.driver._batch_supported = False
+        self.instr.respond(b'1\n', b'2\n')
+        self.assertEqual(self.driver._ask_many(['A?', 'S1', 'B?']), ['1', '2'])
+        self.assertEqual(self.instr.writes, [b'A?', b'S1', b'B?'])
+
+class SlowInterface(RecordingInterface):
+    "Interface that fails if another thread writes between a write and its read"
+
+    def __init__(self, delay=0.001):
+        super(SlowInterface, self).__init__()
+        self.delay = delay
+        self.pending = None
+        self.errors = 0
+
+    def write_raw(self, data):
+        if self.pending is not None:
+            self.errors += 1
+        self.pending = data
+        time.sleep(self.delay)
+
+    def read_raw(self, num=-1):
+        time.sleep(self.delay)
+        data, self.pending = self.pending, None
+        if data is None:
+            self.errors += 1
+            return b'\n'
+        return data.replace(b'?', b'') + b'\n'
+
+class TestLock(unittest.TestCase):
+
+    def test_ask_threads(self):
+        instr = SlowInterface()
+        driver = ivi.Driver(instr)
+        results = []
+        def worker(n):
+            for k in range(10):
+                results.append(driver._ask('%d:%d?' % (n, k)) == '%d:%d' % (n, k))
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(instr.errors, 0)
+        self.assertEqual(results, [True] * 40)
+
+    def test_lock_object(self):
+        driver = ivi.Driver(RecordingInterface())
+        driver.utility.lock_object()
+        try:
+            acquired = []
+            t = threading.Thread(target=lambda: acquired.append(driver._lock.acquire(False)))
+            t.start()
+            t.join()
+            self.assertEqual(acquired, [False])
+            # reentrant in the owning thread
+            driver._write(':a 1')
+        finally:
+            driver.utility.unlock_object()
+        self.assertTrue(driver._lock.acquire(False))
+        driver._lock.release()
+
+    def test_lock_object_timeout(self):
+        driver = ivi.Driver(RecordingInterface())
+        driver.utility.lock_object()
+        try:
+            errors = []
+            def worker():
+                try:
+                    driver.utility.lock_object(0.01)
+                except ivi.MaxTimeoutExceededException as e:
+                    errors.append(e)
+            t = threading.Thread(target=worker)
+            t.start()
+            t.join()
+            self.assertEqual(len(errors), 1)
+        finally:
+            driver.utility.unlock_object()
+
+    def test_setter_cache_tag(self):
+        # locked wrappers must not change the tag seen by the cache
+        driver = CachedDriver()
+        driver.test.value = 5
+        self.assertTrue(driver._get_cache_valid('test_value'))
+
+class RecordingPool(ivi.SessionPool):
+    "Session pool that opens RecordingInterfaces"
+
+    def __init__(self, *args, **kwargs):
+        super(RecordingPool, self).__init__(*args, **kwargs)
+        self.opened = []
+        self.closed = []
+
+    def _open(self, resource, prefer_pyvisa):
+        instr = RecordingInterface()
+        instr.close = lambda: self.closed.append(instr)
+        self.opened.append(instr)
+        return instr
+
+class TestSessionPool(unittest.TestCase):
+
+    res1 = 'TCPIP0::10.0.0.1::INSTR'
+    res2 = 'TCPIP0::10.0.0.2::INSTR'
+
+    def setUp(self):
+        self.pool = RecordingPool()
+        ivi.set_session_pool(self.pool)
+
+    def tearDown(self):
+        ivi.set_session_pool(None)
+
+    def test_reuse(self):
+        d1 = ivi.Driver(self.res1)
+        d2 = ivi.Driver(self.res1)
+        self.assertEqual(len(self.pool.opened), 1)
+        self.assertTrue(d1._interface is d2._interface)
+        self.assertTrue(d1._lock is d2._lock)
+        d1.close()
+        d2.close()
+        self.assertEqual(self.pool.closed, [])
+        d3 = ivi.Driver(self.res1)
+        self.assertTrue(d3._interface is self.pool.opened[0])
+        self.assertEqual(len(self.pool.opened), 1)
+        ivi.Driver(self.res2).close()
+        self.assertEqual(len(self.pool.opened), 2)
+        self.assertEqual(len(self.pool), 2)
+
+    def test_max_open(self):
+        self.pool.max_open = 1
+        d1 = ivi.Driver(self.res1)
+        self.assertRaises(ivi.IOException, ivi.Driver, self.res2)
+        d1.close()
+        d2 = ivi.Driver(self.res2)
+        self.assertEqual(self.pool.closed, [self.pool.opened[0]])
+        self.assertTrue(d2._interface is self.pool.opened[1])
+
+    def test_health_check(self):
+        ivi.Driver(self.res1).close()
+        self.pool.health_check = lambda instr: False
+        d = ivi.Driver(self.res1)
+        self.assertEqual(self.pool.closed, [self.pool.opened[0]])
+        self.assertTrue(d._interface is self.pool.opened[1])
+
+    def test_evict(self):
+        ivi.Driver(self.res1).close()
+        d = ivi.Driver(self.res2)
+        self.pool.evict(0)
+        self.assertEqual(self.pool.closed, [self.pool.opened[0]])
+        self.assertFalse(self.res1 in self.pool)
+        self.assertTrue(self.res2 in self.pool)
+
+    def test_collected(self):
+        ivi.Driver(self.res1)
+        gc.collect()
+        self.pool.max_open = 1
+        ivi.Driver(self.res2)
+        self.assertEqual(self.pool.closed, [self.pool.opened[0]])
+
+class StreamInterface(object):
+    "Interface that returns up to num bytes of one message per read"
+
+    def __init__(self, data):
+        self.data = data
+        self.reads = []
+
+    def write_raw(self, data):
+        pass
+
+    def read_raw(self, num=-1):
+        if num < 0:
+            num = len(self.data)
+        self.reads.append(num)
+        data, self.data = self.data[:num], self.data[num:]
+        return data
+
+    def close(self):
+        pass
+
+class TestIeeeBlock(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = bytes(bytearray(k % 256 for k in range(10000)))
+        self.instr = StreamInterface(b'#510000' + self.payload + b'\n')
+        self.driver = ivi.Driver(self.instr)
+
+    def test_read(self):
+        self.assertEqual(self.driver._read_ieee_block(), self.payload)
+        # '#5', the length digits, then the payload in one read
+        self.assertEqual(self.instr.reads, [2, 5, 10000])
+        self.assertEqual(self.driver._read_raw(), b'\n')
+
+    def test_leading_data(self):
+        self.instr.data = b'\n ' + self.instr.data
+        self.assertEqual(self.driver._read_ieee_block(), self.payload)
+
+    def test_chunks(self):
+        progress = []
+        data = self.driver._read_ieee_block(4096, lambda n, total: progress.append((n, total)))
+        self.assertEqual(data, self.payload)
+        self.assertEqual(progress, [(4096, 10000), (8192, 10000), (10000, 10000)])
+
+    def test_iter(self):
+        chunks = list(self.driver._iter_ieee_block(3000))
+        self.assertEqual([len(c) for c in chunks], [3000, 3000, 3000, 1000])
+        self.assertEqual(b''.join(chunks), self.payload)
+
+    def test_indefinite(self):
+        self.instr.data = b'#0' + self.payload
+        chunks = list(self.driver._iter_ieee_block(4096))
+        self.assertEqual([len(c) for c in chunks], [4096, 4096, 1808])
+        self.instr.data = b'#0' + self.payload
+        self.assertEqual(self.driver._read_ieee_block(), self.payload)
+
+    def test_into(self):
+        buf = np.zeros(5000, dtype='<u2')
+        self.assertEqual(self.driver._read_ieee_block_into(buf, 4096), 10000)
+        self.assertEqual(buf.tobytes(), self.payload)
+        self.instr.data = b'#14abcd'
+        self.assertRaises(ValueError, self.driver._read_ieee_block_into, bytearray(3))
+
+    def test_decode(self):
+        self.assertEqual(ivi.decode_ieee_block(b'\n#15abcde\n'), b'abcde')
+        self.assertEqual(ivi.decode_ieee_block(b'#0abc\n'), b'abc\n')
+        self.assertEqual(ivi.decode_ieee_block(b''), b'')
+
+class VectorInterface(object):
+    "Interface that records the buffers passed to writev"
+
+    def __init__(self):
+        self.writes = []
+        self.parts = []
+
+    def write_raw(self, data):
+        self.writes.append(data)
+
+    def writev(self, buffers):
+        self.parts.append(list(buffers))
+
+    def read_raw(self, num=-1):
+        return b'\n'
+
+    def close(self):
+        pass
+
+class TestWriteIeeeBlock(unittest.TestCase):
+
+    def test_header(self):
+        self.assertEqual(ivi.ieee_block_header(0), b'#10')
+        self.assertEqual(ivi.ieee_block_header(2000), b'#42000')
+        self.assertEqual(ivi.build_ieee_block(b'abc'), b'#13abc')
+        self.assertEqual(ivi.build_ieee_block(np.array([1, 2], dtype='<u2')), b'#14\x01\x00\x02\x00')
+
+    def test_write(self):
+        instr = RecordingInterface()
+        driver = ivi.Driver(instr)
+        driver._write_ieee_block(bytearray(b'abcd'), ':data ')
+        self.assertEqual(instr.writes, [b':data #14abcd'])
+
+    def test_writev(self):
+        instr = VectorInterface()
+        driver = ivi.Driver(instr)
+        data = np.arange(1000, dtype='<i2')
+        driver._write_ieee_block(data, ':data ', chunk_size=512)
+        parts = instr.parts[0]
+        self.assertEqual(instr.writes, [])
+        self.assertEqual(parts[0], b':data #42000')
+        self.assertEqual([len(p) for p in parts[1:]], [512, 512, 512, 464])
+        # the payload is sent from the array itself
+        self.assertTrue(all(p.obj is data for p in parts[1:]))
+        self.assertEqual(b''.join(parts[1:]), data.tobytes())
+
+class TestParseValues(unittest.TestCase):
+
+    def test_ascii(self):
+        values = ivi.parse_ascii_values('+1.5E+00, -2.0E-03,9.9E37\n')
+        self.assertEqual(values.dtype, np.float64)
+        self.assertEqual(values.tolist(), [1.5, -0.002, 9.9e37])
+        self.assertEqual(ivi.parse_ascii_values(b'1;2;3', ';', int).tolist(), [1, 2, 3])
+        self.assertEqual(len(ivi.parse_ascii_values('\n')), 0)
+        self.assertRaises(ValueError, ivi.parse_ascii_values, '1,OVLD')
+
+    def test_binary(self):
+        data = np.array([1.5, -2.0], dtype='>f4').tobytes()
+        self.assertEqual(ivi.parse_binary_values(data).tolist(), [1.5, -2.0])
+        data = np.array([1.5, -2.0], dtype='<f8').tobytes()
+        self.assertEqual(ivi.parse_binary_values(data, 'f8', 'little').tolist(), [1.5, -2.0])
+
+    def test_sample_view(self):
+        data = np.arange(4, dtype='<u2').tobytes()
+        self.assertEqual(ivi.sample_view(data, '<u2').tolist(), [0, 1, 2, 3])
+        self.assertEqual(ivi.sample_view(data, '<u2', 2, 2).tolist(), [1, 2])
+        # short blocks give the complete samples that are present
+        self.assertEqual(ivi.sample_view(data[:7], '<u2', 10).tolist(), [0, 1, 2])
+        self.assertEqual(len(ivi.sample_view(data, '<u2', 4, 10)), 0)
+
+    def test_ask_for_values(self):
+        instr = StreamInterface(b'1.0,2.0,3.0')
+        driver = ivi.Driver(instr)
+        values = driver._ask_for_values('fetch?')
+        self.assertTrue(isinstance(values, np.ndarray))
+        self.assertEqual(values.tolist(), [1.0, 2.0, 3.0])
+        instr.data = b'1,2'
+        self.assertEqual(driver._ask_for_values('fetch?', array=False), [1.0, 2.0])
+        instr.data = b'a,b'
+        self.assertEqual(driver._ask_for_values('fetch?', converter=str.upper, array=False), ['A', 'B'])
+
+    def test_ask_for_binary_values(self):
+        instr = StreamInterface(b'#18' + np.array([0.25, 4.0], dtype='>f4').tobytes() + b'\n')
+        driver = ivi.Driver(instr)
+        self.assertEqual(driver._ask_for_binary_values('trace?').tolist(), [0.25, 4.0])
+
+class TestTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = np.array([0, 10, 20, 30], dtype='<u2').tobytes()
+        self.trace = ivi.TraceYT()
+        self.trace.y_raw = np.frombuffer(self.raw, '<u2')
+        self.trace.y_increment = 0.5
+        self.trace.y_origin = 1.0
+        self.trace.y_reference = 10
+        self.trace.y_hole = 0
+        self.trace.x_increment = 1e-3
+        self.trace.x_reference = 1
+
+    def test_scaling(self):
+        self.assertTrue(np.isnan(self.trace.y[0]))
+        self.assertEqual(self.trace.y[1:].tolist(), [1.0, 6.0, 11.0])
+        self.assertTrue(np.allclose(self.trace.x, [-1e-3, 0, 1e-3, 2e-3]))
+        self.assertTrue(self.trace.t is self.trace.x)
+        self.assertEqual(len(self.trace), 4)
+
+    def test_no_copy(self):
+        self.assertTrue(np.shares_memory(self.trace.y_raw, np.frombuffer(self.raw, '<u2')))
+        self.trace.y_raw = bytearray(b'\x01\x02')
+        self.assertEqual(self.trace.y_raw.dtype, np.uint8)
+
+    def test_cache(self):
+        y = self.trace.y
+        self.assertTrue(self.trace.y is y)
+        self.assertFalse(y.flags.writeable)
+        self.trace.y_origin = 0
+        self.assertEqual(self.trace.y[1], 0.0)
+        self.trace.y_raw = np.array([12], dtype='u2')
+        self.assertEqual(self.trace.y.tolist(), [1.0])
+        self.assertEqual(len(self.trace.x), 1)
+
+    def test_dtype(self):
+        self.trace.dtype = np.float32
+        self.assertEqual(self.trace.y.dtype, np.float32)
+        self.assertEqual(self.trace.x.dtype, np.float32)
+
+    def test_index(self):
+        x, y = self.trace[2]
+        self.assertAlmostEqual(x, 1e-3)
+        self.assertEqual(y, 6.0)
+        x, y = self.trace[-2:]
+        self.assertEqual(y.tolist(), [6.0, 11.0])
+        self.assertEqual(len(x), 2)
+
+    def test_iter(self):
+        self.trace.iter_chunk = 3
+        pts = list(self.trace)
+        self.assertEqual(len(pts), 4)
+        self.assertEqual(pts[3], (self.trace.x[3], 11.0))
+        trace = ivi.TraceY()
+        trace.y_raw = [1, 2]
+        trace.y_increment = 2
+        self.assertEqual(list(trace), [2.0, 4.0])
+        self.assertEqual(trace[1], 4.0)
+        self.assertEqual(len(ivi.TraceY()), 0)
+
+    def test_share_x(self):
+        other = ivi.TraceYT()
+        other.y_raw = np.zeros(4, dtype='u2')
+        other.x_increment = 1e-3
+        other.x_reference = 1
+        self.assertTrue(other.share_x(self.trace))
+        self.assertTrue(other.x is self.trace.x)
+        other.x_origin = 1
+        self.assertFalse(other.x is self.trace.x)
+        self.assertFalse(other.share_x(self.trace))
+
 if __name__ == '__main__':
     unittest.main()
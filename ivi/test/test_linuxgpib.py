@@ -0,0 +1,79 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import unittest
+
+from ivi.test.support import import_interface
+
+linuxgpib = import_interface('linuxgpib', 'Gpib')
+
+class FakeGpib(object):
+    "Stand-in for Gpib.Gpib that asserts END with the last byte of data"
+
+    def __init__(self, data):
+        self.data = data
+        self.sizes = []
+        self.sta = 0
+
+    def read(self, num=512):
+        self.sizes.append(num)
+        data, self.data = self.data[:num], self.data[num:]
+        self.sta = linuxgpib.END if len(self.data) == 0 else 0
+        return data
+
+    def ibsta(self):
+        return self.sta
+
+class TestLinuxGpibInstrument(unittest.TestCase):
+
+    def make(self, data):
+        instr = linuxgpib.LinuxGpibInstrument.__new__(linuxgpib.LinuxGpibInstrument)
+        instr.chunk_size = 512
+        instr.max_chunk_size = 4096
+        instr.gpib = FakeGpib(data)
+        return instr
+
+    def test_read_until_eoi(self):
+        instr = self.make(b'1' * 10000 + b'\n')
+        self.assertEqual(len(instr.read_raw()), 10001)
+        self.assertEqual(instr.gpib.sizes, [512, 1024, 2048, 4096, 4096])
+
+    def test_read_num(self):
+        instr = self.make(b'#14ab\ncd')
+        self.assertEqual(instr.read_raw(2), b'#1')
+        self.assertEqual(instr.read_raw(1), b'4')
+        self.assertEqual(instr.read_raw(4), b'ab\nc')
+        self.assertEqual(instr.read_raw(), b'd')
+
+    def test_readinto(self):
+        instr = self.make(b'hello')
+        buf = bytearray(16)
+        self.assertEqual(instr.readinto(buf), 5)
+        self.assertEqual(bytes(buf[:5]), b'hello')
+
+if __name__ == '__main__':
+    unittest.main()
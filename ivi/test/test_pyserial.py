@@ -0,0 +1,117 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import unittest
+
+import ivi
+from ivi.test.support import import_interface
+
+pyserial = import_interface('pyserial', 'serial')
+
+class FakeSerial(object):
+    "Stand-in for serial.Serial that times out when its data runs out"
+
+    def __init__(self, data, chunk=7):
+        self.data = bytearray(data)
+        self.chunk = chunk
+        self.reads = 0
+
+    @property
+    def in_waiting(self):
+        return min(len(self.data), self.chunk)
+
+    def read(self, size=1):
+        self.reads += 1
+        data = bytes(self.data[:size])
+        del self.data[:size]
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def read_until(self, expected=b'\n', size=None):
+        # pySerial reads one byte at a time
+        data = bytearray()
+        while size is None or len(data) < size:
+            c = self.read(1)
+            if not c:
+                break
+            data += c
+            if data.endswith(expected):
+                break
+        return bytes(data)
+
+class TestSerialInstrument(unittest.TestCase):
+
+    def make(self, data, chunk=7):
+        instr = pyserial.SerialInstrument.__new__(pyserial.SerialInstrument)
+        instr.term_char = '\n'
+        instr.serial = FakeSerial(data, chunk)
+        return instr
+
+    def test_read_term_char(self):
+        instr = self.make(b'1.0,2.0,3.0,4.0\nNEXT\n')
+        self.assertEqual(instr.read_raw(), b'1.0,2.0,3.0,4.0\n')
+        self.assertEqual(instr.read_raw(), b'NEXT\n')
+
+    def test_read_num(self):
+        instr = self.make(b'#14ab\ncd\n')
+        self.assertEqual(instr.read_raw(2), b'#1')
+        self.assertEqual(instr.read_raw(1), b'4')
+        # a read of num bytes ends early at the termination character
+        self.assertEqual(instr.read_raw(4), b'ab\n')
+        self.assertEqual(instr.read_raw(4), b'cd\n')
+
+    def test_readinto(self):
+        payload = b'ab\ncd\n\nef'
+        instr = self.make(b'#19' + payload + b'\n')
+        self.assertEqual(instr.read_raw(3), b'#19')
+        # termination characters inside the block do not end the read
+        buf = bytearray(9)
+        self.assertEqual(instr.readinto(buf), 9)
+        self.assertEqual(bytes(buf), payload)
+        self.assertEqual(instr.read_raw(), b'\n')
+
+    def test_ieee_block(self):
+        payload = b'ab\ncd\n\nef'
+        driver = ivi.Driver(self.make(b'#19' + payload + b'\n'))
+        self.assertEqual(driver._read_ieee_block(), payload)
+        self.assertEqual(driver._read_raw(), b'\n')
+
+    def test_timeout(self):
+        instr = self.make(b'partial')
+        self.assertEqual(instr.read_raw(), b'partial')
+        self.assertEqual(instr.read_raw(), b'')
+        instr = self.make(b'abc')
+        self.assertRaises(ivi.IOTimeoutException, instr.read_raw, 5)
+        instr = self.make(b'abc')
+        self.assertRaises(ivi.IOTimeoutException, instr.readinto, bytearray(5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import unittest
+
+from ivi.test.support import import_interface
+
+pyvisa = import_interface('pyvisa', 'pyvisa')
+
+class FakeResource(object):
+    "Stand-in for a PyVISA resource that returns queued messages"
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.chunk_size = 20 * 1024
+
+    def read_raw(self):
+        return self.messages.pop(0)
+
+    def assert_trigger(self):
+        pass
+
+class FakeMessageResource(FakeResource):
+    "Stand-in for a message based resource that also reads a number of bytes"
+
+    def __init__(self, messages):
+        super(FakeMessageResource, self).__init__(messages)
+        self.calls = []
+
+    def read_raw(self):
+        self.calls.append('read_raw')
+        return super(FakeMessageResource, self).read_raw()
+
+    def read_bytes(self, count):
+        self.calls.append(count)
+        data = self.messages[0][:count]
+        self.messages[0] = self.messages[0][count:]
+        if not self.messages[0]:
+            self.messages.pop(0)
+        return data
+
+class TestPyVisaInstrument(unittest.TestCase):
+
+    def test_read_whole(self):
+        message = b'1.0,2.0\n'
+        instr = pyvisa.PyVisaInstrument(FakeResource([message]))
+        self.assertTrue(instr.read_raw() is message)
+
+    def test_read_parts(self):
+        instr = pyvisa.PyVisaInstrument(FakeResource([b'#15abcde\n', b'next\n']))
+        self.assertEqual(instr.read_raw(1), b'#')
+        self.assertEqual(instr.read_raw(1), b'1')
+        self.assertEqual(instr.read_raw(1), b'5')
+        self.assertEqual(instr.read_raw(5), b'abcde')
+        self.assertEqual(instr.read_raw(), b'\n')
+        self.assertEqual(instr.read_raw(), b'next\n')
+
+    def test_read_view(self):
+        message = b'#13abc\n'
+        instr = pyvisa.PyVisaInstrument(FakeResource([message]))
+        self.assertEqual(instr.read_raw(3), b'#13')
+        view = instr.read_view(3)
+        self.assertTrue(view.obj is message)
+        self.assertEqual(view.tobytes(), b'abc')
+        self.assertEqual(instr.read_view().tobytes(), b'\n')
+
+    def test_chunk_size(self):
+        res = FakeResource([])
+        pyvisa.PyVisaInstrument(res, chunk_size=1024 * 1024)
+        self.assertEqual(res.chunk_size, 1024 * 1024)
+
+    def test_read_bytes(self):
+        res = FakeMessageResource([b'#15abcde\n', b'next\n'])
+        instr = pyvisa.PyVisaInstrument(res)
+        self.assertEqual(instr.read_raw(2), b'#1')
+        self.assertEqual(instr.read_raw(1), b'5')
+        buf = bytearray(5)
+        self.assertEqual(instr.readinto(buf), 5)
+        self.assertEqual(bytes(buf), b'abcde')
+        self.assertEqual(instr.read_raw(), b'\n')
+        self.assertEqual(instr.read_raw(), b'next\n')
+        # the block payload is read by size, whole messages with read_raw
+        self.assertEqual(res.calls, [2, 1, 5, 'read_raw', 'read_raw'])
+
+if __name__ == '__main__':
+    unittest.main()
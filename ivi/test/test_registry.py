@@ -0,0 +1,100 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import importlib
+import sys
+import unittest
+
+import ivi
+from ivi import registry
+
+ivi_classes = ['scope', 'dmm', 'fgen', 'dcpwr', 'swtch', 'pwrmeter', 'specan',
+        'rfsiggen', 'counter']
+
+class TestRegistry(unittest.TestCase):
+
+    def test_get_drivers(self):
+        drivers = registry.get_drivers()
+        self.assertEqual(set(d.vendor for d in drivers), set(registry.get_vendors()))
+        for d in registry.get_drivers('dcpwr'):
+            self.assertTrue('dcpwr' in d.classes)
+        for d in registry.get_drivers(vendor='rigol'):
+            self.assertEqual(d.vendor, 'rigol')
+
+    def test_model(self):
+        d, = registry.get_drivers(model='mso7104a')
+        self.assertEqual(d.name, 'agilentMSO7104A')
+        self.assertEqual(d.model, 'MSO7104A')
+        self.assertEqual(d.path, 'ivi.agilent.agilentMSO7104A')
+        self.assertEqual(d.classes, ('scope',))
+        names = [d.name for d in registry.get_drivers(model='MSO7*4A')]
+        self.assertTrue('agilentMSO7104A' in names)
+        self.assertTrue('agilentMSO7034A' in names)
+        self.assertFalse('agilentMSO7012A' in names)
+        self.assertEqual(registry.get_drivers(model='bad_model'), [])
+
+    def test_lazy_import(self):
+        d, = registry.get_drivers(model='DP1308A')
+        sys.modules.pop(d.path, None)
+        ivi.rigol.__dict__.pop(d.name, None)
+        self.assertTrue(d.name in dir(ivi.rigol))
+        self.assertFalse(d.path in sys.modules)
+        cls = ivi.rigol.rigolDP1308A
+        self.assertTrue(d.path in sys.modules)
+        self.assertEqual(cls.__name__, 'rigolDP1308A')
+        self.assertTrue(registry.find_driver('dp1308a') is cls)
+        self.assertRaises(AttributeError, getattr, ivi.rigol, 'rigolBadModel')
+        self.assertRaises(KeyError, registry.find_driver, 'bad_model')
+
+    def test_module_name(self):
+        d, = registry.get_drivers(vendor='keithley', model='237')
+        self.assertEqual(d.module, 'keithley236')
+        self.assertEqual(d.load().__name__, 'keithley237')
+
+    def test_sibling_module(self):
+        # agilent86141B imports agilent86140B, which must still resolve to
+        # the driver class and not the module
+        ivi.agilent.agilent86141B
+        self.assertTrue(isinstance(ivi.agilent.agilent86140B, type))
+
+    def test_import_submodule(self):
+        # importing the driver module by name must not replace the class
+        d, = registry.get_drivers(model='DP1308A')
+        sys.modules.pop(d.path, None)
+        ivi.rigol.__dict__.pop(d.name, None)
+        importlib.import_module(d.path)
+        self.assertTrue(isinstance(ivi.rigol.rigolDP1308A, type))
+
+    def test_declared_classes(self):
+        bases = [(c, importlib.import_module('ivi.' + c).Base) for c in ivi_classes]
+        for d in registry.get_drivers():
+            cls = d.load()
+            classes = tuple(c for c, b in bases if issubclass(cls, b))
+            self.assertEqual(d.classes, classes, d.name)
+
+if __name__ == '__main__':
+    unittest.main()
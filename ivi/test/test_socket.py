@@ -0,0 +1,156 @@
+"""
+
+Python Interchangeable Virtual Instrument Library
+
+Copyright (c) 2014-2017 Alex Forencich
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+
+"""
+
+
+import socket
+import threading
+import unittest
+
+import ivi
+from ivi.interface import socket as ivisocket
+
+class StandInInstrument(object):
+    "Instrument on a local socket answering queries from a dict"
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.received = []
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def serve(self):
+        conn, addr = self.server.accept()
+        data = b''
+        while True:
+            chunk = conn.recv(1024)
+            if not chunk:
+                break
+            data += chunk
+            while b'\n' in data:
+                line, data = data.split(b'\n', 1)
+                self.received.append(line)
+                if line in self.responses:
+                    # send in pieces to exercise reassembly
+                    response = self.responses[line]
+                    for k in range(0, len(response), 1000):
+                        conn.sendall(response[k:k+1000])
+        conn.close()
+        self.server.close()
+
+class TestSocketInstrument(unittest.TestCase):
+
+    def setUp(self):
+        payload = bytes(bytearray(k % 256 for k in range(5000)))
+        self.payload = payload
+        self.instr = StandInInstrument({
+                b'*IDN?': b'Python IVI,Stand-in,0,0\n',
+                b':MEAS?': b'1.0;2.0\nextra\n',
+                b':DATA?': b'#44999' + payload[:4999] + b'\n',
+                b':RAW?': b'ab',
+        })
+        self.resource = 'TCPIP0::127.0.0.1::%d::SOCKET' % self.instr.port
+
+    def test_parse(self):
+        res = ivisocket.parse_visa_resource_string('TCPIP0::10.0.0.1::5025::SOCKET')
+        self.assertEqual(res['host'], '10.0.0.1')
+        self.assertEqual(res['port'], 5025)
+        self.assertTrue(ivisocket.parse_visa_resource_string('TCPIP0::10.0.0.1::INSTR') is None)
+
+    def test_open_interface(self):
+        instr = ivi.open_interface(self.resource)
+        try:
+            self.assertTrue(isinstance(instr, ivisocket.SocketInstrument))
+            self.assertEqual(instr.sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY), 1)
+            self.assertEqual(instr.ask('*IDN?'), 'Python IVI,Stand-in,0,0')
+        finally:
+            instr.close()
+
+    def test_termination(self):
+        instr = ivisocket.SocketInstrument(self.resource, rcvbuf=1024 * 1024)
+        try:
+            self.assertEqual(instr.ask(':MEAS?'), '1.0;2.0')
+            # data after the termination character is kept for the next read
+            self.assertEqual(instr.read(), 'extra')
+        finally:
+            instr.close()
+
+    def test_ieee_block(self):
+        driver = ivi.Driver(ivisocket.SocketInstrument(self.resource))
+        try:
+            self.assertEqual(driver._ask_for_ieee_block(':DATA?'), self.payload[:4999])
+            # the terminator after the block is not taken as the next response
+            self.assertEqual(driver._ask('*IDN?'), 'Python IVI,Stand-in,0,0')
+            # nor is anything left over after an explicit flush
+            self.assertEqual(driver._ask_for_ieee_block(':DATA?'), self.payload[:4999])
+            self.assertEqual(driver._read_raw(), b'\n')
+            self.assertEqual(driver._ask('*IDN?'), 'Python IVI,Stand-in,0,0')
+        finally:
+            driver.close()
+        self.assertEqual(self.instr.received, [b':DATA?', b'*IDN?', b':DATA?', b'*IDN?'])
+
+    def test_fixed_length_read(self):
+        instr = ivisocket.SocketInstrument(self.resource, timeout=5)
+        try:
+            # the response has no terminator, a short read followed by
+            # a write must not wait for one
+            instr.write(':RAW?')
+            self.assertEqual(instr.read_raw(1), b'a')
+            # returns what is available rather than waiting for num bytes
+            self.assertEqual(instr.read_raw(10), b'b')
+            self.assertEqual(instr.ask('*IDN?'), 'Python IVI,Stand-in,0,0')
+        finally:
+            instr.close()
+        self.assertEqual(self.instr.received, [b':RAW?', b'*IDN?'])
+
+    def test_writev(self):
+        instr = ivisocket.SocketInstrument(self.resource)
+        try:
+            instr.writev([b':DATA #14', bytearray(b'ab'), memoryview(b'cd')])
+            self.assertEqual(instr.ask('*IDN?'), 'Python IVI,Stand-in,0,0')
+        finally:
+            instr.close()
+        self.assertEqual(self.instr.received[0], b':DATA #14abcd')
+
+    def test_block_ending_in_newline(self):
+        driver = ivi.Driver(ivisocket.SocketInstrument(self.resource))
+        try:
+            # the payload's last byte is not mistaken for the terminator
+            driver._write_ieee_block(b'ab\n', ':DATA ')
+            driver._interface.writev([b':DATA #13', b'cd\n'])
+            self.assertEqual(driver._ask('*IDN?'), 'Python IVI,Stand-in,0,0')
+        finally:
+            driver.close()
+        # the stand-in splits at every newline, so the terminator after the
+        # payload shows up as an empty line
+        self.assertEqual(self.instr.received, [b':DATA #13ab', b'', b':DATA #13cd', b'', b'*IDN?'])
+
+if __name__ == '__main__':
+    unittest.main()
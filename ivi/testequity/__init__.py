@@ -24,10 +24,9 @@ THE SOFTWARE.
 
 """
 
-# Enviromental Chambers
-from .testequityf4 import testequityf4
-from .testequity140 import testequity140
-
-
-
+from .. import registry
 
+registry.lazy_package(__name__, [
+        # Enviromental Chambers
+        ('testequityf4', ()),
+        ('testequity140', ())])